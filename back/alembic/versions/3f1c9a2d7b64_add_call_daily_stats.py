@@ -0,0 +1,78 @@
+"""add call_daily_stats rollup
+
+Revision ID: 3f1c9a2d7b64
+Revises: 45b3af1727dc
+Create Date: 2025-07-20 10:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a2d7b64'
+down_revision: Union[str, Sequence[str], None] = '45b3af1727dc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('call_daily_stats',
+    sa.Column('clinic_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('call_type', postgresql.ENUM('inbound', 'outbound', name='calltype', create_type=False), nullable=False),
+    sa.Column('agent_environment', postgresql.ENUM('production', 'development', name='agentenvironment', create_type=False), nullable=False),
+    sa.Column('call_count', sa.Integer(), nullable=False),
+    sa.Column('duration_sum', sa.Float(), nullable=False),
+    sa.Column('duration_count', sa.Integer(), nullable=False),
+    sa.Column('evaluation_count', sa.Integer(), nullable=False),
+    sa.Column('score_sum', sa.Float(), nullable=False),
+    sa.Column('score_count', sa.Integer(), nullable=False),
+    sa.Column('feedback_call_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['clinic_id'], ['clinic.id'], ),
+    sa.PrimaryKeyConstraint('clinic_id', 'day', 'call_type', 'agent_environment')
+    )
+    op.create_index(op.f('ix_call_daily_stats_day'), 'call_daily_stats', ['day'], unique=False)
+
+    # Backfill from the existing calls, same aggregation as CallDailyStatsRepository
+    op.execute("""
+        INSERT INTO call_daily_stats (
+            clinic_id, day, call_type, agent_environment,
+            call_count, duration_sum, duration_count,
+            evaluation_count, score_sum, score_count, feedback_call_count
+        )
+        SELECT
+            c.clinic_id,
+            CAST(COALESCE(c.call_start_time, c.created) AS DATE),
+            c.call_type,
+            c.agent_environment,
+            COUNT(c.id),
+            COALESCE(SUM(c.duration), 0),
+            COUNT(c.duration),
+            COALESCE(SUM(e.evaluation_count), 0),
+            COALESCE(SUM(e.score_sum), 0),
+            COALESCE(SUM(e.score_count), 0),
+            COALESCE(SUM(e.has_feedback), 0)
+        FROM call c
+        LEFT JOIN (
+            SELECT
+                call_id,
+                COUNT(id) AS evaluation_count,
+                SUM(score) AS score_sum,
+                COUNT(score) AS score_count,
+                MAX(CASE WHEN feedback IS NOT NULL AND feedback != '' THEN 1 ELSE 0 END) AS has_feedback
+            FROM evaluation
+            GROUP BY call_id
+        ) e ON e.call_id = c.id
+        GROUP BY c.clinic_id, CAST(COALESCE(c.call_start_time, c.created) AS DATE), c.call_type, c.agent_environment
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_call_daily_stats_day'), table_name='call_daily_stats')
+    op.drop_table('call_daily_stats')
@@ -0,0 +1,72 @@
+"""add trigram and full-text search indexes on call
+
+Revision ID: 8b2e4f6a1c90
+Revises: 3f1c9a2d7b64
+Create Date: 2025-07-24 09:41:07.518230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4f6a1c90'
+down_revision: Union[str, Sequence[str], None] = '3f1c9a2d7b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns searched with ILIKE '%term%' by the clinic call search
+TRIGRAM_COLUMNS = ('call_id', 'customer_phone', 'customer_name')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Adding a stored generated column rewrites the call table once
+    op.add_column('call', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('english', coalesce(call_reason, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(summary, '')), 'B')",
+            persisted=True
+        ),
+        nullable=True
+    ))
+
+    # Built concurrently so large tables keep accepting writes meanwhile,
+    # which cannot happen inside the migration transaction
+    with op.get_context().autocommit_block():
+        for column in TRIGRAM_COLUMNS:
+            op.create_index(
+                f'ix_call_{column}_trgm',
+                'call',
+                [column],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+        op.create_index(
+            'ix_call_search_vector',
+            'call',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_call_search_vector', table_name='call', postgresql_concurrently=True, if_exists=True)
+        for column in TRIGRAM_COLUMNS:
+            op.drop_index(f'ix_call_{column}_trgm', table_name='call', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('call', 'search_vector')
+    # pg_trgm is left installed, other database objects may rely on it
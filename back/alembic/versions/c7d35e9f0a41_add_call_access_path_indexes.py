@@ -0,0 +1,74 @@
+"""add composite indexes for call listings and evaluation loads
+
+Revision ID: c7d35e9f0a41
+Revises: 8b2e4f6a1c90
+Create Date: 2025-07-28 15:03:52.907114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d35e9f0a41'
+down_revision: Union[str, Sequence[str], None] = '8b2e4f6a1c90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so large tables keep accepting writes meanwhile,
+    # which cannot happen inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_call_clinic_id_created_id',
+            'call',
+            ['clinic_id', sa.text('created DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'ix_call_clinic_id_call_type_created_id',
+            'call',
+            ['clinic_id', 'call_type', sa.text('created DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'ix_call_clinic_id_day',
+            'call',
+            ['clinic_id', sa.text('CAST(coalesce(call_start_time, created) AS DATE)')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            op.f('ix_call_call_start_time'),
+            'call',
+            ['call_start_time'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            op.f('ix_evaluation_call_id'),
+            'evaluation',
+            ['call_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_evaluation_call_id'), table_name='evaluation', postgresql_concurrently=True, if_exists=True)
+        op.drop_index(op.f('ix_call_call_start_time'), table_name='call', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_call_clinic_id_day', table_name='call', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_call_clinic_id_call_type_created_id', table_name='call', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_call_clinic_id_created_id', table_name='call', postgresql_concurrently=True, if_exists=True)
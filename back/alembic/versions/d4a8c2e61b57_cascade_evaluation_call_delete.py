@@ -0,0 +1,44 @@
+"""delete evaluations with their call
+
+Revision ID: d4a8c2e61b57
+Revises: c7d35e9f0a41
+Create Date: 2025-08-04 11:26:40.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8c2e61b57'
+down_revision: Union[str, Sequence[str], None] = 'c7d35e9f0a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _replace_call_foreign_key(ondelete: Union[str, None]) -> None:
+    op.drop_constraint('evaluation_call_id_fkey', 'evaluation', type_='foreignkey')
+    # NOT VALID skips the full table check while the table is locked,
+    # existing rows are validated afterwards with a lighter lock
+    op.create_foreign_key(
+        'evaluation_call_id_fkey',
+        'evaluation',
+        'call',
+        ['call_id'],
+        ['id'],
+        ondelete=ondelete,
+        postgresql_not_valid=True
+    )
+    with op.get_context().autocommit_block():
+        op.execute('ALTER TABLE evaluation VALIDATE CONSTRAINT evaluation_call_id_fkey')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _replace_call_foreign_key('CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_call_foreign_key(None)
@@ -1,7 +1,8 @@
 from typing import Optional, List, Literal
 from sqlmodel import SQLModel, Field, Relationship
-from datetime import datetime
-from sqlalchemy import JSON, TIMESTAMP, func, Column
+from datetime import datetime, date
+from sqlalchemy import JSON, TIMESTAMP, func, cast, Column, Computed, Date, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from enum import Enum
 
 
@@ -39,7 +40,7 @@ class Call(SQLModel, table=True):
     call_type: CallType
     agent_environment: AgentEnvironment
     assistant: str
-    call_start_time: Optional[datetime] = None
+    call_start_time: Optional[datetime] = Field(default=None, index=True)
     call_ended_time: Optional[datetime] = None
     customer_phone: Optional[str] = None
     customer_name: Optional[str] = None
@@ -50,16 +51,59 @@ class Call(SQLModel, table=True):
     call_reason: Optional[str] = None
     clinic_id: int = Field(foreign_key="clinic.id")
     clinic: Optional[Clinic] = Relationship(back_populates="calls")
-    evaluations: List["Evaluation"] = Relationship(back_populates="call")
+    evaluations: List["Evaluation"] = Relationship(back_populates="call", passive_deletes="all")
     created: Optional[datetime] = Field(
         default=None, 
         sa_column=Column(TIMESTAMP, nullable=False, server_default=func.now())
     )
 
 
+# Text search configuration of call.search_vector, queries must use the same one
+CALL_SEARCH_CONFIG = "english"
+
+# PostgreSQL generated column for full-text search over call_reason and summary.
+# It is added to the table but left unmapped, so loading a Call never fetches it;
+# query it through Call.__table__.c.search_vector.
+Call.__table__.append_column(
+    Column(
+        "search_vector",
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{CALL_SEARCH_CONFIG}', coalesce(call_reason, '')), 'A') || "
+            f"setweight(to_tsvector('{CALL_SEARCH_CONFIG}', coalesce(summary, '')), 'B')",
+            persisted=True
+        )
+    )
+)
+
+# Trigram indexes serving the ILIKE '%term%' clinic call search, and the full-text index
+for _column in ("call_id", "customer_phone", "customer_name"):
+    Index(
+        f"ix_call_{_column}_trgm",
+        Call.__table__.c[_column],
+        postgresql_using="gin",
+        postgresql_ops={_column: "gin_trgm_ops"}
+    )
+Index("ix_call_search_vector", Call.__table__.c.search_vector, postgresql_using="gin")
+
+# Clinic listings: filtered by clinic (and type), sorted and keyset paged by (created, id)
+Index("ix_call_clinic_id_created_id", Call.clinic_id, Call.__table__.c.created.desc(), Call.id.desc())
+Index(
+    "ix_call_clinic_id_call_type_created_id",
+    Call.clinic_id, Call.call_type, Call.__table__.c.created.desc(), Call.id.desc()
+)
+# (clinic, day) buckets looked up when the call_daily_stats rollup is refreshed
+Index(
+    "ix_call_clinic_id_day",
+    Call.clinic_id,
+    cast(func.coalesce(Call.call_start_time, Call.__table__.c.created), Date)
+)
+
+
 class Evaluation(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    call_id: int = Field(foreign_key="call.id")
+    # Deleting a call deletes its evaluations in the database
+    call_id: int = Field(foreign_key="call.id", index=True, ondelete="CASCADE")
     evaluator_type: EvaluatorType
 
     reviewer: Optional[str] = None
@@ -91,3 +135,25 @@ class User(SQLModel, table=True):
         default=None, 
         sa_column=Column(TIMESTAMP, nullable=False, server_default=func.now())
     )
+
+
+class CallDailyStats(SQLModel, table=True):
+    """
+    Per day rollup of calls and their evaluations, used by the dashboard.
+    `day` is the call_start_time date, falling back to the call creation date.
+    Sums and counts are kept separately so averages can be re-aggregated over any range.
+    """
+    __tablename__ = "call_daily_stats"
+
+    clinic_id: int = Field(foreign_key="clinic.id", primary_key=True)
+    day: date = Field(primary_key=True, index=True)
+    call_type: CallType = Field(primary_key=True)
+    agent_environment: AgentEnvironment = Field(primary_key=True)
+
+    call_count: int = 0
+    duration_sum: float = 0
+    duration_count: int = 0
+    evaluation_count: int = 0
+    score_sum: float = 0
+    score_count: int = 0
+    feedback_call_count: int = 0
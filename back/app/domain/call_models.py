@@ -13,6 +13,11 @@ class AgentEnvironment(str, Enum):
     production = "production"
     development = "development"
 
+class CallSearchMode(str, Enum):
+    """How the clinic call search matches its term"""
+    substring = "substring"  # case-insensitive partial match on call_id, customer_phone and customer_name
+    fulltext = "fulltext"  # word match on summary and call_reason (PostgreSQL only)
+
 class CallBase(BaseModel):
     call_id: str = Field(..., min_length=3, max_length=100)
     call_type: CallType = CallType.inbound
@@ -53,10 +58,39 @@ class CallUpdate(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class CallBulkUpsert(BaseModel):
+    """Calls to insert or update by call_id"""
+    calls: List[CallCreate] = Field(..., min_length=1, max_length=10000)
+
+class CallBulkUpsertResult(BaseModel):
+    inserted: int
+    updated: int
+
 class CallRead(CallBase):
     id: int
     created: datetime
     evaluations: List[EvaluationRead] = []
     clinic: Optional[ClinicDomain] = None
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class CallSearchResult(BaseModel):
+    """
+    Full-text search hit. The highlights are fragments of summary and call_reason
+    with matched words wrapped in <mark></mark>; the text itself is not HTML escaped.
+    """
+    id: int
+    call_id: str
+    call_type: CallType
+    agent_environment: AgentEnvironment
+    assistant: str
+    call_start_time: Optional[datetime] = None
+    customer_phone: Optional[str] = None
+    customer_name: Optional[str] = None
+    duration: Optional[float] = None
+    clinic_id: int
+    clinic_name: str
+    created: datetime
+    rank: float
+    summary_highlight: Optional[str] = None
+    call_reason_highlight: Optional[str] = None
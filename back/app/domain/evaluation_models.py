@@ -1,5 +1,5 @@
-from typing import Optional, Literal
-from pydantic import BaseModel, ConfigDict
+from typing import List, Optional, Literal
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from enum import Enum
 
@@ -38,3 +38,11 @@ class EvaluationRead(EvaluationBase):
     created: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+class EvaluationBulkCreate(BaseModel):
+    """Evaluations to create in one request"""
+    evaluations: List[EvaluationCreate] = Field(..., min_length=1, max_length=10000)
+
+class EvaluationBulkCreateResult(BaseModel):
+    """Generated IDs, in the order the evaluations were sent"""
+    ids: List[int]
@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+
+from app.domain.job_models import JobRead
+
+
+class ParquetExportRequest(BaseModel):
+    """Calls to export; the dates apply to call_start_time"""
+    clinic_id: Optional[int] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+
+
+class ParquetExportResult(BaseModel):
+    """Counters of a Parquet export, updated after every batch"""
+    rows_written: int = 0
+    partitions: int = 0
+    files: int = 0
+    archive_bytes: int = 0
+    elapsed_seconds: float = 0
+    rows_per_second: float = 0
+
+
+class ExportJobRead(JobRead):
+    """Status of a Parquet export job"""
+    progress: Optional[ParquetExportResult] = None
+    result: Optional[ParquetExportResult] = None
@@ -0,0 +1,31 @@
+from typing import List, Optional
+from pydantic import BaseModel
+
+from app.domain.job_models import JobRead
+
+
+class IngestionRowError(BaseModel):
+    """A spreadsheet row that could not be imported"""
+    sheet: str
+    row: int
+    call_id: Optional[str] = None
+    error: str
+
+
+class IngestionResult(BaseModel):
+    """Counters of a spreadsheet import, updated after every committed chunk"""
+    rows_read: int = 0
+    rows_skipped: int = 0
+    calls_created: int = 0
+    calls_existing: int = 0
+    evaluations_created: int = 0
+    chunks_committed: int = 0
+    elapsed_seconds: float = 0
+    rows_per_second: float = 0
+    errors: List[IngestionRowError] = []
+
+
+class ImportJobRead(JobRead):
+    """Status of a spreadsheet import job"""
+    progress: Optional[IngestionResult] = None
+    result: Optional[IngestionResult] = None
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Any, Optional
+from pydantic import BaseModel, ConfigDict
+
+from app.utils.jobs import JobStatus
+
+
+class JobRead(BaseModel):
+    """Status of a background job"""
+    id: str
+    kind: str
+    status: JobStatus
+    created: datetime
+    started: Optional[datetime] = None
+    finished: Optional[datetime] = None
+    progress: Optional[Any] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class MetricsSource(str, Enum):
+    """Where dashboard metrics are computed from"""
+    rollup = "rollup"  # call_daily_stats, day granularity
+    live = "live"      # call and evaluation tables
@@ -1,15 +1,30 @@
+from contextlib import asynccontextmanager
+
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import api_router
+from app.repositories.connection_pool import get_threadpool_tokens
 from app.utils.logger import logger
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Database routes are sync and run on anyio's default thread limiter, size it for the pool
+    limiter = to_thread.current_default_thread_limiter()
+    limiter.total_tokens = get_threadpool_tokens()
+    logger.info(f"Sync routes run on up to {limiter.total_tokens} threads")
+    yield
+
+
 # Create FastAPI app with metadata
 app = FastAPI(
     title="Solum Health API",
     description="API for managing healthcare calls and evaluations",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -0,0 +1,340 @@
+from collections import defaultdict
+from datetime import date
+from enum import Enum
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import select, insert, update, delete, func, case, cast, and_, or_, text, Date
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.data_acess.models import Call, Evaluation, CallDailyStats
+from app.utils.logger import logger
+
+# (clinic_id, day) pair identifying the rollup rows affected by a write
+Bucket = Tuple[int, date]
+# Primary key of a rollup row, in KEY_COLUMNS order
+StatsKey = tuple
+# What some calls add to each rollup row: StatsKey -> sums in STATS_COLUMNS order
+Contributions = Dict[StatsKey, tuple]
+
+KEY_COLUMNS = ("clinic_id", "day", "call_type", "agent_environment")
+STATS_COLUMNS = (
+    "call_count", "duration_sum", "duration_count",
+    "evaluation_count", "score_sum", "score_count", "feedback_call_count"
+)
+
+# When a call happened for the dashboard; calls without a start time fall back to their creation time
+CALL_TIME = func.coalesce(Call.call_start_time, Call.created)
+# Day a call is rolled up into
+CALL_DAY = cast(CALL_TIME, Date)
+
+
+class CallDailyStatsRepository:
+    """
+    Maintains the call_daily_stats rollup. Single call/evaluation writes add
+    the change of the affected calls to their rows; bulk writes and
+    refresh_range rebuild whole (clinic, day) buckets.
+
+    Bucket rebuilds take an exclusive transaction scoped lock per bucket and
+    deltas a shared one, so deltas only wait for rebuilds, not for each other.
+    """
+
+    # Call columns that are aggregated into the rollup, or decide its row; other updates leave it unchanged
+    ROLLUP_COLUMNS = frozenset({"clinic_id", "call_start_time", "created", "call_type", "agent_environment", "duration"})
+
+    def __init__(self, session: Session) -> None:
+        self.__session = session
+
+    def buckets_for_calls(self, call_ids: Iterable[int]) -> Set[Bucket]:
+        """(clinic_id, day) buckets the given calls currently fall into"""
+        call_ids = list(set(call_ids))
+        if not call_ids:
+            return set()
+        rows = self.__session.execute(
+            select(Call.clinic_id, CALL_DAY).where(Call.id.in_(call_ids)).distinct()
+        ).all()
+        return {(clinic_id, day) for clinic_id, day in rows}
+
+    def buckets_for_external_call_ids(self, call_ids: Iterable[str]) -> Set[Bucket]:
+        """Same as buckets_for_calls, for calls identified by their external call_id"""
+        call_ids = list(set(call_ids))
+        if not call_ids:
+            return set()
+        rows = self.__session.execute(
+            select(Call.clinic_id, CALL_DAY).where(Call.call_id.in_(call_ids)).distinct()
+        ).all()
+        return {(clinic_id, day) for clinic_id, day in rows}
+
+    def refresh_for_calls(self, call_ids: Iterable[int]) -> None:
+        """Rebuild the buckets of the given calls, e.g. after adding their evaluations"""
+        self.refresh(self.buckets_for_calls(call_ids))
+
+    def lock_contributions(self, call_ids: Iterable[int]) -> Contributions:
+        """
+        Lock the given calls until commit and read what they currently add to
+        the rollup. Taken before changing the calls or their evaluations and
+        passed to apply_changes afterwards; the lock keeps a concurrent write
+        to the same call from being counted twice.
+
+        The lock is its own statement: a read that had to wait for it would
+        still see the evaluations as they were when it started.
+        """
+        call_ids = sorted(set(call_ids))
+        if not call_ids:
+            return {}
+        self.__session.execute(
+            select(Call.id)
+            .where(Call.id.in_(call_ids))
+            .order_by(Call.id)
+            .with_for_update(key_share=True)
+            .with_hint(Call, "WITH (UPDLOCK, ROWLOCK)", "mssql")
+        )
+        return self.contributions(call_ids)
+
+    def contributions(self, call_ids: Iterable[int]) -> Contributions:
+        """What the given calls and their evaluations add to each rollup row"""
+        call_ids = list(set(call_ids))
+        if not call_ids:
+            return {}
+        rows = self.__session.execute(self._aggregates([Call.id.in_(call_ids)])).all()
+        return {tuple(row[:len(KEY_COLUMNS)]): tuple(row[len(KEY_COLUMNS):]) for row in rows}
+
+    def apply_changes(self, before: Contributions, call_ids: Iterable[int]) -> None:
+        """
+        Add the difference between the current contribution of the given calls
+        and `before` (from lock_contributions) to the rollup rows, in place of
+        rebuilding their buckets. Rows left without calls are deleted, as a
+        rebuild would not write them.
+        """
+        after = self.contributions(call_ids)
+        deltas = {}
+        for key in before.keys() | after.keys():
+            old = before.get(key, (0,) * len(STATS_COLUMNS))
+            new = after.get(key, (0,) * len(STATS_COLUMNS))
+            delta = tuple(new_value - old_value for new_value, old_value in zip(new, old))
+            if any(delta):
+                deltas[key] = delta
+        if not deltas:
+            return
+
+        logger.info(f"Applying daily call stats changes to {len(deltas)} rows")
+        try:
+            self._lock_buckets({(key[0], key[1]) for key in deltas}, shared=True)
+            # Rows are always written in key order, so two deltas cannot deadlock on them
+            rows = [dict(zip(KEY_COLUMNS + STATS_COLUMNS, key + delta)) for key, delta in sorted(deltas.items())]
+            dialect = self.__session.get_bind().dialect.name
+            if dialect == "postgresql":
+                self._add_rows_postgresql(rows)
+            elif dialect == "mssql":
+                self._add_rows_mssql(rows)
+            else:
+                self._add_rows_generic(rows)
+
+            emptied = [key for key, delta in deltas.items() if delta[0] < 0]
+            if emptied:
+                self.__session.execute(
+                    delete(CallDailyStats).where(
+                        or_(*(self._key_filter(key) for key in emptied)),
+                        CallDailyStats.call_count <= 0
+                    )
+                )
+        except Exception as e:
+            logger.error(f"Failed to apply daily call stats changes: {e}")
+            raise
+
+    def refresh(self, buckets: Iterable[Bucket]) -> None:
+        """
+        Recompute the rollup rows of the given (clinic_id, day) buckets from the
+        call and evaluation tables. Runs in the caller's transaction.
+        """
+        buckets = set(buckets)
+        self._lock_buckets(buckets)
+
+        days_by_clinic = defaultdict(set)
+        for clinic_id, day in buckets:
+            days_by_clinic[clinic_id].add(day)
+
+        for clinic_id, days in days_by_clinic.items():
+            logger.info(f"Refreshing daily call stats for clinic {clinic_id}: {len(days)} days")
+            try:
+                self._rebuild(
+                    call_filters=[Call.clinic_id == clinic_id, CALL_DAY.in_(days)],
+                    stats_filters=[CallDailyStats.clinic_id == clinic_id, CallDailyStats.day.in_(days)]
+                )
+            except Exception as e:
+                logger.error(f"Failed to refresh daily call stats for clinic {clinic_id}: {e}")
+                raise
+
+    def refresh_range(
+        self,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None,
+        clinic_id: Optional[int] = None
+    ) -> int:
+        """
+        Recompute every bucket in a day range (all of them when no bounds are given).
+
+        Returns:
+            int: Number of rollup rows written
+        """
+        logger.info(f"Refreshing daily call stats: start_day={start_day}, end_day={end_day}, clinic_id={clinic_id}")
+        call_filters = []
+        stats_filters = []
+        if clinic_id:
+            call_filters.append(Call.clinic_id == clinic_id)
+            stats_filters.append(CallDailyStats.clinic_id == clinic_id)
+        if start_day:
+            call_filters.append(CALL_DAY >= start_day)
+            stats_filters.append(CallDailyStats.day >= start_day)
+        if end_day:
+            call_filters.append(CALL_DAY <= end_day)
+            stats_filters.append(CallDailyStats.day <= end_day)
+
+        try:
+            self._lock_table()
+            rows = self._rebuild(call_filters, stats_filters)
+            logger.info(f"Successful operation to refresh daily call stats: {rows} rows")
+            return rows
+        except Exception as e:
+            logger.error(f"Failed to refresh daily call stats: {e}")
+            raise
+
+    def _lock_buckets(self, buckets: Set[Bucket], shared: bool = False) -> None:
+        """
+        Serialize rebuilds of the same buckets across transactions until commit,
+        in one statement whatever the number of buckets. Two rebuilds of one
+        (clinic, day) would otherwise both delete the bucket and insert the same
+        primary key, and the second would fail with a unique violation. Under
+        READ COMMITTED the rebuild that waited sees the other transaction's rows
+        once the lock is granted. Locks are taken in bucket order so concurrent
+        writers cannot deadlock (PostgreSQL evaluates the lock calls after ORDER BY).
+
+        Deltas take the locks shared: they commute with each other and only
+        have to wait for a rebuild of their buckets.
+        """
+        if not buckets:
+            return
+        buckets = sorted(buckets)
+        dialect = self.__session.get_bind().dialect.name
+        if dialect == "postgresql":
+            lock = "pg_advisory_xact_lock_shared" if shared else "pg_advisory_xact_lock"
+            self.__session.execute(
+                text(
+                    f"SELECT {lock}(b.clinic_id, b.day) "
+                    "FROM unnest(CAST(:clinic_ids AS integer[]), CAST(:days AS integer[])) AS b(clinic_id, day) "
+                    "ORDER BY b.clinic_id, b.day"
+                ),
+                {"clinic_ids": [clinic_id for clinic_id, _ in buckets], "days": [day.toordinal() for _, day in buckets]}
+            )
+        elif dialect == "mssql":
+            mode = "Shared" if shared else "Exclusive"
+            self.__session.execute(
+                text(" ".join(
+                    f"EXEC sp_getapplock @Resource = :resource_{index}, @LockMode = '{mode}', @LockOwner = 'Transaction';"
+                    for index in range(len(buckets))
+                )),
+                {
+                    f"resource_{index}": f"call_daily_stats:{clinic_id}:{day.isoformat()}"
+                    for index, (clinic_id, day) in enumerate(buckets)
+                }
+            )
+
+    def _lock_table(self) -> None:
+        """
+        Keep bucket writers out while a range is rebuilt. The lock conflicts with
+        the ROW EXCLUSIVE lock their DELETE/INSERT take, not with dashboard reads.
+        """
+        dialect = self.__session.get_bind().dialect.name
+        if dialect == "postgresql":
+            self.__session.execute(text(f"LOCK TABLE {CallDailyStats.__tablename__} IN SHARE ROW EXCLUSIVE MODE"))
+        elif dialect == "mssql":
+            self.__session.execute(text(f"SELECT TOP 0 * FROM {CallDailyStats.__tablename__} WITH (TABLOCKX, HOLDLOCK)"))
+
+    @staticmethod
+    def _key_filter(key: StatsKey):
+        return and_(*(getattr(CallDailyStats, column) == value for column, value in zip(KEY_COLUMNS, key)))
+
+    def _add_rows_postgresql(self, rows: list) -> None:
+        statement = pg_insert(CallDailyStats).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(KEY_COLUMNS),
+            set_={column: getattr(CallDailyStats, column) + statement.excluded[column] for column in STATS_COLUMNS}
+        )
+        self.__session.execute(statement)
+
+    def _add_rows_mssql(self, rows: list) -> None:
+        columns = KEY_COLUMNS + STATS_COLUMNS
+        params = {}
+        values = []
+        for index, row in enumerate(rows):
+            names = []
+            for position, column in enumerate(columns):
+                name = f"p{index}_{position}"
+                value = row[column]
+                # Enums are persisted by name, text() skips the column type conversion
+                params[name] = value.name if isinstance(value, Enum) else value
+                names.append(f":{name}")
+            values.append(f"({', '.join(names)})")
+
+        column_list = ", ".join(f"[{column}]" for column in columns)
+        self.__session.execute(
+            text(
+                f"MERGE INTO [{CallDailyStats.__tablename__}] WITH (HOLDLOCK) AS target "
+                f"USING (VALUES {', '.join(values)}) AS source ({column_list}) "
+                f"ON {' AND '.join(f'target.[{column}] = source.[{column}]' for column in KEY_COLUMNS)} "
+                f"WHEN MATCHED THEN UPDATE SET "
+                f"{', '.join(f'target.[{column}] = target.[{column}] + source.[{column}]' for column in STATS_COLUMNS)} "
+                f"WHEN NOT MATCHED THEN INSERT ({column_list}) "
+                f"VALUES ({', '.join(f'source.[{column}]' for column in columns)});"
+            ),
+            params
+        )
+
+    def _add_rows_generic(self, rows: list) -> None:
+        # Dialects without a native upsert: update the row, insert it if there was none
+        for row in rows:
+            key = tuple(row[column] for column in KEY_COLUMNS)
+            result = self.__session.execute(
+                update(CallDailyStats)
+                .where(self._key_filter(key))
+                .values({column: getattr(CallDailyStats, column) + row[column] for column in STATS_COLUMNS})
+            )
+            if result.rowcount == 0:
+                self.__session.execute(insert(CallDailyStats).values(row))
+
+    def _aggregates(self, call_filters: list):
+        """Rollup rows of the calls matching call_filters, KEY_COLUMNS then STATS_COLUMNS"""
+        # Evaluations are aggregated per call first, so a call with several
+        # evaluations still counts once in call_count and feedback_call_count
+        has_feedback = and_(Evaluation.feedback.isnot(None), Evaluation.feedback != '')
+        evaluations_per_call = select(
+            Evaluation.call_id,
+            func.count(Evaluation.id).label("evaluation_count"),
+            func.sum(Evaluation.score).label("score_sum"),
+            func.count(Evaluation.score).label("score_count"),
+            func.max(case((has_feedback, 1), else_=0)).label("has_feedback")
+        ).where(Evaluation.call_id.in_(select(Call.id).where(*call_filters)))\
+            .group_by(Evaluation.call_id)\
+            .subquery()
+
+        return select(
+            Call.clinic_id,
+            CALL_DAY.label("day"),
+            Call.call_type,
+            Call.agent_environment,
+            func.count(Call.id),
+            func.coalesce(func.sum(Call.duration), 0),
+            func.count(Call.duration),
+            func.coalesce(func.sum(evaluations_per_call.c.evaluation_count), 0),
+            func.coalesce(func.sum(evaluations_per_call.c.score_sum), 0),
+            func.coalesce(func.sum(evaluations_per_call.c.score_count), 0),
+            func.coalesce(func.sum(evaluations_per_call.c.has_feedback), 0)
+        ).outerjoin(evaluations_per_call, evaluations_per_call.c.call_id == Call.id)\
+            .where(*call_filters)\
+            .group_by(Call.clinic_id, CALL_DAY, Call.call_type, Call.agent_environment)
+
+    def _rebuild(self, call_filters: list, stats_filters: list) -> int:
+        self.__session.execute(delete(CallDailyStats).where(*stats_filters))
+        result = self.__session.execute(
+            insert(CallDailyStats).from_select(list(KEY_COLUMNS + STATS_COLUMNS), self._aggregates(call_filters))
+        )
+        return result.rowcount
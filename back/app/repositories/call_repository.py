@@ -1,21 +1,153 @@
-from sqlalchemy.orm import Session, joinedload
-from app.data_acess.models import Call, Evaluation
-from app.repositories.repository import AbtractRepository
+from enum import Enum
+from sqlalchemy import select, func, insert, update, delete, text, literal_column, or_, cast, Float
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.orm import Session, joinedload, selectinload, load_only
+from sqlalchemy.orm.attributes import set_committed_value
+from app.data_acess.models import Call, Clinic, Evaluation, CALL_SEARCH_CONFIG
+from app.repositories.repository import AbtractRepository, apply_keyset
 from app.utils.logger import logger
-from app.domain.call_models import CallCreate, CallUpdate
-from typing import List, Optional
+from app.utils.pagination import CursorToken, CountMode
+from app.repositories.counting import count_rows
+from app.repositories.call_daily_stats_repository import CallDailyStatsRepository, CALL_DAY
+from app.repositories.evaluation_repository import EvaluationRepository
+from app.domain.call_models import CallCreate, CallUpdate, CallSearchMode
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+
+def _substring_search(search_term: str):
+    """
+    Case-insensitive partial match on the identifying columns. On PostgreSQL
+    the pg_trgm GIN indexes on these columns serve ILIKE '%term%' for terms of
+    three or more characters.
+    """
+    escaped = search_term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    pattern = f"%{escaped}%"
+    return or_(
+        Call.call_id.ilike(pattern, escape="\\"),
+        Call.customer_phone.ilike(pattern, escape="\\"),
+        Call.customer_name.ilike(pattern, escape="\\")
+    )
+
+
+_SEARCH_CONFIG = literal_column(f"'{CALL_SEARCH_CONFIG}'::regconfig")
+
+# ts_headline options for search result snippets
+HIGHLIGHT_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=25, MinWords=8"
+
+
+def _tsquery(search_term: str):
+    """Parse the term with web search syntax: quoted phrases, OR and -exclusion"""
+    return func.websearch_to_tsquery(_SEARCH_CONFIG, search_term)
+
+
+def _fulltext_search(search_term: str):
+    """Match the term against the generated search_vector column, served by its GIN index"""
+    return Call.__table__.c.search_vector.bool_op("@@")(_tsquery(search_term))
 
 
 class CallRepository(AbtractRepository):
+    # Rows per upsert statement; SQL Server batches are also capped by its 2100 parameters limit
+    UPSERT_BATCH_SIZE = 1000
+
+    # Non-nullable columns that can back a keyset cursor (together with id)
+    KEYSET_SORT_FIELDS = ("created", "call_id", "id")
+
+    # Evaluation columns in EvaluationRead field order, for row based reads
+    EVALUATION_READ_COLUMNS = EvaluationRepository.READ_COLUMNS
+
+    # Call columns in CallRead field order, the only ones list and detail reads fetch
+    READ_COLUMNS = (
+        Call.call_id, Call.call_type, Call.agent_environment, Call.assistant,
+        Call.call_start_time, Call.call_ended_time, Call.customer_phone,
+        Call.customer_name, Call.duration, Call.summary, Call.recording_url,
+        Call.ended_reason, Call.call_reason, Call.clinic_id, Call.id, Call.created
+    )
+
+    # Flat columns of the streaming export, the clinic name joined in
+    EXPORT_COLUMNS = (
+        Call.id, Call.call_id, Call.call_type, Call.agent_environment, Call.assistant,
+        Call.call_start_time, Call.call_ended_time, Call.customer_phone,
+        Call.customer_name, Call.duration, Call.summary, Call.recording_url,
+        Call.ended_reason, Call.call_reason, Call.clinic_id,
+        Clinic.name.label("clinic_name"), Call.created
+    )
+    EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+    # Rows fetched per round-trip from the server-side cursor
+    EXPORT_BATCH_SIZE = 1000
+
+    # Call joined with its evaluations (one row per evaluation, or one row for a
+    # call without any) and clinic, for the Parquet export
+    ANALYTICS_COLUMNS = (
+        Call.clinic_id, Call.id, Call.call_id, Call.call_type, Call.agent_environment,
+        Call.assistant, Call.call_start_time, Call.call_ended_time, Call.customer_phone,
+        Call.customer_name, Call.duration, Call.summary, Call.recording_url,
+        Call.ended_reason, Call.call_reason, Clinic.name.label("clinic_name"), Call.created,
+        Evaluation.id.label("evaluation_id"), Evaluation.evaluator_type, Evaluation.reviewer,
+        Evaluation.evaluation, Evaluation.check, Evaluation.feedback, Evaluation.score,
+        Evaluation.status_feedback_engineer, Evaluation.comments_engineer,
+        Evaluation.created.label("evaluation_created")
+    )
+
     def __init__(self, session: Session) -> None:
         self.__session = session
+        self.__daily_stats = CallDailyStatsRepository(session)
+
+    def _list_query(self):
+        """
+        Base query for list views. Evaluations come from one batched IN query
+        (no row multiplication or LIMIT subquery), the clinic from a many-to-one
+        join, and only READ_COLUMNS are fetched.
+        """
+        return self.__session.query(Call)\
+            .options(
+                load_only(*self.READ_COLUMNS, raiseload=True),
+                selectinload(Call.evaluations),
+                joinedload(Call.clinic, innerjoin=True)
+            )
     
+    def _list_rows_query(self):
+        """
+        Column only counterpart of _list_query, in CallRead field order plus
+        the clinic name. Turn its rows into response dicts with _rows_with_relations.
+        """
+        return self.__session.query(*self.READ_COLUMNS, Clinic.name.label("clinic_name"))\
+            .join(Clinic, Clinic.id == Call.clinic_id)
+
+    def _rows_with_relations(self, rows) -> List[dict]:
+        """
+        Plain dicts shaped like CallRead from call rows that end with
+        clinic_name, with their evaluations loaded by one IN query
+        """
+        calls = []
+        for row in rows:
+            call = row._asdict()
+            clinic_name = call.pop("clinic_name")
+            call["evaluations"] = []
+            call["clinic"] = {"id": call["clinic_id"], "name": clinic_name}
+            calls.append(call)
+
+        if calls:
+            evaluations_by_call = {call["id"]: call["evaluations"] for call in calls}
+            evaluations = self.__session.execute(
+                select(*self.EVALUATION_READ_COLUMNS)
+                .where(Evaluation.call_id.in_(list(evaluations_by_call)))
+                .order_by(Evaluation.id)
+            )
+            for evaluation in evaluations.mappings():
+                evaluations_by_call[evaluation["call_id"]].append(dict(evaluation))
+        return calls
+
+    def _fetch(self, query, as_rows: bool):
+        return self._rows_with_relations(query.all()) if as_rows else query.all()
+
     def list(self) -> List[Call]:
         logger.info("Fetching all calls from the database")
         try:
             calls = self.__session.query(Call)\
                 .options(
-                    joinedload(Call.evaluations),
+                    selectinload(Call.evaluations),
                     joinedload(Call.clinic)  # Cargar también la clínica
                 )\
                 .all()
@@ -24,17 +156,12 @@ class CallRepository(AbtractRepository):
             logger.error(f"Failed to fetch all calls: {e}")
             raise
     
-    def list_paginated(self, offset: int, limit: int) -> List[Call]:
+    def list_paginated(self, offset: int, limit: int, as_rows: bool = False) -> List[Call]:
+        """`as_rows` returns CallRead shaped dicts instead of Call objects"""
         logger.info(f"Fetching paginated calls (offset={offset}, limit={limit})")
         try:
-            return self.__session.query(Call)\
-                .options(
-                    joinedload(Call.evaluations),
-                    joinedload(Call.clinic)
-                )\
-                .offset(offset)\
-                .limit(limit)\
-                .all()
+            query = self._list_rows_query() if as_rows else self._list_query()
+            return self._fetch(query.offset(offset).limit(limit), as_rows)
         except Exception as e:
             logger.error(f"Failed to fetch paginated calls: {e}")
             raise
@@ -44,7 +171,7 @@ class CallRepository(AbtractRepository):
         try:
             calls = self.__session.query(Call)\
                 .options(
-                    joinedload(Call.evaluations),
+                    selectinload(Call.evaluations),
                     joinedload(Call.clinic)
                 )\
                 .filter(Call.clinic_id == clinic_id).all()
@@ -56,25 +183,50 @@ class CallRepository(AbtractRepository):
     def list_by_clinic_paginated(self, clinic_id: int, offset: int, limit: int) -> List[Call]:
         logger.info(f"Fetching paginated calls for clinic ID {clinic_id} (offset={offset}, limit={limit})")
         try:
-            return self.__session.query(Call)\
-                .options(
-                    joinedload(Call.evaluations),
-                    joinedload(Call.clinic)
-                )\
+            return self._list_query()\
                 .filter(Call.clinic_id == clinic_id).offset(offset).limit(limit).all()
         except Exception as e:
             logger.error(f"Failed to fetch paginated calls for clinic {clinic_id}: {e}")
             raise
 
-    def count(self) -> int:
-        logger.info("Counting total calls")
+    def list_keyset(self, cursor: Optional[CursorToken], limit: int, as_rows: bool = False) -> List[Call]:
+        logger.info(f"Fetching keyset page of calls (cursor={cursor}, limit={limit})")
+        try:
+            query = self._list_rows_query() if as_rows else self._list_query()
+            return self._fetch(apply_keyset(query, Call.id, Call.id, cursor, descending=False, limit=limit), as_rows)
+        except Exception as e:
+            logger.error(f"Failed to fetch keyset page of calls: {e}")
+            raise
+
+    def count(self, count_mode: CountMode = CountMode.exact) -> Optional[int]:
+        logger.info(f"Counting total calls (count_mode={count_mode})")
         try:
-            return self.__session.query(Call).count()
+            return count_rows(
+                self.__session,
+                self.__session.query(Call),
+                count_mode,
+                cache_key=("call",),
+                table_name=Call.__tablename__
+            )
         except Exception as e:
             logger.error(f"Failed to count calls: {e}")
             raise
 
     
+    def get_row(self, call_id: int) -> Optional[dict]:
+        """The call as a CallRead shaped dict, read with two column queries"""
+        logger.info(f"Fetching call row with ID {call_id}")
+        try:
+            rows = self.__session.query(*self.READ_COLUMNS, Clinic.name.label("clinic_name"))\
+                .join(Clinic, Clinic.id == Call.clinic_id)\
+                .filter(Call.id == call_id)\
+                .all()
+            calls = self._rows_with_relations(rows)
+            return calls[0] if calls else None
+        except Exception as e:
+            logger.error(f"Failed to fetch call {call_id}: {e}")
+            raise
+
     def get(self, call_id: int) -> Optional[Call]:
         logger.info(f"Fetching call with ID {call_id}")
         try:
@@ -100,34 +252,188 @@ class CallRepository(AbtractRepository):
         except Exception as e:
             logger.error(f"Failed to fetch call with call_id {call_id}: {e}")
             raise
+
+    def get_ids_by_call_ids(self, call_ids: List[str]) -> Dict[str, int]:
+        """Map external call_id -> primary key for the calls that already exist, in one query"""
+        logger.info(f"Looking up {len(call_ids)} call_ids")
+        if not call_ids:
+            return {}
+        try:
+            rows = self.__session.execute(
+                select(Call.call_id, Call.id).where(Call.call_id.in_(call_ids))
+            ).all()
+            return {call_id: id for call_id, id in rows}
+        except Exception as e:
+            logger.error(f"Failed to look up call_ids: {e}")
+            raise
+
+    def get_existing_ids(self, ids: List[int]) -> Set[int]:
+        """Subset of the given primary keys that exist, in one query"""
+        logger.info(f"Checking existence of {len(ids)} calls")
+        if not ids:
+            return set()
+        try:
+            return set(self.__session.scalars(select(Call.id).where(Call.id.in_(set(ids)))).all())
+        except Exception as e:
+            logger.error(f"Failed to check call existence: {e}")
+            raise
+
+    def insert_many(self, calls_data: List[dict]) -> Dict[str, int]:
+        """
+        Insert calls in batched multi-row INSERT ... RETURNING statements,
+        without loading them as ORM objects.
+
+        Args:
+            calls_data: Column values per call, all with the same keys
+
+        Returns:
+            Dict[str, int]: external call_id -> new primary key
+        """
+        logger.info(f"Bulk inserting {len(calls_data)} calls")
+        if not calls_data:
+            return {}
+        try:
+            rows = self.__session.execute(
+                insert(Call).returning(Call.call_id, Call.id),
+                calls_data
+            ).all()
+            logger.info(f"Successfully inserted {len(rows)} calls")
+            return {call_id: id for call_id, id in rows}
+        except Exception as e:
+            logger.error(f"Failed to bulk insert calls: {e}")
+            raise
+
+    def upsert_many(self, calls_data: List[dict], update_existing: bool = True) -> Dict[str, Tuple[int, bool]]:
+        """
+        Insert calls, or update the ones whose call_id already exists, without a
+        prior read: INSERT ... ON CONFLICT (call_id) on PostgreSQL, MERGE on SQL Server.
+        When the same call_id appears several times the last row wins.
+
+        Args:
+            calls_data: Column values per call, all with the same keys including call_id
+            update_existing: False leaves existing calls untouched (ON CONFLICT DO NOTHING)
+
+        Returns:
+            Dict[str, Tuple[int, bool]]: external call_id -> (primary key, inserted),
+            for every inserted or updated call
+        """
+        rows = list({row['call_id']: row for row in calls_data}.values())
+        logger.info(f"Upserting {len(rows)} calls (update_existing={update_existing})")
+        if not rows:
+            return {}
+        try:
+            unknown_columns = set(rows[0]) - set(Call.__table__.columns.keys())
+            if unknown_columns:
+                raise ValueError(f"Unknown call columns: {', '.join(sorted(unknown_columns))}")
+
+            previous_buckets = self.__daily_stats.buckets_for_external_call_ids(row['call_id'] for row in rows) \
+                if update_existing else set()
+
+            dialect = self.__session.get_bind().dialect.name
+            if dialect == "postgresql":
+                upsert_batch = self._upsert_batch_postgresql
+                batch_size = self.UPSERT_BATCH_SIZE
+            elif dialect == "mssql":
+                upsert_batch = self._upsert_batch_mssql
+                batch_size = max(1, min(self.UPSERT_BATCH_SIZE, 2000 // len(rows[0])))
+            else:
+                upsert_batch = self._upsert_batch_generic
+                batch_size = self.UPSERT_BATCH_SIZE
+
+            results = {}
+            for start in range(0, len(rows), batch_size):
+                results.update(upsert_batch(rows[start:start + batch_size], update_existing))
+
+            self.__daily_stats.refresh(
+                previous_buckets | self.__daily_stats.buckets_for_calls(id for id, _ in results.values())
+            )
+            inserted = sum(1 for _, was_inserted in results.values() if was_inserted)
+            logger.info(f"Successfully upserted calls: {inserted} inserted, {len(results) - inserted} updated")
+            return results
+        except Exception as e:
+            logger.error(f"Failed to upsert calls: {e}")
+            raise
+
+    def _upsert_batch_postgresql(self, rows: List[dict], update_existing: bool) -> Dict[str, Tuple[int, bool]]:
+        statement = pg_insert(Call).values(rows)
+        if update_existing:
+            statement = statement.on_conflict_do_update(
+                index_elements=[Call.call_id],
+                set_={column: statement.excluded[column] for column in rows[0] if column != 'call_id'}
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=[Call.call_id])
+        # xmax is 0 only for rows this statement inserted
+        statement = statement.returning(Call.call_id, Call.id, literal_column("xmax = 0").label("inserted"))
+        return {call_id: (id, inserted) for call_id, id, inserted in self.__session.execute(statement).all()}
+
+    def _upsert_batch_mssql(self, rows: List[dict], update_existing: bool) -> Dict[str, Tuple[int, bool]]:
+        columns = list(rows[0])
+        params = {}
+        values = []
+        for index, row in enumerate(rows):
+            names = []
+            for position, column in enumerate(columns):
+                name = f"p{index}_{position}"
+                value = row[column]
+                # Enums are persisted by name, text() skips the column type conversion
+                params[name] = value.name if isinstance(value, Enum) else value
+                names.append(f":{name}")
+            values.append(f"({', '.join(names)})")
+
+        column_list = ", ".join(f"[{column}]" for column in columns)
+        updates = ", ".join(f"target.[{column}] = source.[{column}]" for column in columns if column != 'call_id')
+        when_matched = f"WHEN MATCHED THEN UPDATE SET {updates} " if update_existing and updates else ""
+        statement = text(
+            f"MERGE INTO [{Call.__tablename__}] WITH (HOLDLOCK) AS target "
+            f"USING (VALUES {', '.join(values)}) AS source ({column_list}) "
+            f"ON target.[call_id] = source.[call_id] "
+            f"{when_matched}"
+            f"WHEN NOT MATCHED THEN INSERT ({column_list}) "
+            f"VALUES ({', '.join(f'source.[{column}]' for column in columns)}) "
+            f"OUTPUT inserted.[call_id], inserted.[id], CASE WHEN $action = 'INSERT' THEN 1 ELSE 0 END;"
+        )
+        return {
+            call_id: (id, bool(inserted))
+            for call_id, id, inserted in self.__session.execute(statement, params).all()
+        }
+
+    def _upsert_batch_generic(self, rows: List[dict], update_existing: bool) -> Dict[str, Tuple[int, bool]]:
+        # Dialects without a native upsert: one lookup, then bulk insert and bulk update
+        existing_ids = self.get_ids_by_call_ids([row['call_id'] for row in rows])
+        created_ids = self.insert_many([row for row in rows if row['call_id'] not in existing_ids])
+        results = {call_id: (id, True) for call_id, id in created_ids.items()}
+        if update_existing and existing_ids:
+            self.__session.execute(
+                update(Call),
+                [{**row, 'id': existing_ids[row['call_id']]} for row in rows if row['call_id'] in existing_ids]
+            )
+            results.update({call_id: (id, False) for call_id, id in existing_ids.items()})
+        return results
     
     
     def add(self, call_create: CallCreate) -> Call:
         logger.info("Adding a new call to the database")
         try:
-            # Convert Pydantic model to ORM model
-            call_data = call_create.model_dump()
-            call = Call(**call_data)
-
-            self.__session.add(call)
-            self.__session.commit()
-            self.__session.refresh(call)
-            
+            call = self.create(call_create.model_dump())
             logger.info(f"Call created successfully with ID {call.id}")
             return call
         except Exception as e:
-            self.__session.rollback()
             logger.error(f"Failed to add call: {e}")
             raise
 
     def create(self, call_data: dict) -> Call:
+        """
+        INSERT ... RETURNING the new row, so the generated id and server
+        defaults come back without a refresh. Commit is left to the unit of work.
+        """
         logger.info("Creating a new call from dictionary data")
         try:
-            call = Call(**call_data)
-            self.__session.add(call)
-            self.__session.flush()  # Flush to get the ID
-            self.__session.refresh(call)
-            
+            call = self.__session.scalars(insert(Call).returning(Call), [call_data]).one()
+            # A new call has no evaluations, don't lazy load them
+            set_committed_value(call, "evaluations", [])
+            self.__daily_stats.apply_changes({}, [call.id])
+
             logger.info(f"Call created successfully with ID {call.id}")
             return call
         except Exception as e:
@@ -135,45 +441,122 @@ class CallRepository(AbtractRepository):
             raise
 
     def update(self, call_id: int, call_data: dict) -> Optional[Call]:
+        return self.update_by_id(call_id, call_data)
+
+    def update_by_id(self, call_id: int, call_data: dict) -> Optional[Call]:
+        """
+        UPDATE ... WHERE id = :id RETURNING the updated row, without loading it
+        first. When the update changes rollup columns the call is locked and its
+        rollup rows are adjusted by the change, not rebuilt.
+
+        Returns:
+            Optional[Call]: The updated call, None if it does not exist
+        """
         logger.info(f"Updating call with ID {call_id}")
+        if not call_data:
+            # Nothing to set: read the bare row, as RETURNING would have returned it
+            return self.__session.scalars(
+                select(Call).where(Call.id == call_id).execution_options(populate_existing=True)
+            ).one_or_none()
         try:
-            call = self.get(call_id)
-            if not call:
+            updates_rollup = bool(call_data.keys() & CallDailyStatsRepository.ROLLUP_COLUMNS)
+            before = self.__daily_stats.lock_contributions([call_id]) if updates_rollup else {}
+
+            call = self.__session.scalars(
+                update(Call)
+                .where(Call.id == call_id)
+                .values(**call_data)
+                .returning(Call)
+                .execution_options(populate_existing=True)
+            ).one_or_none()
+            if call is None:
                 return None
-            for key, value in call_data.items():
-                setattr(call, key, value)
-            self.__session.commit()
-            self.__session.refresh(call)
+
+            if updates_rollup:
+                self.__daily_stats.apply_changes(before, [call_id])
             return call
         except Exception as e:
-            self.__session.rollback()
             logger.error(f"Failed to update call: {e}")
             raise
 
     def delete(self, call_id: int) -> bool:
+        return self.delete_by_id(call_id)
+
+    def delete_by_id(self, call_id: int) -> bool:
+        """
+        DELETE ... WHERE id = :id, after locking the call and reading what it
+        adds to the rollup, which is then subtracted from its rows.
+        The database deletes the call's evaluations (ON DELETE CASCADE).
+
+        Returns:
+            bool: False if the call does not exist
+        """
         logger.info(f"Deleting call with ID {call_id}")
         try:
-            call = self.get(call_id)
-            if not call:
+            # The cascade locks the evaluations after the call; evaluation writes
+            # lock them before it, so take them first to keep the same order
+            self.__session.execute(
+                select(Evaluation.id)
+                .where(Evaluation.call_id == call_id)
+                .order_by(Evaluation.id)
+                .with_for_update()
+                .with_hint(Evaluation, "WITH (UPDLOCK, ROWLOCK)", "mssql")
+            )
+            before = self.__daily_stats.lock_contributions([call_id])
+
+            deleted = self.__session.execute(
+                delete(Call).where(Call.id == call_id).returning(Call.id)
+            ).first()
+            if deleted is None:
                 logger.warning(f"Call with ID {call_id} not found for deletion")
                 return False
-            self.__session.delete(call)
-            self.__session.commit()
+            self.__daily_stats.apply_changes(before, [])
             logger.info(f"Call with ID {call_id} deleted successfully")
             return True
         except Exception as e:
-            self.__session.rollback()
             logger.error(f"Failed to delete call: {e}")
             raise
-    
-    def count_by_clinic(self, clinic_id: int) -> int:
-        logger.info(f"Counting total calls for clinic ID {clinic_id}")
+
+    def count_by_clinic(self, clinic_id: int, count_mode: CountMode = CountMode.exact) -> Optional[int]:
+        logger.info(f"Counting total calls for clinic ID {clinic_id} (count_mode={count_mode})")
         try:
-            return self.__session.query(Call).filter(Call.clinic_id == clinic_id).count()
+            return count_rows(
+                self.__session,
+                self.__session.query(Call).filter(Call.clinic_id == clinic_id),
+                count_mode,
+                cache_key=("call", clinic_id)
+            )
         except Exception as e:
             logger.error(f"Failed to count calls for clinic {clinic_id}: {e}")
             raise
 
+    def _require_postgresql(self, feature: str) -> None:
+        if self.__session.get_bind().dialect.name != "postgresql":
+            raise ValueError(f"{feature} is only available on PostgreSQL")
+
+    def _apply_clinic_filters(
+        self,
+        query,
+        clinic_id: int,
+        search_term: str = None,
+        call_type: str = None,
+        search_mode: CallSearchMode = CallSearchMode.substring
+    ):
+        query = query.filter(Call.clinic_id == clinic_id)
+
+        # Apply search filter
+        if search_term:
+            if search_mode == CallSearchMode.fulltext:
+                self._require_postgresql("Full-text search")
+                query = query.filter(_fulltext_search(search_term))
+            else:
+                query = query.filter(_substring_search(search_term))
+
+        # Apply call type filter
+        if call_type:
+            query = query.filter(Call.call_type == call_type)
+        return query
+
     def search_by_clinic_with_filters(
         self, 
         clinic_id: int, 
@@ -182,40 +565,30 @@ class CallRepository(AbtractRepository):
         sort_by: str = "created",
         sort_order: str = "desc",
         offset: int = 0,
-        limit: int = 10
+        limit: int = 10,
+        search_mode: CallSearchMode = CallSearchMode.substring,
+        as_rows: bool = False
     ) -> List[Call]:
         """
         Search calls by clinic with filters, search, and sorting
         
         Args:
             clinic_id: ID of the clinic
-            search_term: Search in call_id or customer_phone
+            search_term: Search in call_id, customer_phone and customer_name,
+                or in summary and call_reason with the fulltext search mode
             call_type: Filter by call type (inbound/outbound)
             sort_by: Field to sort by (created, call_start_time, duration, etc.)
             sort_order: asc or desc
             offset: Pagination offset
             limit: Pagination limit
+            search_mode: substring (default) or fulltext matching of search_term
+            as_rows: Return CallRead shaped dicts instead of Call objects
         """
-        logger.info(f"Searching calls for clinic {clinic_id} with filters: search={search_term}, type={call_type}, sort={sort_by} {sort_order}")
+        logger.info(f"Searching calls for clinic {clinic_id} with filters: search={search_term} ({search_mode}), type={call_type}, sort={sort_by} {sort_order}")
         
         try:
-            query = self.__session.query(Call)\
-                .options(
-                    joinedload(Call.evaluations),
-                    joinedload(Call.clinic)
-                )\
-                .filter(Call.clinic_id == clinic_id)
-            
-            # Apply search filter
-            if search_term:
-                query = query.filter(
-                    (Call.call_id.ilike(f"%{search_term}%")) |
-                    (Call.customer_phone.ilike(f"%{search_term}%"))
-                )
-            
-            # Apply call type filter
-            if call_type:
-                query = query.filter(Call.call_type == call_type)
+            base_query = self._list_rows_query() if as_rows else self._list_query()
+            query = self._apply_clinic_filters(base_query, clinic_id, search_term, call_type, search_mode)
             
             # Apply sorting
             sort_field = getattr(Call, sort_by, Call.created)
@@ -227,41 +600,205 @@ class CallRepository(AbtractRepository):
             # Apply pagination
             query = query.offset(offset).limit(limit)
             
-            calls = query.all()
+            calls = self._fetch(query, as_rows)
             logger.info(f"Found {len(calls)} calls matching criteria")
             return calls
         except Exception as e:
             logger.error(f"Failed to search calls for clinic {clinic_id}: {e}")
             raise
 
+    def search_by_clinic_keyset(
+        self,
+        clinic_id: int,
+        cursor: Optional[CursorToken],
+        limit: int,
+        search_term: str = None,
+        call_type: str = None,
+        sort_by: str = "created",
+        sort_order: str = "desc",
+        search_mode: CallSearchMode = CallSearchMode.substring,
+        as_rows: bool = False
+    ) -> List[Call]:
+        """
+        Keyset variant of search_by_clinic_with_filters: seeks past the cursor's
+        (sort_by, id) instead of skipping `offset` rows.
+        """
+        logger.info(f"Keyset search of calls for clinic {clinic_id}: search={search_term} ({search_mode}), type={call_type}, sort={sort_by} {sort_order}, cursor={cursor}")
+
+        if sort_by not in self.KEYSET_SORT_FIELDS:
+            raise ValueError(f"Cursor pagination only supports sort_by in {', '.join(self.KEYSET_SORT_FIELDS)}")
+
+        try:
+            base_query = self._list_rows_query() if as_rows else self._list_query()
+            query = self._apply_clinic_filters(base_query, clinic_id, search_term, call_type, search_mode)
+            query = apply_keyset(
+                query,
+                getattr(Call, sort_by),
+                Call.id,
+                cursor,
+                descending=sort_order.lower() == "desc",
+                limit=limit
+            )
+            calls = self._fetch(query, as_rows)
+            logger.info(f"Found {len(calls)} calls matching criteria")
+            return calls
+        except Exception as e:
+            logger.error(f"Failed keyset search of calls for clinic {clinic_id}: {e}")
+            raise
+
     def count_by_clinic_with_filters(
         self, 
         clinic_id: int, 
         search_term: str = None,
-        call_type: str = None
-    ) -> int:
+        call_type: str = None,
+        count_mode: CountMode = CountMode.exact,
+        search_mode: CallSearchMode = CallSearchMode.substring
+    ) -> Optional[int]:
         """
         Count calls by clinic with filters (for pagination)
         """
-        logger.info(f"Counting calls for clinic {clinic_id} with filters: search={search_term}, type={call_type}")
+        logger.info(f"Counting calls for clinic {clinic_id} with filters: search={search_term} ({search_mode}), type={call_type}, count_mode={count_mode}")
         
         try:
-            query = self.__session.query(Call).filter(Call.clinic_id == clinic_id)
-            
-            # Apply search filter
-            if search_term:
-                query = query.filter(
-                    (Call.call_id.ilike(f"%{search_term}%")) |
-                    (Call.customer_phone.ilike(f"%{search_term}%"))
-                )
-            
-            # Apply call type filter
-            if call_type:
-                query = query.filter(Call.call_type == call_type)
-            
-            count = query.count()
+            query = self._apply_clinic_filters(self.__session.query(Call), clinic_id, search_term, call_type, search_mode)
+            count = count_rows(
+                self.__session,
+                query,
+                count_mode,
+                cache_key=("call", clinic_id, search_term, search_mode, call_type)
+            )
             logger.info(f"Found {count} calls matching criteria")
             return count
         except Exception as e:
             logger.error(f"Failed to count calls for clinic {clinic_id}: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def search_fulltext(
+        self,
+        search_term: str,
+        cursor: Optional[CursorToken],
+        limit: int,
+        clinic_id: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Rank calls of every clinic (or one) by how well summary and call_reason
+        match the term, best first, with highlighted snippets.
+
+        Matches are found through the search_vector GIN index and paged with a
+        keyset on (rank, id). Snippets are built in an outer query, so
+        ts_headline only runs for the rows of the page.
+
+        Args:
+            search_term: Words to find, in web search syntax
+            cursor: Keyset cursor holding the rank and id of the previous page edge
+            limit: Rows to fetch
+            clinic_id: Restrict the search to one clinic
+
+        Returns:
+            List[dict]: CallSearchResult fields, in page order
+        """
+        logger.info(f"Full-text search of calls: q={search_term}, clinic_id={clinic_id}, cursor={cursor}")
+        self._require_postgresql("Full-text search")
+
+        try:
+            query = _tsquery(search_term)
+            search_vector = Call.__table__.c.search_vector
+            # float8 so the rank survives the cursor round trip and compares exactly
+            rank = cast(func.ts_rank(search_vector, query), Float)
+
+            matches = select(Call.id, rank.label("rank")).where(search_vector.bool_op("@@")(query))
+            if clinic_id:
+                matches = matches.where(Call.clinic_id == clinic_id)
+            matches = apply_keyset(matches, rank, Call.id, cursor, descending=True, limit=limit).subquery()
+
+            backwards = cursor is not None and cursor.direction == "prev"
+            order = (matches.c.rank.asc(), matches.c.id.asc()) if backwards else (matches.c.rank.desc(), matches.c.id.desc())
+            statement = select(
+                Call.id, Call.call_id, Call.call_type, Call.agent_environment, Call.assistant,
+                Call.call_start_time, Call.customer_phone, Call.customer_name, Call.duration,
+                Call.clinic_id, Clinic.name.label("clinic_name"), Call.created,
+                matches.c.rank,
+                func.ts_headline(_SEARCH_CONFIG, Call.summary, query, HIGHLIGHT_OPTIONS).label("summary_highlight"),
+                func.ts_headline(_SEARCH_CONFIG, Call.call_reason, query, HIGHLIGHT_OPTIONS).label("call_reason_highlight")
+            ).join(matches, matches.c.id == Call.id)\
+                .join(Clinic, Clinic.id == Call.clinic_id)\
+                .order_by(*order)
+
+            rows = [dict(row) for row in self.__session.execute(statement).mappings()]
+            logger.info(f"Found {len(rows)} calls matching '{search_term}'")
+            return rows
+        except Exception as e:
+            logger.error(f"Failed full-text search of calls: {e}")
+            raise
+
+    def export_batches(
+        self,
+        clinic_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> Iterator[Sequence[RowMapping]]:
+        """
+        Stream calls in id order through a server-side cursor, `batch_size` rows
+        at a time, so memory does not grow with the number of rows exported.
+        The date range applies to call_start_time, like the dashboard.
+
+        Returns:
+            Iterator[Sequence[RowMapping]]: Batches of rows keyed by EXPORT_FIELDS
+        """
+        logger.info(f"Exporting calls: clinic_id={clinic_id}, start_date={start_date}, end_date={end_date}")
+        statement = select(*self.EXPORT_COLUMNS)\
+            .join(Clinic, Clinic.id == Call.clinic_id)\
+            .order_by(Call.id)
+        if clinic_id is not None:
+            statement = statement.where(Call.clinic_id == clinic_id)
+        if start_date:
+            statement = statement.where(Call.call_start_time >= start_date)
+        if end_date:
+            statement = statement.where(Call.call_start_time <= end_date)
+
+        try:
+            result = self.__session.execute(statement.execution_options(yield_per=batch_size))
+            exported = 0
+            for batch in result.mappings().partitions():
+                exported += len(batch)
+                yield batch
+            logger.info(f"Successfully exported {exported} calls")
+        except Exception as e:
+            logger.error(f"Failed to export calls: {e}")
+            raise
+
+    def analytics_batches(
+        self,
+        clinic_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> Iterator[Sequence[RowMapping]]:
+        """
+        Stream ANALYTICS_COLUMNS rows through a server-side cursor, ordered by
+        clinic and call day (the ix_call_clinic_id_day index) so that each
+        (clinic, month) partition arrives in one contiguous run.
+
+        Returns:
+            Iterator[Sequence[RowMapping]]: Batches of rows keyed by the column labels
+        """
+        logger.info(f"Reading calls for analytics: clinic_id={clinic_id}, start_date={start_date}, end_date={end_date}")
+        statement = select(*self.ANALYTICS_COLUMNS)\
+            .join(Clinic, Clinic.id == Call.clinic_id)\
+            .outerjoin(Evaluation, Evaluation.call_id == Call.id)\
+            .order_by(Call.clinic_id, CALL_DAY, Call.id, Evaluation.id)
+        if clinic_id is not None:
+            statement = statement.where(Call.clinic_id == clinic_id)
+        if start_date:
+            statement = statement.where(Call.call_start_time >= start_date)
+        if end_date:
+            statement = statement.where(Call.call_start_time <= end_date)
+
+        try:
+            result = self.__session.execute(statement.execution_options(yield_per=batch_size))
+            for batch in result.mappings().partitions():
+                yield batch
+        except Exception as e:
+            logger.error(f"Failed to read calls for analytics: {e}")
+            raise
@@ -1,6 +1,9 @@
+from sqlalchemy import select, func, insert, update, delete
 from app.data_acess.models import Clinic
-from app.repositories.repository import AbtractRepository
+from app.repositories.repository import AbtractRepository, apply_keyset
 from app.utils.logger import logger
+from app.utils.pagination import CountMode
+from app.repositories.counting import count_rows
 
 class ClinicRepository(AbtractRepository):
     def __init__(self, session):
@@ -29,11 +32,29 @@ class ClinicRepository(AbtractRepository):
             logger.error(f'Failed Operation to get paginated clinics: {e}')
             raise
 
-    def count(self) -> int:
+    def list_keyset(self, cursor, limit: int):
+        """Get a keyset page of clinics ordered by id"""
+        logger.info(f"Start getting keyset page of clinics: cursor={cursor}, limit={limit}")
+        try:
+            query = self.__session.query(Clinic)
+            clinics = apply_keyset(query, Clinic.id, Clinic.id, cursor, descending=False, limit=limit).all()
+            logger.info(f"Successful operation to get keyset page of clinics: {len(clinics)} items")
+            return clinics
+        except Exception as e:
+            logger.error(f'Failed Operation to get keyset page of clinics: {e}')
+            raise
+
+    def count(self, count_mode: CountMode = CountMode.exact):
         """Get total count of clinics"""
-        logger.info("Start counting clinics")
+        logger.info(f"Start counting clinics (count_mode={count_mode})")
         try:
-            count = self.__session.query(Clinic).count()
+            count = count_rows(
+                self.__session,
+                self.__session.query(Clinic),
+                count_mode,
+                cache_key=("clinic",),
+                table_name=Clinic.__tablename__
+            )
             logger.info(f"Successful count operation: {count} clinics")
             return count
         except Exception as e:
@@ -78,22 +99,18 @@ class ClinicRepository(AbtractRepository):
     def add(self, clinic: Clinic):
         logger.info("Starting to add a clinic to database")
         try:
-            self.__session.add(clinic)
-            self.__session.flush()  # Flush to get the ID
-            self.__session.refresh(clinic)
-            logger.info(f"Successfully added clinic: {clinic.name}")
-            return clinic
+            created = self.create(clinic.model_dump(exclude_none=True))
+            logger.info(f"Successfully added clinic: {created.name}")
+            return created
         except Exception as e:
             logger.error(f"Failed to add clinic: {e}")
             raise
 
     def create(self, clinic_data: dict):
+        """INSERT ... RETURNING the new row; commit is left to the unit of work"""
         logger.info(f"Starting to create clinic with data: {clinic_data}")
         try:
-            clinic = Clinic(**clinic_data)
-            self.__session.add(clinic)
-            self.__session.flush()  # Flush to get the ID
-            self.__session.refresh(clinic)
+            clinic = self.__session.scalars(insert(Clinic).returning(Clinic), [clinic_data]).one()
             logger.info(f"Successfully created clinic: {clinic.name}")
             return clinic
         except Exception as e:
@@ -101,18 +118,28 @@ class ClinicRepository(AbtractRepository):
             raise
 
     def update(self, clinic_id: int, clinic_data: dict):
+        return self.update_by_id(clinic_id, clinic_data)
+
+    def update_by_id(self, clinic_id: int, clinic_data: dict):
+        """UPDATE ... WHERE id = :id RETURNING the updated row; commit is left to the unit of work"""
         logger.info(f"Starting to update clinic with id: {clinic_id}")
+        if not clinic_data:
+            # Nothing to set: read the bare row, as RETURNING would have returned it
+            return self.__session.scalars(
+                select(Clinic).where(Clinic.id == clinic_id).execution_options(populate_existing=True)
+            ).one_or_none()
         try:
-            clinic = self.get(clinic_id)
+            clinic = self.__session.scalars(
+                update(Clinic)
+                .where(Clinic.id == clinic_id)
+                .values(**clinic_data)
+                .returning(Clinic)
+                .execution_options(populate_existing=True)
+            ).one_or_none()
             if clinic is None:
                 logger.error(f"Clinic with id {clinic_id} not found")
                 return None
-            
-            for key, value in clinic_data.items():
-                setattr(clinic, key, value)
-            
-            self.__session.flush()
-            self.__session.refresh(clinic)
+
             logger.info(f"Successfully updated clinic: {clinic.name}")
             return clinic
         except Exception as e:
@@ -120,17 +147,21 @@ class ClinicRepository(AbtractRepository):
             raise
 
     def delete(self, clinic_id: int):
+        return self.delete_by_id(clinic_id)
+
+    def delete_by_id(self, clinic_id: int) -> bool:
+        """DELETE ... WHERE id = :id RETURNING id, without loading the clinic first"""
         logger.info(f"Starting to delete clinic with id: {clinic_id}")
         try:
-            clinic = self.get(clinic_id)
-            if clinic is None:
+            deleted_id = self.__session.scalar(
+                delete(Clinic).where(Clinic.id == clinic_id).returning(Clinic.id)
+            )
+            if deleted_id is None:
                 logger.error(f"Clinic with id {clinic_id} not found")
                 return False
-            
-            self.__session.delete(clinic)
-            self.__session.flush()
-            logger.info(f"Successfully deleted clinic: {clinic.name}")
+
+            logger.info(f"Successfully deleted clinic with id: {clinic_id}")
             return True
         except Exception as e:
             logger.error(f"Failed to delete clinic: {e}")
-            raise
\ No newline at end of file
+            raise
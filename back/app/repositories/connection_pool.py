@@ -0,0 +1,230 @@
+import bisect
+import threading
+import time
+from enum import Enum
+from typing import Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool, QueuePool
+
+from app.utils.config_utils import DatabaseConfig
+from app.utils.logger import logger
+
+
+class PoolProfile(str, Enum):
+    managed = "managed"  # small managed database with a low connection limit (Supabase)
+    dedicated = "dedicated"  # dedicated PostgreSQL server
+    pgbouncer = "pgbouncer"  # PgBouncer in transaction mode, which does the pooling itself
+
+
+# Pool arguments of each profile; DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT
+# and DB_POOL_RECYCLE override them for the queue pool profiles
+POOL_PROFILES = {
+    PoolProfile.managed: {
+        "pool_size": 3,
+        "max_overflow": 5,
+        "pool_timeout": 20,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "pool_reset_on_return": "commit",
+    },
+    PoolProfile.dedicated: {
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_timeout": 10,
+        "pool_recycle": 3600,
+        "pool_pre_ping": True,
+        "pool_reset_on_return": "rollback",
+    },
+    PoolProfile.pgbouncer: {},
+}
+
+
+# Starlette's default size of the threadpool sync routes run on
+DEFAULT_THREADPOOL_TOKENS = 40
+
+
+class PoolMetrics:
+    """
+    Connection pool counters fed by SQLAlchemy pool events, plus a cumulative
+    histogram of the time spent waiting for a connection.
+    """
+
+    # Upper bounds of the checkout wait histogram buckets, in seconds
+    WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.__lock = threading.Lock()
+        self.__wait_counts = [0] * (len(self.WAIT_BUCKETS) + 1)
+        self.__wait_sum = 0.0
+        self.__checkouts = 0
+        self.__checkins = 0
+        self.__max_checked_out = 0
+        self.__checkout_timeouts = 0
+        self.__connects = 0
+        self.__invalidations = 0
+
+    def attach(self, engine: Engine) -> None:
+        """Listen to the pool events of an engine (they survive pool recreation)"""
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        if isinstance(engine.pool, _WaitTimingMixin):
+            engine.pool.metrics = self
+
+    def observe_wait(self, seconds: float) -> None:
+        with self.__lock:
+            self.__wait_counts[bisect.bisect_left(self.WAIT_BUCKETS, seconds)] += 1
+            self.__wait_sum += seconds
+
+    def record_timeout(self, seconds: float) -> None:
+        with self.__lock:
+            self.__checkout_timeouts += 1
+        logger.warning(f"Timed out after {seconds:.2f}s waiting for a {self.name} database connection")
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self.__lock:
+            self.__connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self.__lock:
+            self.__checkouts += 1
+            self.__max_checked_out = max(self.__max_checked_out, self.__checkouts - self.__checkins)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self.__lock:
+            self.__checkins += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self.__lock:
+            self.__invalidations += 1
+
+    def snapshot(self, engine: Engine) -> dict:
+        """Current pool state and counters since startup"""
+        pool = engine.pool
+        with self.__lock:
+            buckets = []
+            cumulative = 0
+            for bound, count in zip(self.WAIT_BUCKETS + (None,), self.__wait_counts):
+                cumulative += count
+                buckets.append({"le": bound if bound is not None else "+Inf", "count": cumulative})
+
+            metrics = {
+                "name": self.name,
+                "pool_class": type(pool).__name__,
+                "checked_out": self.__checkouts - self.__checkins,
+                "max_checked_out": self.__max_checked_out,
+                "checkouts": self.__checkouts,
+                "checkout_timeouts": self.__checkout_timeouts,
+                "connects": self.__connects,
+                "invalidations": self.__invalidations,
+                "wait_seconds": {
+                    "count": cumulative,
+                    "sum": round(self.__wait_sum, 6),
+                    "buckets": buckets,
+                },
+            }
+
+        if isinstance(pool, QueuePool):
+            metrics.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "max_overflow": pool._max_overflow,
+                "timeout": pool.timeout(),
+            })
+        return metrics
+
+
+class _WaitTimingMixin:
+    """Times every connection checkout from the queue, including waits for a free slot"""
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout(time.perf_counter() - started)
+            raise
+        if self.metrics is not None:
+            self.metrics.observe_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() replaces the pool, keep reporting to the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedQueuePool(_WaitTimingMixin, QueuePool):
+    pass
+
+
+def get_pool_options(profile: Optional[str] = None) -> dict:
+    """
+    create_engine keyword arguments for a pool profile.
+
+    Args:
+        profile: managed, dedicated or pgbouncer, defaults to DatabaseConfig.get_pool_profile()
+
+    Returns:
+        dict: poolclass and pool arguments
+    """
+    try:
+        profile = PoolProfile(profile or DatabaseConfig.get_pool_profile())
+    except ValueError:
+        raise ValueError(
+            f"Unsupported pool profile '{profile}', expected one of {', '.join(p.value for p in PoolProfile)}"
+        )
+
+    if profile == PoolProfile.pgbouncer:
+        return {"poolclass": NullPool}
+
+    options = dict(POOL_PROFILES[profile])
+    overrides = {
+        "pool_size": DatabaseConfig.get_pool_size(),
+        "max_overflow": DatabaseConfig.get_max_overflow(),
+        "pool_timeout": DatabaseConfig.get_pool_timeout(),
+        "pool_recycle": DatabaseConfig.get_pool_recycle(),
+    }
+    options.update({key: value for key, value in overrides.items() if value is not None})
+    options["poolclass"] = TimedQueuePool
+    return options
+
+
+def get_pool_capacity(profile: Optional[str] = None) -> Optional[int]:
+    """Connections the pool of a profile hands out at once, None when the application does not pool (pgbouncer)"""
+    options = get_pool_options(profile)
+    if options["poolclass"] is NullPool:
+        return None
+    return options["pool_size"] + options["max_overflow"]
+
+
+def get_threadpool_tokens(profile: Optional[str] = None) -> int:
+    """
+    Size of anyio's default thread limiter, which bounds the sync (def) routes
+    running at once. Every database route holds one thread for the whole
+    request, so this and the pool capacity are the concurrency bound: at most
+    min(tokens, pool capacity) requests run queries at the same time. Requests
+    over the token count wait on the limiter without a thread and without a
+    timeout, requests over the pool capacity wait for a connection up to
+    pool_timeout.
+
+    THREADPOOL_TOKENS overrides it. The default is twice the pool capacity,
+    never below Starlette's 40: streaming exports keep their connection between
+    chunks but need a thread for each one, so the threads must not all be taken
+    by requests waiting for a connection.
+    """
+    tokens = DatabaseConfig.get_threadpool_tokens()
+    if tokens is not None:
+        return tokens
+    capacity = get_pool_capacity(profile)
+    if capacity is None:
+        return DEFAULT_THREADPOOL_TOKENS
+    return max(DEFAULT_THREADPOOL_TOKENS, 2 * capacity)
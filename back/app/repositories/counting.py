@@ -0,0 +1,108 @@
+import json
+import threading
+from typing import Dict, Hashable, Optional
+
+from sqlalchemy import text
+
+from app.utils.cache import TTLCache
+from app.utils.config_utils import GlobalConfig
+from app.utils.logger import logger
+from app.utils.pagination import CountMode
+
+# Exact counts reused by CountMode.cached, keyed by table and filter values
+count_cache = TTLCache(ttl_seconds=GlobalConfig.get_count_cache_ttl_seconds())
+# Bumped by invalidate_counts; part of every cached key so old entries are never read again
+_count_generations: Dict[str, int] = {}
+_count_generations_lock = threading.Lock()
+
+
+def invalidate_counts(*tables: str) -> None:
+    """
+    Drop the cached counts of the given tables, e.g. from uow.on_commit after
+    a write that adds or removes rows, instead of waiting for the TTL
+    """
+    with _count_generations_lock:
+        for table in tables:
+            _count_generations[table] = _count_generations.get(table, 0) + 1
+
+
+def count_rows(
+    session,
+    query,
+    count_mode: CountMode,
+    cache_key: Hashable,
+    table_name: Optional[str] = None
+) -> Optional[int]:
+    """
+    Count the rows of `query` using the requested strategy.
+
+    Args:
+        session: Session the query is bound to
+        query: ORM Query selecting the rows to count (no ORDER BY/LIMIT)
+        count_mode: exact, estimated, cached or none
+        cache_key: Table name followed by the filter values, used by cached mode
+        table_name: Set when the query is unfiltered, so estimated mode can
+            read pg_class.reltuples instead of planning the query
+
+    Returns:
+        The count, or None with CountMode.none
+    """
+    count_mode = CountMode(count_mode)
+    if count_mode == CountMode.none:
+        return None
+
+    if count_mode == CountMode.estimated:
+        estimate = estimate_count(session, query, table_name)
+        if estimate is not None:
+            return estimate
+        return query.count()
+
+    if count_mode == CountMode.cached:
+        key = (_count_generations.get(cache_key[0], 0), cache_key)
+        cached = count_cache.get(key)
+        if cached is not None:
+            return cached
+        total = query.count()
+        count_cache.set(key, total)
+        return total
+
+    return query.count()
+
+
+def estimate_count(session, query, table_name: Optional[str] = None) -> Optional[int]:
+    """
+    Row estimate from PostgreSQL planner statistics, without scanning the table.
+    Returns None when no estimate is available (other dialects, never analyzed tables).
+    """
+    bind = session.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+
+    try:
+        # Savepoint so a failed estimate doesn't abort the surrounding transaction
+        with session.begin_nested():
+            return _estimate_count(session, query, bind, table_name)
+    except Exception as e:
+        logger.warning(f"Falling back to exact count, estimate failed: {e}")
+        return None
+
+
+def _estimate_count(session, query, bind, table_name: Optional[str]) -> int:
+    if table_name is not None:
+        reltuples = session.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table_name)"),
+            {"table_name": f'"{table_name}"'}
+        ).scalar()
+        # reltuples is -1 until the table has been vacuumed/analyzed
+        if reltuples is not None and reltuples >= 0:
+            return int(reltuples)
+
+    statement = query.statement.compile(
+        dialect=bind.dialect,
+        compile_kwargs={"literal_binds": True}
+    )
+    # Sent through the driver as-is: the statement is already rendered for this dialect
+    plan = session.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}").scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
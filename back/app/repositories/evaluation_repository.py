@@ -1,38 +1,90 @@
+from sqlalchemy import select, func, insert, update, delete
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.orm import Session
-from app.data_acess.models import Evaluation
-from app.repositories.repository import AbtractRepository
+from app.data_acess.models import Call, Evaluation
+from app.repositories.repository import AbtractRepository, apply_keyset
 from app.utils.logger import logger
+from app.utils.pagination import CursorToken, CountMode
+from app.repositories.counting import count_rows
+from app.repositories.call_daily_stats_repository import CallDailyStatsRepository
 from app.domain.evaluation_models import EvaluationCreate, EvaluationUpdate
-from typing import List
+from datetime import datetime
+from typing import Iterator, List, Optional, Sequence
 
 class EvaluationRepository(AbtractRepository):
+    # Evaluation columns aggregated into the call_daily_stats rollup
+    ROLLUP_COLUMNS = frozenset({"call_id", "score", "feedback"})
+
+    # Evaluation columns in EvaluationRead field order, for the row based reads
+    READ_COLUMNS = (
+        Evaluation.call_id, Evaluation.evaluator_type, Evaluation.reviewer, Evaluation.evaluation,
+        Evaluation.check, Evaluation.feedback, Evaluation.score, Evaluation.status_feedback_engineer,
+        Evaluation.comments_engineer, Evaluation.id, Evaluation.created
+    )
+
+    # Flat columns of the streaming export, with the clinic of the evaluated call
+    EXPORT_COLUMNS = (
+        Evaluation.id, Evaluation.call_id, Call.clinic_id, Evaluation.evaluator_type,
+        Evaluation.reviewer, Evaluation.evaluation, Evaluation.check, Evaluation.feedback,
+        Evaluation.score, Evaluation.status_feedback_engineer, Evaluation.comments_engineer,
+        Evaluation.created
+    )
+    EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+    # Rows fetched per round-trip from the server-side cursor
+    EXPORT_BATCH_SIZE = 1000
+
     def __init__(self, session: Session):
         self.__session = session
+        self.__daily_stats = CallDailyStatsRepository(session)
+
+    def _fetch(self, query, as_rows: bool):
+        """
+        Run an Evaluation query, or with as_rows its READ_COLUMNS projection
+        as plain dicts, skipping the identity map and model instances
+        """
+        if not as_rows:
+            return query.all()
+        return [row._asdict() for row in query.with_entities(*self.READ_COLUMNS)]
 
-    def list(self):
+    def list(self, as_rows: bool = False):
         logger.info("Getting all evaluations from the database")
         try:
-            return self.__session.query(Evaluation).all()
+            return self._fetch(self.__session.query(Evaluation), as_rows)
         except Exception as e:
             logger.error(f"Error listing evaluations: {e}")
             raise   
     
-    def count(self) -> int:
-        logger.info("Counting total Evaluations")
+    def count(self, count_mode: CountMode = CountMode.exact) -> Optional[int]:
+        logger.info(f"Counting total Evaluations (count_mode={count_mode})")
         try:
-            return self.__session.query(Evaluation).count()
+            return count_rows(
+                self.__session,
+                self.__session.query(Evaluation),
+                count_mode,
+                cache_key=("evaluation",),
+                table_name=Evaluation.__tablename__
+            )
         except Exception as e:
             logger.error(f"Failed to count Evaluations: {e}")
             raise
 
-    def list_paginated(self, offset: int, limit: int) -> List[Evaluation]:
+    def list_paginated(self, offset: int, limit: int, as_rows: bool = False) -> List[Evaluation]:
         logger.info(f"Getting paginated evaluations (offset={offset}, limit={limit})")
         try:
-            return self.__session.query(Evaluation).offset(offset).limit(limit).all()
+            return self._fetch(self.__session.query(Evaluation).offset(offset).limit(limit), as_rows)
         except Exception as e:
             logger.error(f"Error paginating evaluations: {e}")
             raise
 
+    def list_keyset(self, cursor: Optional[CursorToken], limit: int, as_rows: bool = False) -> List[Evaluation]:
+        logger.info(f"Getting keyset page of evaluations (cursor={cursor}, limit={limit})")
+        try:
+            query = self.__session.query(Evaluation)
+            return self._fetch(apply_keyset(query, Evaluation.id, Evaluation.id, cursor, descending=False, limit=limit), as_rows)
+        except Exception as e:
+            logger.error(f"Error getting keyset page of evaluations: {e}")
+            raise
+
     def get(self, evaluation_id: int):
         logger.info(f"Getting evaluation with ID: {evaluation_id}")
         try:
@@ -41,69 +93,169 @@ class EvaluationRepository(AbtractRepository):
             logger.error(f"Error retrieving evaluation {evaluation_id}: {e}")
             raise
 
+    def get_row(self, evaluation_id: int) -> Optional[dict]:
+        """The evaluation as an EvaluationRead shaped dict"""
+        logger.info(f"Getting evaluation row with ID: {evaluation_id}")
+        try:
+            row = self.__session.query(*self.READ_COLUMNS).filter(Evaluation.id == evaluation_id).first()
+            return row._asdict() if row is not None else None
+        except Exception as e:
+            logger.error(f"Error retrieving evaluation row {evaluation_id}: {e}")
+            raise
+
     def add(self, evaluation_create: EvaluationCreate) -> Evaluation:
         logger.info("Adding a new evaluation")
         try:
-            evaluation_data = evaluation_create.model_dump()
-            evaluation = Evaluation(**evaluation_data)            
-
-            self.__session.add(evaluation)
-            self.__session.commit()
-            self.__session.refresh(evaluation)
+            evaluation = self.create(evaluation_create.model_dump())
             logger.info(f"Evaluation created successfully with ID {evaluation.id}")
             return evaluation
         except Exception as e:
-            self.__session.rollback()
             logger.error(f"Error creating evaluation: {e}")
             raise
 
     def create(self, evaluation_data: dict) -> Evaluation:
+        """INSERT ... RETURNING the new row; commit is left to the unit of work"""
         logger.info("Creating a new evaluation from dictionary data")
         try:
-            evaluation = Evaluation(**evaluation_data)
-            self.__session.add(evaluation)
-            self.__session.flush()  # Flush to get the ID
-            self.__session.refresh(evaluation)
+            before = self.__daily_stats.lock_contributions([evaluation_data["call_id"]])
+            evaluation = self.__session.scalars(insert(Evaluation).returning(Evaluation), [evaluation_data]).one()
+            self.__daily_stats.apply_changes(before, [evaluation.call_id])
             logger.info(f"Evaluation created successfully with ID {evaluation.id}")
             return evaluation
         except Exception as e:
             logger.error(f"Error creating evaluation: {e}")
             raise
 
-    def update(self, evaluation_id: int, data: dict):  # Cambiar a dict
+    def insert_many(self, evaluations_data: List[dict]) -> List[int]:
+        """
+        Insert evaluations in batched multi-row INSERT ... RETURNING statements,
+        without loading ORM objects.
+
+        Returns:
+            List[int]: Generated IDs, in the same order as `evaluations_data`
+        """
+        logger.info(f"Bulk inserting {len(evaluations_data)} evaluations")
+        if not evaluations_data:
+            return []
+        try:
+            ids = self.__session.scalars(
+                insert(Evaluation).returning(Evaluation.id, sort_by_parameter_order=True),
+                evaluations_data
+            ).all()
+            logger.info(f"Successfully inserted {len(ids)} evaluations")
+            return list(ids)
+        except Exception as e:
+            logger.error(f"Error bulk inserting evaluations: {e}")
+            raise
+
+    def update(self, evaluation_id: int, data: dict):
+        return self.update_by_id(evaluation_id, data)
+
+    def update_by_id(self, evaluation_id: int, data: dict):
+        """UPDATE ... WHERE id = :id RETURNING the updated row; commit is left to the unit of work"""
         logger.info(f"Updating evaluation with ID {evaluation_id}")
+        if not data:
+            # Nothing to set: read the bare row, as RETURNING would have returned it
+            return self.__session.scalars(
+                select(Evaluation).where(Evaluation.id == evaluation_id).execution_options(populate_existing=True)
+            ).one_or_none()
         try:
-            evaluation = self.get(evaluation_id)
-            if not evaluation:
+            call_ids = []
+            before = {}
+            updates_rollup = bool(data.keys() & self.ROLLUP_COLUMNS)
+            if updates_rollup:
+                previous_call_id = self._lock_call_id(evaluation_id)
+                if previous_call_id is None:
+                    logger.warning(f"Evaluation with ID {evaluation_id} not found")
+                    return None
+                # Moving the evaluation also changes the rollup of its previous call
+                call_ids = [previous_call_id, data.get("call_id", previous_call_id)]
+                before = self.__daily_stats.lock_contributions(call_ids)
+
+            evaluation = self.__session.scalars(
+                update(Evaluation)
+                .where(Evaluation.id == evaluation_id)
+                .values(**data)
+                .returning(Evaluation)
+                .execution_options(populate_existing=True)
+            ).one_or_none()
+            if evaluation is None:
                 logger.warning(f"Evaluation with ID {evaluation_id} not found")
                 return None
-            
-            # data ya es un dict, úsalo directamente
-            for key, value in data.items():
-                setattr(evaluation, key, value)
-            
-            self.__session.commit()
-            self.__session.refresh(evaluation)
+
+            if updates_rollup:
+                self.__daily_stats.apply_changes(before, call_ids)
             logger.info(f"Evaluation with ID {evaluation_id} updated successfully")
             return evaluation
         except Exception as e:
-            self.__session.rollback()
             logger.error(f"Error updating evaluation {evaluation_id}: {e}")
             raise
 
     def delete(self, evaluation_id: int):
+        return self.delete_by_id(evaluation_id)
+
+    def delete_by_id(self, evaluation_id: int) -> bool:
+        """DELETE ... WHERE id = :id, subtracting the change from its call's rollup rows"""
         logger.info(f"Deleting evaluation with ID {evaluation_id}")
         try:
-            evaluation = self.get(evaluation_id)
-            if evaluation:
-                self.__session.delete(evaluation)
-                self.__session.commit()
-                logger.info(f"Evaluation with ID {evaluation_id} deleted successfully")
-                return True
-            else:
+            call_id = self._lock_call_id(evaluation_id)
+            if call_id is None:
                 logger.warning(f"Evaluation with ID {evaluation_id} not found for deletion")
                 return False
+            before = self.__daily_stats.lock_contributions([call_id])
+            self.__session.execute(delete(Evaluation).where(Evaluation.id == evaluation_id))
+            self.__daily_stats.apply_changes(before, [call_id])
+            logger.info(f"Evaluation with ID {evaluation_id} deleted successfully")
+            return True
         except Exception as e:
-            self.__session.rollback()
             logger.error(f"Error deleting evaluation {evaluation_id}: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def _lock_call_id(self, evaluation_id: int) -> Optional[int]:
+        """
+        Lock the evaluation until commit and return its call_id, which can then
+        not change before the call is locked. Evaluations are always locked
+        before their calls (see CallRepository.delete_by_id).
+        """
+        return self.__session.scalar(
+            select(Evaluation.call_id)
+            .where(Evaluation.id == evaluation_id)
+            .with_for_update()
+            .with_hint(Evaluation, "WITH (UPDLOCK, ROWLOCK)", "mssql")
+        )
+
+    def export_batches(
+        self,
+        clinic_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> Iterator[Sequence[RowMapping]]:
+        """
+        Stream evaluations in id order through a server-side cursor, `batch_size`
+        rows at a time. The date range applies to the evaluation's created date.
+
+        Returns:
+            Iterator[Sequence[RowMapping]]: Batches of rows keyed by EXPORT_FIELDS
+        """
+        logger.info(f"Exporting evaluations: clinic_id={clinic_id}, start_date={start_date}, end_date={end_date}")
+        statement = select(*self.EXPORT_COLUMNS)\
+            .join(Call, Call.id == Evaluation.call_id)\
+            .order_by(Evaluation.id)
+        if clinic_id is not None:
+            statement = statement.where(Call.clinic_id == clinic_id)
+        if start_date:
+            statement = statement.where(Evaluation.created >= start_date)
+        if end_date:
+            statement = statement.where(Evaluation.created <= end_date)
+
+        try:
+            result = self.__session.execute(statement.execution_options(yield_per=batch_size))
+            exported = 0
+            for batch in result.mappings().partitions():
+                exported += len(batch)
+                yield batch
+            logger.info(f"Successfully exported {exported} evaluations")
+        except Exception as e:
+            logger.error(f"Error exporting evaluations: {e}")
+            raise
@@ -0,0 +1,198 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select, func, case, and_, distinct, true
+from app.data_acess.models import Call, Evaluation, Clinic, CallDailyStats
+from app.domain.call_models import CallType
+from app.repositories.call_daily_stats_repository import CALL_TIME
+from app.utils.logger import logger
+
+
+class MetricsRepository:
+    """Read-only aggregates for the dashboard"""
+
+    TOP_CLINICS_LIMIT = 5
+
+    def __init__(self, session):
+        self.__session = session
+
+    @staticmethod
+    def _call_filters(
+        clinic_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ):
+        """Dates apply to CALL_TIME, the moment the rollup buckets a call by"""
+        filters = []
+        if clinic_id:
+            filters.append(Call.clinic_id == clinic_id)
+        if start_date:
+            filters.append(CALL_TIME >= start_date)
+        if end_date:
+            filters.append(CALL_TIME <= end_date)
+        return filters
+
+    @staticmethod
+    def _daily_stats_filters(
+        clinic_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ):
+        filters = []
+        if clinic_id:
+            filters.append(CallDailyStats.clinic_id == clinic_id)
+        if start_date:
+            filters.append(CallDailyStats.day >= start_date.date())
+        if end_date:
+            filters.append(CallDailyStats.day <= end_date.date())
+        return filters
+
+    def get_dashboard_totals(
+        self,
+        clinic_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> dict:
+        """
+        Compute every dashboard total in a single statement.
+
+        Calls and evaluations are aggregated in separate CTEs so evaluation
+        rows don't inflate call totals; both CTEs return a single row that
+        is selected together with the clinic count.
+
+        Returns:
+            dict: total_clinics, total_calls, average_duration, one
+            `<call_type>_calls` entry per CallType, total_evaluations,
+            average_score and calls_with_feedback
+        """
+        logger.info(f"Start getting dashboard totals: clinic_id={clinic_id}, start_date={start_date}, end_date={end_date}")
+        try:
+            filters = self._call_filters(clinic_id, start_date, end_date)
+
+            call_columns = [
+                func.count(Call.id).label("total_calls"),
+                func.avg(Call.duration).label("average_duration"),
+            ]
+            for call_type in CallType:
+                call_columns.append(
+                    func.count(case((Call.call_type == call_type, Call.id))).label(f"{call_type.value}_calls")
+                )
+            call_stats = select(*call_columns)\
+                .where(*filters)\
+                .cte("call_stats")
+
+            has_feedback = and_(Evaluation.feedback.isnot(None), Evaluation.feedback != '')
+            evaluation_stats = select(
+                func.count(Evaluation.id).label("total_evaluations"),
+                func.avg(Evaluation.score).label("average_score"),
+                func.count(distinct(case((has_feedback, Evaluation.call_id)))).label("calls_with_feedback"),
+            ).join(Call, Evaluation.call_id == Call.id)\
+                .where(*filters)\
+                .cte("evaluation_stats")
+
+            total_clinics = select(func.count(Clinic.id)).scalar_subquery()
+
+            statement = select(
+                total_clinics.label("total_clinics"),
+                call_stats,
+                evaluation_stats
+            ).select_from(call_stats.join(evaluation_stats, true()))
+
+            row = self.__session.execute(statement).mappings().one()
+            logger.info("Successful operation to get dashboard totals")
+            return dict(row)
+        except Exception as e:
+            logger.error(f"Failed operation to get dashboard totals: {e}")
+            raise
+
+    def get_top_clinics(
+        self,
+        clinic_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = TOP_CLINICS_LIMIT
+    ) -> list[dict]:
+        """Clinics with the most calls matching the filters, busiest first"""
+        logger.info(f"Start getting top {limit} clinics by calls")
+        try:
+            filters = self._call_filters(clinic_id, start_date, end_date)
+            call_count = func.count(Call.id).label("call_count")
+            statement = select(Clinic.name, call_count)\
+                .join(Call, Call.clinic_id == Clinic.id)\
+                .where(*filters)\
+                .group_by(Clinic.name)\
+                .order_by(call_count.desc(), Clinic.name)\
+                .limit(limit)
+
+            rows = self.__session.execute(statement).all()
+            logger.info(f"Successful operation to get top clinics: {len(rows)} items")
+            return [{"clinic_name": row.name, "call_count": row.call_count} for row in rows]
+        except Exception as e:
+            logger.error(f"Failed operation to get top clinics: {e}")
+            raise
+
+    def get_rollup_totals(
+        self,
+        clinic_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> dict:
+        """
+        Same totals as get_dashboard_totals, summed from call_daily_stats.
+        Dates are applied with day granularity (whole days, both ends included).
+        """
+        logger.info(f"Start getting rollup dashboard totals: clinic_id={clinic_id}, start_date={start_date}, end_date={end_date}")
+        try:
+            filters = self._daily_stats_filters(clinic_id, start_date, end_date)
+
+            def total(column):
+                return func.coalesce(func.sum(column), 0)
+
+            columns = [
+                select(func.count(Clinic.id)).scalar_subquery().label("total_clinics"),
+                total(CallDailyStats.call_count).label("total_calls"),
+                (func.sum(CallDailyStats.duration_sum) / func.nullif(func.sum(CallDailyStats.duration_count), 0)).label("average_duration"),
+            ]
+            for call_type in CallType:
+                columns.append(
+                    total(case((CallDailyStats.call_type == call_type, CallDailyStats.call_count), else_=0)).label(f"{call_type.value}_calls")
+                )
+            columns += [
+                total(CallDailyStats.evaluation_count).label("total_evaluations"),
+                (func.sum(CallDailyStats.score_sum) / func.nullif(func.sum(CallDailyStats.score_count), 0)).label("average_score"),
+                total(CallDailyStats.feedback_call_count).label("calls_with_feedback"),
+            ]
+            statement = select(*columns).select_from(CallDailyStats).where(*filters)
+
+            row = self.__session.execute(statement).mappings().one()
+            logger.info("Successful operation to get rollup dashboard totals")
+            return dict(row)
+        except Exception as e:
+            logger.error(f"Failed operation to get rollup dashboard totals: {e}")
+            raise
+
+    def get_rollup_top_clinics(
+        self,
+        clinic_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = TOP_CLINICS_LIMIT
+    ) -> list[dict]:
+        """Top clinics by calls, summed from call_daily_stats"""
+        logger.info(f"Start getting top {limit} clinics by calls from rollup")
+        try:
+            filters = self._daily_stats_filters(clinic_id, start_date, end_date)
+            call_count = func.sum(CallDailyStats.call_count).label("call_count")
+            statement = select(Clinic.name, call_count)\
+                .join(CallDailyStats, CallDailyStats.clinic_id == Clinic.id)\
+                .where(*filters)\
+                .group_by(Clinic.name)\
+                .order_by(call_count.desc(), Clinic.name)\
+                .limit(limit)
+
+            rows = self.__session.execute(statement).all()
+            logger.info(f"Successful operation to get top clinics from rollup: {len(rows)} items")
+            return [{"clinic_name": row.name, "call_count": row.call_count} for row in rows]
+        except Exception as e:
+            logger.error(f"Failed operation to get top clinics from rollup: {e}")
+            raise
@@ -0,0 +1,69 @@
+import re
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.logger import logger
+
+_WHITESPACE = re.compile(r"\s+")
+# Driver placeholders: %(name)s (psycopg2), $1 (asyncpg), :name
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|\$\d+|(?<![:\w]):\w+")
+# Expanded IN lists and multi-row VALUES differ only by their number of parameters
+_IN_LIST = re.compile(r"\bIN \((?:[^()]*,)+[^()]*\)", re.IGNORECASE)
+_VALUES_ROWS = re.compile(r"\bVALUES (\([^()]*\))(?:, \([^()]*\))+", re.IGNORECASE)
+
+# Longest statement text written to the log
+MAX_STATEMENT_LENGTH = 2000
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    One line SQL with placeholders as ? and IN lists and VALUES rows collapsed,
+    so the same query always logs the same
+    """
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _PLACEHOLDER.sub("?", statement)
+    statement = _IN_LIST.sub("IN (...)", statement)
+    statement = _VALUES_ROWS.sub(r"VALUES \1, ...", statement)
+    if len(statement) > MAX_STATEMENT_LENGTH:
+        statement = statement[:MAX_STATEMENT_LENGTH] + "..."
+    return statement
+
+
+class SlowQueryLogger:
+    """
+    Logs statements that take longer than a threshold, timed between the
+    before_cursor_execute and after_cursor_execute engine events.
+    Parameters are never logged.
+    """
+
+    def __init__(self, threshold_ms: float) -> None:
+        self.threshold_ms = threshold_ms
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info["query_start_time"].pop()
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        normalized = normalize_statement(statement)
+        rowcount = cursor.rowcount
+        logger.warning(
+            f"Slow query: {duration_ms:.1f} ms, {rowcount} rows{' (executemany)' if executemany else ''}: {normalized}",
+            extra={
+                "event": "slow_query",
+                "duration_ms": round(duration_ms, 1),
+                "rowcount": rowcount,
+                "executemany": executemany,
+                "statement": normalized,
+            }
+        )
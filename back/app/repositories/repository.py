@@ -1,5 +1,7 @@
 import abc
 
+from sqlalchemy import and_, or_
+
 class AbtractRepository(abc.ABC):
     @abc.abstractmethod
     def list(self):
@@ -19,4 +21,40 @@ class AbtractRepository(abc.ABC):
     
     @abc.abstractmethod
     def delete(self, identifier):
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+
+def apply_keyset(query, sort_column, id_column, cursor, descending: bool, limit: int):
+    """
+    Apply keyset (seek) pagination to a query ordered by (sort_column, id_column).
+
+    Instead of OFFSET, rows are filtered to those strictly after the cursor so
+    every page costs the same index range scan. A "prev" cursor walks backwards:
+    the comparison and ordering are flipped and the caller reverses the rows.
+    """
+    backwards = cursor is not None and cursor.direction == "prev"
+    ascending = descending == backwards
+    same_column = sort_column is id_column
+
+    if cursor is not None:
+        if same_column:
+            condition = id_column > cursor.id if ascending else id_column < cursor.id
+        elif ascending:
+            condition = or_(
+                sort_column > cursor.value,
+                and_(sort_column == cursor.value, id_column > cursor.id)
+            )
+        else:
+            condition = or_(
+                sort_column < cursor.value,
+                and_(sort_column == cursor.value, id_column < cursor.id)
+            )
+        query = query.filter(condition)
+
+    if same_column:
+        query = query.order_by(id_column.asc() if ascending else id_column.desc())
+    elif ascending:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+    else:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    return query.limit(limit)
@@ -3,6 +3,8 @@ import urllib.parse
 from sqlalchemy import create_engine
 from app.utils.config_utils import DatabaseConfig
 from sqlalchemy.orm import sessionmaker
+from app.repositories.connection_pool import PoolMetrics, get_pool_options
+from app.repositories.query_logging import SlowQueryLogger
 from app.utils.logger import logger
 
 class ConnectionStringBuilder:
@@ -31,20 +33,25 @@ class ConnectionStringBuilder:
         else:
             raise ValueError(f"Unsupported database type: {db_type}")
 
+def attach_slow_query_logging(engine) -> None:
+    threshold_ms = DatabaseConfig.get_slow_query_threshold_ms()
+    if threshold_ms is not None:
+        SlowQueryLogger(threshold_ms).attach(engine)
+
+
 class SQLClient:
-    def __init__(self, url=ConnectionStringBuilder.get_default_connection_string()):
+    def __init__(self, url=ConnectionStringBuilder.get_default_connection_string(), pool_profile: str = None):
         try:
+            # Pool sizing comes from the DB_POOL_PROFILE profile, see connection_pool.POOL_PROFILES
             engine = create_engine(
                 url, 
-                echo=True,
-                # Conservative pool configuration for Supabase
-                pool_size=3,  # Reduced pool size for Supabase limits
-                max_overflow=5,  # Reduced overflow for Supabase limits
-                pool_timeout=20,  # Shorter timeout
-                pool_recycle=1800,  # Recycle connections after 30 minutes
-                pool_pre_ping=True,  # Verify connections before using them
-                pool_reset_on_return='commit'  # Reset connections when returned to pool
+                echo=DatabaseConfig.get_echo(),
+                **get_pool_options(pool_profile)
             )
+            self.__engine = engine
+            self.__pool_metrics = PoolMetrics("sync")
+            self.__pool_metrics.attach(engine)
+            attach_slow_query_logging(engine)
             self.__session = sessionmaker(
                 autocommit=False, 
                 autoflush=False, 
@@ -59,4 +66,12 @@ class SQLClient:
     def get_session(self):
         return self.__session()
 
-sql_client = SQLClient()
\ No newline at end of file
+    def get_pool_metrics(self) -> dict:
+        return self.__pool_metrics.snapshot(self.__engine)
+
+sql_client = SQLClient()
+
+
+def get_pool_metrics() -> list:
+    """Pool metrics of the application's SQL client"""
+    return [sql_client.get_pool_metrics()]
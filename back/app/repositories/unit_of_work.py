@@ -1,10 +1,14 @@
 import abc
+from typing import Callable, List
 
 from app.repositories.sql_client import sql_client
 from app.repositories.clinic_repository import ClinicRepository
 from app.repositories.call_repository import CallRepository
 from app.repositories.evaluation_repository import EvaluationRepository
 from app.repositories.user_repository import UserRepository
+from app.repositories.metrics_repository import MetricsRepository
+from app.repositories.call_daily_stats_repository import CallDailyStatsRepository
+from app.utils.logger import logger
 
 class AbstractUnitOfWork(abc.ABC):
 
@@ -25,31 +29,53 @@ class AbstractUnitOfWork(abc.ABC):
         pass
 
 class UnitOfWork(AbstractUnitOfWork):
+    """
+    Session and repositories for one transaction. Re-entrant: a `with` block
+    on a unit of work that is already open joins it, and only the outermost
+    block commits (or rolls back) and closes the session. This lets a request
+    share one unit of work across services (see get_unit_of_work).
+
+    The unit of work owns the transaction: repositories only flush, and the
+    single commit happens when the outermost block exits.
+    """
     def __init__(self):
         self.__session = sql_client.get_session()
+        self.__depth = 0
+        self.__on_commit: List[Callable[[], None]] = []
         self.__clinic_repo = None
         self.__call_repo = None
         self.__evaluation_repo = None
         self.__user_repo = None
+        self.__metrics_repo = None
+        self.__daily_stats_repo = None
     
     def __enter__(self):
+        self.__depth += 1
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self.__depth -= 1
+        if self.__depth > 0:
+            # Nested block, the outermost one ends the transaction
+            return
         try:
             if exc_type is not None:
                 # If there was an exception, rollback the transaction
                 self.__session.rollback()
             else:
                 # If no exception, commit the transaction
-                self.__session.commit()
+                self.commit()
         except Exception as e:
-            # If commit/rollback fails, try to rollback
+            # A failed commit must reach the caller, the writes were lost
+            logger.error(f"Failed to end the unit of work transaction: {e}")
             try:
                 self.__session.rollback()
-            except:
+            except Exception:
                 pass
+            if exc_type is None:
+                raise
         finally:
+            self.__on_commit.clear()
             # Always close the session
             try:
                 self.__session.close()
@@ -57,12 +83,23 @@ class UnitOfWork(AbstractUnitOfWork):
                 # Log but don't raise - session close errors shouldn't break the app
                 pass
 
+    def on_commit(self, callback: Callable[[], None]):
+        """
+        Run `callback` once the transaction commits, e.g. to invalidate caches
+        only when the write is actually visible. Dropped on rollback.
+        """
+        self.__on_commit.append(callback)
+
     def commit(self):
         """Manually commit the transaction"""
         self.__session.commit()
+        callbacks, self.__on_commit = self.__on_commit, []
+        for callback in callbacks:
+            callback()
 
     def rollback(self):
         """Manually rollback the transaction"""
+        self.__on_commit.clear()
         self.__session.rollback()
 
     def close(self):
@@ -91,4 +128,16 @@ class UnitOfWork(AbstractUnitOfWork):
     def users(self):
         if self.__user_repo is None:
             self.__user_repo = UserRepository(self.__session)
-        return self.__user_repo
\ No newline at end of file
+        return self.__user_repo
+
+    @property
+    def metrics(self):
+        if self.__metrics_repo is None:
+            self.__metrics_repo = MetricsRepository(self.__session)
+        return self.__metrics_repo
+
+    @property
+    def daily_stats(self):
+        if self.__daily_stats_repo is None:
+            self.__daily_stats_repo = CallDailyStatsRepository(self.__session)
+        return self.__daily_stats_repo
@@ -1,6 +1,9 @@
+from sqlalchemy import select, func, insert, update, delete
 from app.data_acess.models import User
-from app.repositories.repository import AbtractRepository
+from app.repositories.repository import AbtractRepository, apply_keyset
 from app.utils.logger import logger
+from app.utils.pagination import CountMode
+from app.repositories.counting import count_rows
 from datetime import datetime
 
 class UserRepository(AbtractRepository):
@@ -28,11 +31,29 @@ class UserRepository(AbtractRepository):
             logger.error(f'Failed Operation to get paginated users: {e}')
             raise
 
-    def count(self) -> int:
+    def list_keyset(self, cursor, limit: int):
+        """Get a keyset page of users ordered by id"""
+        logger.info(f"Start getting keyset page of users: cursor={cursor}, limit={limit}")
+        try:
+            query = self.__session.query(User)
+            users = apply_keyset(query, User.id, User.id, cursor, descending=False, limit=limit).all()
+            logger.info(f"Successful operation to get keyset page of users: {len(users)} items")
+            return users
+        except Exception as e:
+            logger.error(f'Failed Operation to get keyset page of users: {e}')
+            raise
+
+    def count(self, count_mode: CountMode = CountMode.exact):
         """Get total count of users"""
-        logger.info("Start counting users")
+        logger.info(f"Start counting users (count_mode={count_mode})")
         try:
-            count = self.__session.query(User).count()
+            count = count_rows(
+                self.__session,
+                self.__session.query(User),
+                count_mode,
+                cache_key=("user",),
+                table_name=User.__tablename__
+            )
             logger.info(f"Successful count operation: {count} users")
             return count
         except Exception as e:
@@ -101,30 +122,41 @@ class UserRepository(AbtractRepository):
             raise
 
     def add(self, user: User):
+        """INSERT ... RETURNING the new row; commit is left to the unit of work"""
         logger.info("Starting to add a user to database")
         try:
-            self.__session.add(user)
-            self.__session.flush()  # Flush to get the ID
-            self.__session.refresh(user)
-            logger.info(f"Successfully added user: {user.username}")
-            return user
+            created = self.__session.scalars(
+                insert(User).returning(User), [user.model_dump(exclude_none=True)]
+            ).one()
+            logger.info(f"Successfully added user: {created.username}")
+            return created
         except Exception as e:
             logger.error(f"Failed to add user: {e}")
             raise
 
     def update(self, user_id: int, user_data: dict):
+        return self.update_by_id(user_id, user_data)
+
+    def update_by_id(self, user_id: int, user_data: dict):
+        """UPDATE ... WHERE id = :id RETURNING the updated row; commit is left to the unit of work"""
         logger.info(f"Starting to update user with id: {user_id}")
+        if not user_data:
+            # Nothing to set: read the bare row, as RETURNING would have returned it
+            return self.__session.scalars(
+                select(User).where(User.id == user_id).execution_options(populate_existing=True)
+            ).one_or_none()
         try:
-            user = self.get(user_id)
+            user = self.__session.scalars(
+                update(User)
+                .where(User.id == user_id)
+                .values(**user_data)
+                .returning(User)
+                .execution_options(populate_existing=True)
+            ).one_or_none()
             if user is None:
                 logger.error(f"User with id {user_id} not found")
                 return None
-            
-            for key, value in user_data.items():
-                setattr(user, key, value)
-            
-            self.__session.flush()
-            self.__session.refresh(user)
+
             logger.info(f"Successfully updated user: {user.username}")
             return user
         except Exception as e:
@@ -135,32 +167,30 @@ class UserRepository(AbtractRepository):
         """Update user's last login timestamp"""
         logger.info(f"Starting to update last login for user with id: {user_id}")
         try:
-            user = self.get(user_id)
-            if user is None:
-                logger.error(f"User with id {user_id} not found")
-                return None
-            
-            user.last_login = datetime.utcnow()
-            self.__session.flush()
-            self.__session.refresh(user)
-            logger.info(f"Successfully updated last login for user: {user.username}")
+            user = self.update_by_id(user_id, {"last_login": datetime.utcnow()})
+            if user is not None:
+                logger.info(f"Successfully updated last login for user: {user.username}")
             return user
         except Exception as e:
             logger.error(f"Failed to update last login: {e}")
             raise
 
     def delete(self, user_id: int):
+        return self.delete_by_id(user_id)
+
+    def delete_by_id(self, user_id: int) -> bool:
+        """DELETE ... WHERE id = :id RETURNING id, without loading the user first"""
         logger.info(f"Starting to delete user with id: {user_id}")
         try:
-            user = self.get(user_id)
-            if user is None:
+            deleted_id = self.__session.scalar(
+                delete(User).where(User.id == user_id).returning(User.id)
+            )
+            if deleted_id is None:
                 logger.error(f"User with id {user_id} not found")
                 return False
-            
-            self.__session.delete(user)
-            self.__session.flush()
-            logger.info(f"Successfully deleted user: {user.username}")
+
+            logger.info(f"Successfully deleted user with id: {user_id}")
             return True
         except Exception as e:
             logger.error(f"Failed to delete user: {e}")
-            raise 
\ No newline at end of file
+            raise
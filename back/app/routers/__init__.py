@@ -6,6 +6,8 @@ from app.routers.user_router import router as user_router
 from app.routers.auth_router import router as auth_router
 from app.routers.test_router import router as test_router
 from app.routers.metrics_router import router as metrics_router
+from app.routers.import_router import router as import_router
+from app.routers.export_router import router as export_router
 
 # Main API router
 api_router = APIRouter()
@@ -18,6 +20,8 @@ api_router.include_router(evaluation_router)
 api_router.include_router(user_router)
 api_router.include_router(test_router)
 api_router.include_router(metrics_router)
+api_router.include_router(import_router)
+api_router.include_router(export_router)
 
 # You can add more routers here as you create them:
 # from app.routers.call_router import router as call_router
@@ -11,7 +11,7 @@ from app.utils.logger import logger
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 @router.post("/token", response_model=Token)
-async def login_for_access_token(
+def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     service = Depends(get_user_service)
 ) -> Token:
@@ -38,7 +38,7 @@ async def login_for_access_token(
     return Token(access_token=access_token, token_type="bearer")
 
 @router.get("/me", response_model=UserResponse)
-async def read_users_me(
+def read_users_me(
     current_user: Annotated[UserResponse, Depends(get_current_user_dependency)]
 ) -> UserResponse:
     """
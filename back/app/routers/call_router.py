@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
 from app.services.call_services import CallService
-from app.utils.pagination import get_pagination_params, PaginationResponse
-from app.domain.call_models import CallRead, CallCreate, CallUpdate
+from app.repositories.unit_of_work import UnitOfWork
+from app.utils.dependencies import get_unit_of_work
+from app.utils.pagination import get_pagination_params, PaginationResponse, CustomPagination
+from app.domain.call_models import CallRead, CallCreate, CallUpdate, CallBulkUpsert, CallBulkUpsertResult, CallSearchMode, CallSearchResult
+from app.utils.export_utils import ExportFormat, MEDIA_TYPES, export_filename
 from app.utils.logger import logger
+from app.utils.responses import serialized
 
 router = APIRouter(
     prefix="/calls",
@@ -11,11 +18,22 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-def get_call_service() -> CallService:
+def get_call_service(uow: UnitOfWork = Depends(get_unit_of_work)) -> CallService:
+    return CallService(unit_of_work_factory=lambda: uow)
+
+def get_export_call_service() -> CallService:
+    # Exports stream after the request's unit of work has closed, they open their own
     return CallService()
 
+def _integrity_error_detail(error: IntegrityError) -> str:
+    """Client safe description of a constraint violation"""
+    # 23503 is the SQLSTATE of a foreign key violation; other drivers only say it in the message
+    if getattr(error.orig, "pgcode", None) == "23503" or "FOREIGN KEY" in str(error.orig).upper():
+        return "Calls reference a clinic that does not exist"
+    return "Conflicting call data"
+
 @router.get("/", response_model=PaginationResponse[CallRead], summary="Get all calls (paginated)")
-async def get_calls(
+def get_calls(
     pagination = Depends(get_pagination_params),
     service: CallService = Depends(get_call_service)
 ):
@@ -25,20 +43,25 @@ async def get_calls(
     Query Parameters:
         page (int): Page number (default: 1)
         items_per_page (int): Items per page (default: 10, max: 100)
+        pagination_mode (str, optional): "page" (default) or "cursor" for keyset pagination
+        cursor (str, optional): next_cursor/prev_cursor token from a previous cursor page
+        count_mode (str, optional): Total count strategy - "exact" (default), "estimated", "cached" or "none"
     
     Returns:
         PaginationResponse[Call]: Paginated list of calls
     """
     try:
         calls = service.get_calls_paginated(pagination)
-        return calls
+        return serialized(calls)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in get_calls endpoint: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
     
 
 @router.get("/all", response_model=List[CallRead], summary="Get all calls (no pagination)")
-async def get_all_calls(
+def get_all_calls(
     service: CallService = Depends(get_call_service)
 ):
     """
@@ -56,9 +79,71 @@ async def get_all_calls(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
         )
-    
+
+
+@router.get("/export", response_class=StreamingResponse, summary="Stream calls as NDJSON or CSV")
+def export_calls(
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format", description="ndjson or csv"),
+    clinic_id: Optional[int] = Query(None, description="Only export the calls of this clinic"),
+    start_date: Optional[datetime] = Query(None, description="Calls started at or after this time"),
+    end_date: Optional[datetime] = Query(None, description="Calls started at or before this time"),
+    service: CallService = Depends(get_export_call_service)
+):
+    """
+    Download calls without loading them all in memory: rows are read from a
+    server-side cursor and written to the response batch by batch.
+
+    Query Parameters:
+        format (str): "ndjson" (default) or "csv"
+        clinic_id (int, optional): Filter by clinic
+        start_date (datetime, optional): Minimum call_start_time
+        end_date (datetime, optional): Maximum call_start_time
+
+    Returns:
+        StreamingResponse: Calls in id order, with their clinic name
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must be before end_date")
+
+    return StreamingResponse(
+        service.export_calls(export_format, clinic_id, start_date, end_date),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{export_filename("calls", export_format)}"'}
+    )
+
+
+@router.get("/search", response_model=PaginationResponse[CallSearchResult], summary="Full-text search of calls")
+def search_calls(
+    q: str = Query(..., min_length=1, max_length=500, description="Words to find in the call summary and reason"),
+    clinic_id: Optional[int] = Query(None, description="Restrict the search to one clinic"),
+    items_per_page: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor/prev_cursor token from a previous page"),
+    service: CallService = Depends(get_call_service)
+):
+    """
+    Find calls across all clinics by what was said, best matches first.
+
+    Query Parameters:
+        q (str): Search terms. Supports "quoted phrases", OR and -excluded words
+        clinic_id (int, optional): Only search the calls of this clinic
+        items_per_page (int): Items per page (default: 10, max: 100)
+        cursor (str, optional): next_cursor/prev_cursor token from a previous page
+
+    Returns:
+        PaginationResponse[CallSearchResult]: Ranked calls with highlighted summary and reason snippets
+    """
+    try:
+        pagination = CustomPagination(page=1, items_per_page=items_per_page, cursor=cursor, mode="cursor")
+        return service.search_calls(q, pagination, clinic_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in search_calls endpoint: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.get("/{call_id}", response_model=CallRead, summary="Get call by ID")
-async def get_call(
+def get_call(
     call_id: int,
     service: CallService = Depends(get_call_service)
 ):
@@ -81,7 +166,7 @@ async def get_call(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Call with ID {call_id} not found"
             )
-        return call
+        return serialized(call)
     except HTTPException:
         raise
     except Exception as e:
@@ -92,7 +177,7 @@ async def get_call(
         )
 
 @router.post("/", response_model=CallRead, status_code=status.HTTP_201_CREATED, summary="Create new call")
-async def create_call(
+def create_call(
     call_data: CallCreate,
     service: CallService = Depends(get_call_service)
 ):
@@ -123,8 +208,48 @@ async def create_call(
             detail="Internal server error"
         )
 
+@router.post("/bulk", response_model=CallBulkUpsertResult, summary="Create or update calls in bulk")
+def upsert_calls(
+    payload: CallBulkUpsert,
+    service: CallService = Depends(get_call_service)
+):
+    """
+    Create or update up to 10000 calls in one request, matching existing calls by call_id.
+    Safe to retry: sending the same calls again updates them instead of failing.
+    
+    Args:
+        payload (CallBulkUpsert): The calls to create or update
+        
+    Returns:
+        CallBulkUpsertResult: How many calls were inserted and how many updated
+        
+    Raises:
+        HTTPException: If validation fails (e.g. unknown clinic_id) or upsert error
+    """
+    try:
+        return service.upsert_calls(payload.calls)
+    except IntegrityError as e:
+        # The driver message names constraints and SQL, it is only logged
+        logger.warning(f"Rejected bulk call upsert: {e.orig}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=_integrity_error_detail(e)
+        )
+    except ValueError as e:
+        logger.warning(f"Rejected bulk call upsert: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid call data"
+        )
+    except Exception as e:
+        logger.error(f"Error in upsert_calls endpoint: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
 @router.put("/{call_id}", response_model=CallRead, summary="Update call")
-async def update_call(
+def update_call(
     call_id: int,
     call_data: CallUpdate,
     service: CallService = Depends(get_call_service)
@@ -166,7 +291,7 @@ async def update_call(
     
 
 @router.delete("/{call_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Delete call")
-async def delete_call(
+def delete_call(
     call_id: int,
     service: CallService = Depends(get_call_service)
 ):
@@ -197,10 +322,11 @@ async def delete_call(
 
 
 @router.get("/clinic/{clinic_id}", response_model=PaginationResponse[CallRead], summary="Get calls by clinic (paginated)")
-async def get_calls_by_clinic(
+def get_calls_by_clinic(
     clinic_id: int,
     pagination = Depends(get_pagination_params),
     search: str = None,
+    search_mode: CallSearchMode = CallSearchMode.substring,
     call_type: str = None,
     sort_by: str = "created",
     sort_order: str = "desc",
@@ -215,9 +341,15 @@ async def get_calls_by_clinic(
     Query Parameters:
         page (int): Page number (default: 1)
         items_per_page (int): Items per page (default: 10, max: 100)
-        search (str, optional): Search term to filter by call_id or customer_phone (case-insensitive partial match)
+        pagination_mode (str, optional): "page" (default) or "cursor" for keyset pagination
+        cursor (str, optional): next_cursor/prev_cursor token from a previous cursor page
+        count_mode (str, optional): Total count strategy - "exact" (default), "estimated", "cached" or "none"
+        search (str, optional): Search term to filter by call_id, customer_phone or customer_name (case-insensitive partial match)
+        search_mode (str, optional): "substring" (default) for the partial match above, or "fulltext" to match
+            words in the summary and call_reason (supports quoted phrases, OR and -exclusion)
         call_type (str, optional): Filter by call type - "inbound" or "outbound"
-        sort_by (str, optional): Field to sort by - "created", "call_start_time", "duration", "call_id" (default: "created")
+        sort_by (str, optional): Field to sort by - "created", "call_start_time", "duration", "call_id" (default: "created").
+            Cursor pagination supports "created", "call_id" and "id"
         sort_order (str, optional): Sort order - "asc" or "desc" (default: "desc")
     
     Returns:
@@ -244,11 +376,14 @@ async def get_calls_by_clinic(
             search=search,
             call_type=call_type,
             sort_by=sort_by,
-            sort_order=sort_order.lower()
+            sort_order=sort_order.lower(),
+            search_mode=search_mode
         )
-        return calls
+        return serialized(calls)
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in get_calls_by_clinic endpoint: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
 from app.services.clinic_services import ClinicService
+from app.repositories.unit_of_work import UnitOfWork
+from app.utils.dependencies import get_unit_of_work
 from app.domain.clinics_models import Clinic, ClinicCreate, ClinicUpdate
 from app.utils.logger import logger
 from app.utils.pagination import get_pagination_params, PaginationResponse
@@ -13,11 +15,11 @@ router = APIRouter(
 )
 
 # Dependency injection for service
-def get_clinic_service() -> ClinicService:
-    return ClinicService()
+def get_clinic_service(uow: UnitOfWork = Depends(get_unit_of_work)) -> ClinicService:
+    return ClinicService(unit_of_work_factory=lambda: uow)
 
 @router.get("/", response_model=PaginationResponse[Clinic], summary="Get all clinics (paginated)")
-async def get_clinics(
+def get_clinics(
     pagination = Depends(get_pagination_params),
     service: ClinicService = Depends(get_clinic_service)
 ):
@@ -27,6 +29,9 @@ async def get_clinics(
     Query Parameters:
         page (int): Page number (default: 1)
         items_per_page (int): Items per page (default: 10, max: 100)
+        pagination_mode (str, optional): "page" (default) or "cursor" for keyset pagination
+        cursor (str, optional): next_cursor/prev_cursor token from a previous cursor page
+        count_mode (str, optional): Total count strategy - "exact" (default), "estimated", "cached" or "none"
     
     Returns:
         PaginationResponse[Clinic]: Paginated list of clinics
@@ -34,6 +39,11 @@ async def get_clinics(
     try:
         clinics = service.get_clinics_paginated(pagination)
         return clinics
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Error in get_clinics endpoint: {e}")
         raise HTTPException(
@@ -42,7 +52,7 @@ async def get_clinics(
         )
 
 @router.get("/all", response_model=List[Clinic], summary="Get all clinics (no pagination)")
-async def get_all_clinics(
+def get_all_clinics(
     search: str = None,
     service: ClinicService = Depends(get_clinic_service)
 ):
@@ -69,7 +79,7 @@ async def get_all_clinics(
         )
 
 @router.get("/{clinic_id}", response_model=Clinic, summary="Get clinic by ID")
-async def get_clinic(
+def get_clinic(
     clinic_id: int,
     service: ClinicService = Depends(get_clinic_service)
 ):
@@ -103,7 +113,7 @@ async def get_clinic(
         )
 
 @router.post("/", response_model=Clinic, status_code=status.HTTP_201_CREATED, summary="Create new clinic")
-async def create_clinic(
+def create_clinic(
     clinic_data: ClinicCreate,
     service: ClinicService = Depends(get_clinic_service)
 ):
@@ -135,7 +145,7 @@ async def create_clinic(
         )
 
 @router.put("/{clinic_id}", response_model=Clinic, summary="Update clinic")
-async def update_clinic(
+def update_clinic(
     clinic_id: int,
     clinic_data: ClinicUpdate,
     service: ClinicService = Depends(get_clinic_service)
@@ -176,7 +186,7 @@ async def update_clinic(
         )
 
 @router.delete("/{clinic_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Delete clinic")
-async def delete_clinic(
+def delete_clinic(
     clinic_id: int,
     service: ClinicService = Depends(get_clinic_service)
 ):
@@ -1,10 +1,16 @@
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from app.services.evaluation_services import EvaluationService
-from app.domain.evaluation_models import EvaluationRead, EvaluationCreate, EvaluationUpdate
+from app.repositories.unit_of_work import UnitOfWork
+from app.utils.dependencies import get_unit_of_work
+from app.domain.evaluation_models import EvaluationRead, EvaluationCreate, EvaluationUpdate, EvaluationBulkCreate, EvaluationBulkCreateResult
 from app.utils.pagination import get_pagination_params, PaginationResponse
+from app.utils.export_utils import ExportFormat, MEDIA_TYPES, export_filename
 from app.utils.logger import logger
+from app.utils.responses import serialized
 
 router = APIRouter(
     prefix="/evaluations",
@@ -12,11 +18,15 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-def get_evaluation_service() -> EvaluationService:
+def get_evaluation_service(uow: UnitOfWork = Depends(get_unit_of_work)) -> EvaluationService:
+    return EvaluationService(unit_of_work_factory=lambda: uow)
+
+def get_export_evaluation_service() -> EvaluationService:
+    # Exports stream after the request's unit of work has closed, they open their own
     return EvaluationService()
 
 @router.get("/", response_model=PaginationResponse[EvaluationRead], summary="Get all evaluations (paginated)")
-async def get_evaluations(
+def get_evaluations(
     pagination = Depends(get_pagination_params),
     service: EvaluationService = Depends(get_evaluation_service)
 ):
@@ -26,19 +36,24 @@ async def get_evaluations(
     Query Parameters:
         page (int): Page number (default: 1)
         items_per_page (int): Items per page (default: 10, max: 100)
+        pagination_mode (str, optional): "page" (default) or "cursor" for keyset pagination
+        cursor (str, optional): next_cursor/prev_cursor token from a previous cursor page
+        count_mode (str, optional): Total count strategy - "exact" (default), "estimated", "cached" or "none"
 
     Returns:
         PaginationResponse[Evaluation]: Paginated list of evaluations
     """
     try:
         evaluations = service.get_evaluations_paginated(pagination)
-        return evaluations
+        return serialized(evaluations)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in get_evaluations endpoint: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/all", response_model=List[EvaluationRead], summary="Get all evaluations (no pagination)")
-async def get_all_evaluations(
+def get_all_evaluations(
     service: EvaluationService = Depends(get_evaluation_service)
 ):
     """
@@ -49,13 +64,42 @@ async def get_all_evaluations(
     """
     try:
         evaluations = service.get_evaluations()
-        return evaluations
+        return serialized(evaluations)
     except Exception as e:
         logger.error(f"Error in get_all_evaluations endpoint: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.get("/export", response_class=StreamingResponse, summary="Stream evaluations as NDJSON or CSV")
+def export_evaluations(
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format", description="ndjson or csv"),
+    clinic_id: Optional[int] = Query(None, description="Only export evaluations of this clinic's calls"),
+    start_date: Optional[datetime] = Query(None, description="Evaluations created at or after this time"),
+    end_date: Optional[datetime] = Query(None, description="Evaluations created at or before this time"),
+    service: EvaluationService = Depends(get_export_evaluation_service)
+):
+    """
+    Download evaluations batch by batch from a server-side cursor.
+
+    Query Parameters:
+        format (str): "ndjson" (default) or "csv"
+        clinic_id (int, optional): Filter by the clinic of the evaluated call
+        start_date (datetime, optional): Minimum evaluation created date
+        end_date (datetime, optional): Maximum evaluation created date
+
+    Returns:
+        StreamingResponse: Evaluations in id order, with the clinic of their call
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must be before end_date")
+
+    return StreamingResponse(
+        service.export_evaluations(export_format, clinic_id, start_date, end_date),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{export_filename("evaluations", export_format)}"'}
+    )
+
 @router.get("/{evaluation_id}", response_model=EvaluationRead, summary="Get evaluation by ID")
-async def get_evaluation(
+def get_evaluation(
     evaluation_id: int,
     service: EvaluationService = Depends(get_evaluation_service)
 ):
@@ -75,7 +119,7 @@ async def get_evaluation(
         evaluation = service.get_evaluation(evaluation_id)
         if evaluation is None:
             raise HTTPException(status_code=404, detail=f"Evaluation with ID {evaluation_id} not found")
-        return evaluation
+        return serialized(evaluation)
     except HTTPException:
         raise
     except Exception as e:
@@ -83,7 +127,7 @@ async def get_evaluation(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.post("/", response_model=EvaluationRead, status_code=201, summary="Create new evaluation")
-async def create_evaluation(
+def create_evaluation(
     evaluation_data: EvaluationCreate,
     service: EvaluationService = Depends(get_evaluation_service)
 ):
@@ -109,8 +153,36 @@ async def create_evaluation(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/bulk", response_model=EvaluationBulkCreateResult, status_code=201, summary="Create evaluations in bulk")
+def create_evaluations(
+    payload: EvaluationBulkCreate,
+    service: EvaluationService = Depends(get_evaluation_service)
+):
+    """
+    Create up to 10000 evaluations in one request. Nothing is created if any
+    of them references a call that does not exist.
+
+    Args:
+        payload (EvaluationBulkCreate): The evaluations to create
+
+    Returns:
+        EvaluationBulkCreateResult: Generated IDs, in the order the evaluations were sent
+
+    Raises:
+        HTTPException: If a call is not found or creation error
+    """
+    try:
+        ids = service.create_evaluations(payload.evaluations)
+        return EvaluationBulkCreateResult(ids=ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in create_evaluations endpoint: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.put("/{evaluation_id}", response_model=EvaluationRead, summary="Update evaluation")
-async def update_evaluation(
+def update_evaluation(
     evaluation_id: int,
     evaluation_data: EvaluationUpdate,
     service: EvaluationService = Depends(get_evaluation_service)
@@ -143,7 +215,7 @@ async def update_evaluation(
     
 
 @router.delete("/{evaluation_id}", status_code=204, summary="Delete evaluation")
-async def delete_evaluation(
+def delete_evaluation(
     evaluation_id: int,
     service: EvaluationService = Depends(get_evaluation_service)
 ):
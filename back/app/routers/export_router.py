@@ -0,0 +1,117 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from app.services.export_services import ExportService
+from app.domain.export_models import ExportJobRead, ParquetExportRequest
+from app.utils.jobs import JobStatus
+from app.utils.logger import logger
+
+router = APIRouter(
+    prefix="/exports",
+    tags=["exports"],
+    responses={404: {"description": "Not found"}},
+)
+
+def get_export_service() -> ExportService:
+    return ExportService()
+
+@router.post("/calls/parquet", response_model=ExportJobRead, status_code=status.HTTP_202_ACCEPTED, summary="Export calls to Parquet")
+def create_parquet_export(
+    export_request: ParquetExportRequest,
+    service: ExportService = Depends(get_export_service)
+):
+    """
+    Export calls joined with their evaluations and clinic to a Parquet dataset
+    partitioned by clinic and month (clinic_id=3/month=2025-01/part-0.parquet),
+    written in the background. Read it with pandas.read_parquet on the
+    extracted directory.
+
+    Args:
+        export_request (ParquetExportRequest): Optional clinic and call_start_time range
+
+    Returns:
+        ExportJobRead: The queued job, poll GET /exports/{job_id} and download
+        the zipped dataset from GET /exports/{job_id}/download once completed
+
+    Raises:
+        HTTPException: If the date range is invalid
+    """
+    try:
+        job = service.start_parquet_export(
+            export_request.clinic_id,
+            export_request.start_date,
+            export_request.end_date
+        )
+        return ExportJobRead.model_validate(job)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error in create_parquet_export endpoint: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+@router.get("/{job_id}", response_model=ExportJobRead, summary="Get export status")
+async def get_export(
+    job_id: str,
+    service: ExportService = Depends(get_export_service)
+):
+    """
+    Retrieve the status of an export job, with row and file counters.
+
+    Args:
+        job_id (str): The ID returned by POST /exports/calls/parquet
+
+    Returns:
+        ExportJobRead: The job status
+
+    Raises:
+        HTTPException: If the job is not found
+    """
+    job = service.get_export(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Export job {job_id} not found"
+        )
+    return ExportJobRead.model_validate(job)
+
+@router.get("/{job_id}/download", response_class=FileResponse, summary="Download an export")
+async def download_export(
+    job_id: str,
+    service: ExportService = Depends(get_export_service)
+):
+    """
+    Download the zipped Parquet dataset of a completed export.
+
+    Args:
+        job_id (str): The ID returned by POST /exports/calls/parquet
+
+    Returns:
+        FileResponse: Zip archive of the partitioned dataset
+
+    Raises:
+        HTTPException: 404 if the job or its file is gone, 409 if it has not completed
+    """
+    job = service.get_export(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Export job {job_id} not found"
+        )
+    if job.status != JobStatus.completed:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export job {job_id} is {job.status.value}"
+        )
+
+    archive = service.get_export_archive(job)
+    if archive is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"The file of export job {job_id} has expired"
+        )
+    return FileResponse(archive, media_type="application/zip", filename=f"calls-{job_id}.zip")
@@ -0,0 +1,78 @@
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
+from typing import Optional
+from app.services.import_services import ImportService
+from app.domain.ingestion_models import ImportJobRead
+from app.utils.logger import logger
+
+router = APIRouter(
+    prefix="/imports",
+    tags=["imports"],
+    responses={404: {"description": "Not found"}},
+)
+
+def get_import_service() -> ImportService:
+    return ImportService()
+
+@router.post("/", response_model=ImportJobRead, status_code=status.HTTP_202_ACCEPTED, summary="Import a call spreadsheet")
+def create_import(
+    file: UploadFile = File(...),
+    clinic_name: Optional[str] = Form(None),
+    service: ImportService = Depends(get_import_service)
+):
+    """
+    Upload an .xlsx or .csv file with calls and evaluations and import it in the background.
+    Each workbook sheet goes into the clinic named like the sheet; CSV files go into
+    `clinic_name` (defaults to the file name).
+    
+    Args:
+        file (UploadFile): The spreadsheet to import
+        clinic_name (str, optional): Clinic for CSV files
+        
+    Returns:
+        ImportJobRead: The queued job, poll GET /imports/{job_id} for its progress
+        
+    Raises:
+        HTTPException: If the file type is not supported
+    """
+    try:
+        job = service.start_import(file.filename, file.file, clinic_name)
+        return ImportJobRead.model_validate(job)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error in create_import endpoint: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+    finally:
+        file.file.close()
+
+@router.get("/{job_id}", response_model=ImportJobRead, summary="Get import status")
+async def get_import(
+    job_id: str,
+    service: ImportService = Depends(get_import_service)
+):
+    """
+    Retrieve the status of an import job: progress counters while it runs,
+    the final counters once it completes and the rows that were rejected.
+    
+    Args:
+        job_id (str): The ID returned by POST /imports
+        
+    Returns:
+        ImportJobRead: The job status
+        
+    Raises:
+        HTTPException: If the job is not found
+    """
+    job = service.get_import(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Import job {job_id} not found"
+        )
+    return ImportJobRead.model_validate(job)
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 # Register
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register_user(
+def register_user(
     user_data: UserCreate,
     service = Depends(get_user_service)
 ):
@@ -30,7 +30,7 @@ async def register_user(
 
 # Get users paginated
 @router.get("/", response_model=PaginationResponse[UserResponse])
-async def get_users(
+def get_users(
     pagination: CustomPagination = Depends(get_pagination_params),
     service = Depends(get_user_service)
 ):
@@ -43,13 +43,15 @@ async def get_users(
             data=user_responses,
             payload=paginated_response.payload
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error retrieving users: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 # Get user by ID
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(
+def get_user(
     user_id: int,
     service = Depends(get_user_service)
 ):
@@ -65,7 +67,7 @@ async def get_user(
 
 # Update user
 @router.put("/{user_id}", response_model=UserResponse)
-async def update_user(
+def update_user(
     user_id: int,
     user_data: UserUpdate,
     current_user: Annotated[UserResponse, Depends(get_current_user_dependency)],
@@ -86,7 +88,7 @@ async def update_user(
 
 # Delete user
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_user(
+def delete_user(
     user_id: int,
     current_user: Annotated[UserResponse, Depends(get_current_user_dependency)],
     service = Depends(get_user_service)
@@ -1,9 +1,15 @@
+from functools import partial
 from app.repositories.unit_of_work import UnitOfWork
+from app.repositories.counting import invalidate_counts
 from app.data_acess.models import Call as CallModel
-from app.domain.call_models import CallCreate, CallUpdate, CallRead
+from app.domain.call_models import CallCreate, CallUpdate, CallRead, CallBulkUpsertResult, CallSearchMode, CallSearchResult
+from app.services.metrics_services import dashboard_cache
 from app.utils.logger import logger
-from app.utils.pagination import CustomPagination
-from typing import List
+from app.utils.pagination import CustomPagination, cursor_scope
+from app.utils.export_utils import ExportFormat, iter_csv, iter_ndjson
+from app.utils.responses import fast_serialization
+from datetime import datetime
+from typing import Iterator, List, Optional
 
 
 class CallService:
@@ -23,16 +29,41 @@ class CallService:
             logger.error(f"Error retrieving calls: {e}")
             raise
     
+    def export_calls(
+        self,
+        export_format: ExportFormat,
+        clinic_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Iterator[str]:
+        """
+        Stream calls as NDJSON or CSV text chunks, one chunk per cursor batch.
+        The unit of work is opened when iteration starts and lives until the
+        last chunk, so hand the generator to a StreamingResponse.
+        """
+        logger.info(f"Processing request to export calls as {export_format.value}")
+
+        try:
+            with self._unit_of_work_factory() as uow:
+                batches = uow.calls.export_batches(clinic_id, start_date, end_date)
+                if export_format == ExportFormat.csv:
+                    yield from iter_csv(batches, uow.calls.EXPORT_FIELDS)
+                else:
+                    yield from iter_ndjson(batches)
+        except Exception as e:
+            logger.error(f"Error exporting calls: {e}")
+            raise
+
     def get_calls_by_clinic_paginated(self, clinic_id: int, pagination: CustomPagination):
         logger.info(f"Paginating calls for clinic {clinic_id}: page={pagination.page}, items_per_page={pagination.items_per_page}")
 
         try:
             with self._unit_of_work_factory() as uow:
-                total_count = uow.calls.count_by_clinic(clinic_id)
+                total_count = uow.calls.count_by_clinic(clinic_id, count_mode=pagination.count_mode)
                 call_models = uow.calls.list_by_clinic_paginated(
                     clinic_id=clinic_id,
                     offset=pagination.offset, 
-                    limit=pagination.items_per_page
+                    limit=pagination.fetch_limit
                 )
                 calls = [CallRead.model_validate(call, from_attributes=True) for call in call_models]
                 paginated_response = pagination.paginate(calls, total_count)
@@ -48,20 +79,44 @@ class CallService:
         search: str = None,
         call_type: str = None,
         sort_by: str = "created",
-        sort_order: str = "desc"
+        sort_order: str = "desc",
+        search_mode: CallSearchMode = CallSearchMode.substring
     ):
         """
         Get calls by clinic with search, filters, and sorting
         """
-        logger.info(f"Getting calls for clinic {clinic_id} with filters: search={search}, type={call_type}, sort={sort_by} {sort_order}")
+        logger.info(f"Getting calls for clinic {clinic_id} with filters: search={search} ({search_mode}), type={call_type}, sort={sort_by} {sort_order}")
 
+        # Fast serialization reads dicts straight from the rows instead of Call objects
+        as_rows = fast_serialization()
         try:
             with self._unit_of_work_factory() as uow:
+                if pagination.use_cursor:
+                    pagination.scope_cursor(cursor_scope(
+                        listing="clinic_calls", clinic_id=clinic_id, search=search, call_type=call_type,
+                        sort_by=sort_by, sort_order=sort_order, search_mode=search_mode
+                    ))
+                    call_models = uow.calls.search_by_clinic_keyset(
+                        clinic_id=clinic_id,
+                        cursor=pagination.cursor,
+                        limit=pagination.fetch_limit,
+                        search_term=search,
+                        call_type=call_type,
+                        sort_by=sort_by,
+                        sort_order=sort_order,
+                        search_mode=search_mode,
+                        as_rows=as_rows
+                    )
+                    calls = call_models if as_rows else [CallRead.model_validate(call, from_attributes=True) for call in call_models]
+                    return pagination.paginate_cursor(calls, sort_by)
+
                 # Get total count with filters
                 total_count = uow.calls.count_by_clinic_with_filters(
                     clinic_id=clinic_id,
                     search_term=search,
-                    call_type=call_type
+                    call_type=call_type,
+                    count_mode=pagination.count_mode,
+                    search_mode=search_mode
                 )
                 
                 # Get paginated data with filters
@@ -72,44 +127,79 @@ class CallService:
                     sort_by=sort_by,
                     sort_order=sort_order,
                     offset=pagination.offset,
-                    limit=pagination.items_per_page
+                    limit=pagination.fetch_limit,
+                    search_mode=search_mode,
+                    as_rows=as_rows
                 )
                 
-                calls = [CallRead.model_validate(call, from_attributes=True) for call in call_models]
+                calls = call_models if as_rows else [CallRead.model_validate(call, from_attributes=True) for call in call_models]
                 paginated_response = pagination.paginate(calls, total_count)
                 return paginated_response
         except Exception as e:
             logger.error(f"Error getting calls for clinic {clinic_id} with filters: {e}")
             raise
 
+    def search_calls(self, search_term: str, pagination: CustomPagination, clinic_id: Optional[int] = None):
+        """
+        Full-text search of calls by what was said, ranked best first.
+        Always paginated by cursor, the cursor encodes (rank, id).
+        """
+        logger.info(f"Searching calls: q={search_term}, clinic_id={clinic_id}, items_per_page={pagination.items_per_page}")
+
+        try:
+            pagination.scope_cursor(cursor_scope(listing="call_search", q=search_term, clinic_id=clinic_id))
+            with self._unit_of_work_factory() as uow:
+                rows = uow.calls.search_fulltext(
+                    search_term=search_term,
+                    cursor=pagination.cursor,
+                    limit=pagination.items_per_page + 1,
+                    clinic_id=clinic_id
+                )
+                results = [CallSearchResult.model_validate(row) for row in rows]
+                return pagination.paginate_cursor(results, "rank")
+        except Exception as e:
+            logger.error(f"Error searching calls for '{search_term}': {e}")
+            raise
+
     def get_calls_paginated(self, pagination: CustomPagination):
         logger.info(f"Paginating calls: page={pagination.page}, items_per_page={pagination.items_per_page}")
 
+        as_rows = fast_serialization()
         try:
             with self._unit_of_work_factory() as uow:
-                total_count = uow.calls.count()
+                if pagination.use_cursor:
+                    pagination.scope_cursor(cursor_scope(listing="calls"))
+                    call_models = uow.calls.list_keyset(cursor=pagination.cursor, limit=pagination.fetch_limit, as_rows=as_rows)
+                    calls = call_models if as_rows else [CallRead.model_validate(call, from_attributes=True) for call in call_models]
+                    return pagination.paginate_cursor(calls)
+
+                total_count = uow.calls.count(count_mode=pagination.count_mode)
                 call_models = uow.calls.list_paginated(
                     offset=pagination.offset, 
-                    limit=pagination.items_per_page
+                    limit=pagination.fetch_limit,
+                    as_rows=as_rows
                 )
-                calls = [CallRead.model_validate(call, from_attributes=True) for call in call_models]
+                calls = call_models if as_rows else [CallRead.model_validate(call, from_attributes=True) for call in call_models]
                 paginated_response = pagination.paginate(calls, total_count)
                 return paginated_response
         except Exception as e:
             logger.error(f"Error paginating calls: {e}")
             raise
 
-    def get_call(self, call_id: int) -> CallRead | None:
+    def get_call(self, call_id: int) -> CallRead | dict | None:
+        """The call with its evaluations and clinic, a CallRead shaped dict in fast serialization mode"""
         logger.info(f"Getting call with ID {call_id}")
 
         try:
             with self._unit_of_work_factory() as uow:
-                call_model = uow.calls.get(call_id)
-                if call_model is None:
+                if fast_serialization():
+                    call = uow.calls.get_row(call_id)
+                else:
+                    call_model = uow.calls.get(call_id)
+                    call = CallRead.model_validate(call_model, from_attributes=True) if call_model else None
+                if call is None:
                     logger.warning(f"Call with ID {call_id} not found")
-                    return None
-
-                return CallRead.model_validate(call_model, from_attributes=True)
+                return call
         except Exception as e:
             logger.error(f"Error getting call {call_id}: {e}")
             raise
@@ -121,12 +211,30 @@ class CallService:
             with self._unit_of_work_factory() as uow:
                 call_create = CallCreate.model_validate(call_data)
                 created_call = uow.calls.add(call_create)
-                uow._UnitOfWork__session.commit()
+                uow.on_commit(dashboard_cache.invalidate)
+                uow.on_commit(partial(invalidate_counts, "call"))
                 return CallRead.model_validate(created_call)
         except Exception as e:
             logger.error(f"Error creating call: {e}")
             raise
 
+    def upsert_calls(self, calls: List[CallCreate]) -> CallBulkUpsertResult:
+        """Insert or update calls by call_id in bulk"""
+        logger.info(f"Upserting {len(calls)} calls")
+
+        try:
+            with self._unit_of_work_factory() as uow:
+                results = uow.calls.upsert_many([call.model_dump() for call in calls])
+                uow.on_commit(dashboard_cache.invalidate)
+                uow.on_commit(partial(invalidate_counts, "call"))
+
+            inserted = sum(1 for _, was_inserted in results.values() if was_inserted)
+            logger.info(f"Successfully upserted calls: {inserted} inserted, {len(results) - inserted} updated")
+            return CallBulkUpsertResult(inserted=inserted, updated=len(results) - inserted)
+        except Exception as e:
+            logger.error(f"Error upserting calls: {e}")
+            raise
+
     def update_call(self, call_id: int, call_data: CallUpdate) -> CallRead | None:
         logger.info(f"Updating call with ID {call_id}")
 
@@ -135,12 +243,14 @@ class CallService:
                 call_update = CallUpdate.model_validate(call_data)
                 update_data = call_update.model_dump(exclude_unset=True)
 
-                updated_call_model = uow.calls.update(call_id, update_data)
+                updated_call_model = uow.calls.update_by_id(call_id, update_data)
                 if updated_call_model is None:
                     logger.warning(f"Call with ID {call_id} not found for update")
                     return None
 
-                uow._UnitOfWork__session.commit()
+                uow.on_commit(dashboard_cache.invalidate)
+                # The clinic and type filtered counts change with clinic_id/call_type
+                uow.on_commit(partial(invalidate_counts, "call"))
                 updated_call = CallRead.model_validate(updated_call_model)
                 return updated_call
         except Exception as e:
@@ -152,9 +262,11 @@ class CallService:
 
         try:
             with self._unit_of_work_factory() as uow:
-                success = uow.calls.delete(call_id)
+                success = uow.calls.delete_by_id(call_id)
                 if success:
-                    uow._UnitOfWork__session.commit()
+                    uow.on_commit(dashboard_cache.invalidate)
+                    # Its evaluations are deleted by the cascade
+                    uow.on_commit(partial(invalidate_counts, "call", "evaluation"))
                     logger.info(f"Successfully deleted call with ID {call_id}")
                 else:
                     logger.warning(f"Call with ID {call_id} not found for deletion")
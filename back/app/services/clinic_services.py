@@ -1,8 +1,10 @@
+from functools import partial
 from app.repositories.unit_of_work import UnitOfWork
+from app.repositories.counting import invalidate_counts
 from app.data_acess.models import Clinic as ClinicModel
 from app.domain.clinics_models import Clinic as ClinicDomain, ClinicCreate, ClinicUpdate
 from app.utils.logger import logger
-from app.utils.pagination import CustomPagination
+from app.utils.pagination import CustomPagination, cursor_scope
 
 
 class ClinicService:
@@ -44,13 +46,19 @@ class ClinicService:
 
         try:
             with self._unit_of_work_factory() as uow:
+                if pagination.use_cursor:
+                    pagination.scope_cursor(cursor_scope(listing="clinics"))
+                    clinic_models = uow.clinics.list_keyset(cursor=pagination.cursor, limit=pagination.fetch_limit)
+                    clinics = [ClinicDomain.model_validate(clinic) for clinic in clinic_models]
+                    return pagination.paginate_cursor(clinics)
+
                 # Get total count
-                total_count = uow.clinics.count()
+                total_count = uow.clinics.count(count_mode=pagination.count_mode)
                 
                 # Get paginated data
                 clinic_models = uow.clinics.list_paginated(
                     offset=pagination.offset, 
-                    limit=pagination.items_per_page
+                    limit=pagination.fetch_limit
                 )
                 
                 # Convert to domain models
@@ -94,9 +102,7 @@ class ClinicService:
                 # Create SQLModel instance
                 clinic_model = ClinicModel(name=clinic_create.name)
                 created_clinic_model = uow.clinics.add(clinic_model)
-                
-                # Commit the transaction
-                uow._UnitOfWork__session.commit()
+                uow.on_commit(partial(invalidate_counts, "clinic"))
                 
                 # Convert to domain model
                 created_clinic = ClinicDomain.model_validate(created_clinic_model)
@@ -117,14 +123,11 @@ class ClinicService:
                 # Convert to dict, removing None values
                 update_data = clinic_update.model_dump(exclude_unset=True)
                 
-                updated_clinic_model = uow.clinics.update(clinic_id, update_data)
+                updated_clinic_model = uow.clinics.update_by_id(clinic_id, update_data)
                 if updated_clinic_model is None:
                     logger.warning(f"Clinic with ID {clinic_id} not found for update")
                     return None
                 
-                # Commit the transaction
-                uow._UnitOfWork__session.commit()
-                
                 # Convert to domain model
                 updated_clinic = ClinicDomain.model_validate(updated_clinic_model)
                 logger.info(f"Successfully updated clinic: {updated_clinic.name}")
@@ -138,10 +141,9 @@ class ClinicService:
         
         try:
             with self._unit_of_work_factory() as uow:
-                success = uow.clinics.delete(clinic_id)
+                success = uow.clinics.delete_by_id(clinic_id)
                 if success:
-                    # Commit the transaction
-                    uow._UnitOfWork__session.commit()
+                    uow.on_commit(partial(invalidate_counts, "clinic"))
                     logger.info(f"Successfully deleted clinic with ID: {clinic_id}")
                 else:
                     logger.warning(f"Clinic with ID {clinic_id} not found for deletion")
@@ -1,7 +1,13 @@
-from typing import List, Optional
+from datetime import datetime
+from functools import partial
+from typing import Iterator, List, Optional
 from app.domain.evaluation_models import EvaluationCreate, EvaluationUpdate, EvaluationRead
 from app.repositories.unit_of_work import UnitOfWork
-from app.utils.pagination import CustomPagination
+from app.repositories.counting import invalidate_counts
+from app.utils.pagination import CustomPagination, cursor_scope
+from app.services.metrics_services import dashboard_cache
+from app.utils.export_utils import ExportFormat, iter_csv, iter_ndjson
+from app.utils.responses import fast_serialization
 from app.utils.logger import logger
 
 
@@ -9,12 +15,16 @@ class EvaluationService:
     def __init__(self, unit_of_work_factory=UnitOfWork) -> None:
         self._unit_of_work_factory = unit_of_work_factory
 
-    def get_evaluations(self) -> List[EvaluationRead]:
+    def get_evaluations(self) -> List[EvaluationRead] | List[dict]:
+        """All evaluations, as EvaluationRead shaped dicts in fast serialization mode"""
         logger.info("Processing request for evaluations")
         try:
             with self._unit_of_work_factory() as uow:
-                evaluation_models = uow.evaluations.list()
-                evaluations = [EvaluationRead.model_validate(ev.model_dump()) for ev in evaluation_models]
+                if fast_serialization():
+                    evaluations = uow.evaluations.list(as_rows=True)
+                else:
+                    evaluation_models = uow.evaluations.list()
+                    evaluations = [EvaluationRead.model_validate(ev, from_attributes=True) for ev in evaluation_models]
                 logger.info(f"Successfully retrieved {len(evaluations)} evaluations")
                 return evaluations
         except Exception as e:
@@ -23,28 +33,62 @@ class EvaluationService:
 
     def get_evaluations_paginated(self, pagination: CustomPagination):
         logger.info(f"Paginating evaluations: page={pagination.page}, items_per_page={pagination.items_per_page}")
+        as_rows = fast_serialization()
         try:
             with self._unit_of_work_factory() as uow:
-                total_count = uow.evaluations.count()
+                if pagination.use_cursor:
+                    pagination.scope_cursor(cursor_scope(listing="evaluations"))
+                    keyset_models = uow.evaluations.list_keyset(cursor=pagination.cursor, limit=pagination.fetch_limit, as_rows=as_rows)
+                    evaluations = keyset_models if as_rows else [EvaluationRead.model_validate(ev, from_attributes=True) for ev in keyset_models]
+                    return pagination.paginate_cursor(evaluations)
+
+                total_count = uow.evaluations.count(count_mode=pagination.count_mode)
                 paginated_models = uow.evaluations.list_paginated(
                     offset=pagination.offset,
-                    limit=pagination.items_per_page
+                    limit=pagination.fetch_limit,
+                    as_rows=as_rows
                 )
-                evaluations = [EvaluationRead.model_validate(ev.model_dump()) for ev in paginated_models]
+                evaluations = paginated_models if as_rows else [EvaluationRead.model_validate(ev, from_attributes=True) for ev in paginated_models]
                 return pagination.paginate(evaluations, total_count)
         except Exception as e:
             logger.error(f"Error paginating evaluations: {e}")
             raise
 
-    def get_evaluation(self, evaluation_id: int) -> Optional[EvaluationRead]:
+    def export_evaluations(
+        self,
+        export_format: ExportFormat,
+        clinic_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Iterator[str]:
+        """
+        Stream evaluations as NDJSON or CSV text chunks, one chunk per cursor
+        batch. The unit of work lives until the last chunk (see CallService.export_calls).
+        """
+        logger.info(f"Processing request to export evaluations as {export_format.value}")
+        try:
+            with self._unit_of_work_factory() as uow:
+                batches = uow.evaluations.export_batches(clinic_id, start_date, end_date)
+                if export_format == ExportFormat.csv:
+                    yield from iter_csv(batches, uow.evaluations.EXPORT_FIELDS)
+                else:
+                    yield from iter_ndjson(batches)
+        except Exception as e:
+            logger.error(f"Error exporting evaluations: {e}")
+            raise
+
+    def get_evaluation(self, evaluation_id: int) -> Optional[EvaluationRead | dict]:
         logger.info(f"Getting evaluation with ID {evaluation_id}")
         try:
             with self._unit_of_work_factory() as uow:
-                ev_model = uow.evaluations.get(evaluation_id)
-                if ev_model is None:
+                if fast_serialization():
+                    evaluation = uow.evaluations.get_row(evaluation_id)
+                else:
+                    ev_model = uow.evaluations.get(evaluation_id)
+                    evaluation = EvaluationRead.model_validate(ev_model, from_attributes=True) if ev_model else None
+                if evaluation is None:
                     logger.warning(f"Evaluation with ID {evaluation_id} not found")
-                    return None
-                return EvaluationRead.model_validate(ev_model.model_dump())
+                return evaluation
         except Exception as e:
             logger.error(f"Error getting evaluation {evaluation_id}: {e}")
             raise
@@ -55,25 +99,53 @@ class EvaluationService:
             with self._unit_of_work_factory() as uow:
                 evaluation_create = EvaluationCreate.model_validate(evaluation_data)
                 created_model = uow.evaluations.add(evaluation_create)
-                uow._UnitOfWork__session.commit()
+                uow.on_commit(dashboard_cache.invalidate)
+                uow.on_commit(partial(invalidate_counts, "evaluation"))
                 return EvaluationRead.model_validate(created_model)
         except Exception as e:
             logger.error(f"Error creating evaluation: {e}")
             raise
 
+    def create_evaluations(self, evaluations: List[EvaluationCreate]) -> List[int]:
+        """
+        Create evaluations in bulk.
+
+        Returns:
+            List[int]: Generated IDs in the same order as `evaluations`
+
+        Raises:
+            ValueError: If any evaluation references a call that does not exist
+        """
+        logger.info(f"Creating {len(evaluations)} evaluations")
+        try:
+            with self._unit_of_work_factory() as uow:
+                call_ids = {evaluation.call_id for evaluation in evaluations}
+                missing = sorted(call_ids - uow.calls.get_existing_ids(list(call_ids)))
+                if missing:
+                    raise ValueError(f"Calls not found: {', '.join(str(call_id) for call_id in missing)}")
+
+                ids = uow.evaluations.insert_many([evaluation.model_dump() for evaluation in evaluations])
+                uow.daily_stats.refresh_for_calls(call_ids)
+                uow.on_commit(dashboard_cache.invalidate)
+                uow.on_commit(partial(invalidate_counts, "evaluation"))
+            logger.info(f"Successfully created {len(ids)} evaluations")
+            return ids
+        except Exception as e:
+            logger.error(f"Error creating evaluations: {e}")
+            raise
+
     def update_evaluation(self, evaluation_id: int, evaluation_data: EvaluationUpdate) -> Optional[EvaluationRead]:
         logger.info(f"Updating evaluation with ID {evaluation_id}")
         try:
             with self._unit_of_work_factory() as uow:
                 update_data = evaluation_data.model_dump(exclude_unset=True)
-                updated_model = uow.evaluations.update(evaluation_id, update_data)
+                updated_model = uow.evaluations.update_by_id(evaluation_id, update_data)
                 
                 if updated_model is None:
                     logger.warning(f"Evaluation with ID {evaluation_id} not found for update")
                     return None
                 
-                uow._UnitOfWork__session.commit()
-                
+                uow.on_commit(dashboard_cache.invalidate)
                 return EvaluationRead.model_validate(updated_model)  # En lugar de updated_model.model_dump()
         except Exception as e:
             logger.error(f"Error updating evaluation {evaluation_id}: {e}")
@@ -83,9 +155,10 @@ class EvaluationService:
         logger.info(f"Deleting evaluation with ID {evaluation_id}")
         try:
             with self._unit_of_work_factory() as uow:
-                success = uow.evaluations.delete(evaluation_id)
+                success = uow.evaluations.delete_by_id(evaluation_id)
                 if success:
-                    uow._UnitOfWork__session.commit()
+                    uow.on_commit(dashboard_cache.invalidate)
+                    uow.on_commit(partial(invalidate_counts, "evaluation"))
                     logger.info(f"Successfully deleted evaluation with ID {evaluation_id}")
                 else:
                     logger.warning(f"Evaluation with ID {evaluation_id} not found for deletion")
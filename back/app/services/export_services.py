@@ -0,0 +1,162 @@
+import os
+import shutil
+import time
+import zipfile
+from datetime import datetime, timedelta
+from typing import Mapping, Optional
+
+import pyarrow as pa
+
+from app.domain.export_models import ParquetExportResult
+from app.repositories.unit_of_work import UnitOfWork
+from app.utils.config_utils import GlobalConfig
+from app.utils.jobs import Job, JobManager, JobStatus, job_manager
+from app.utils.logger import logger
+from app.utils.os_utils import create_folder_if_not_exists
+from app.utils.parquet_utils import PartitionedParquetWriter, PartitionKey
+
+PARQUET_EXPORT_JOB_KIND = "parquet_export"
+
+# File columns of CallRepository.ANALYTICS_COLUMNS; clinic_id and month are
+# the partition directories. Timestamps keep their microseconds and scores
+# and durations stay doubles, unlike a JSON round trip
+CALL_ANALYTICS_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("call_id", pa.string()),
+    ("call_type", pa.dictionary(pa.int8(), pa.string())),
+    ("agent_environment", pa.dictionary(pa.int8(), pa.string())),
+    ("assistant", pa.string()),
+    ("call_start_time", pa.timestamp("us")),
+    ("call_ended_time", pa.timestamp("us")),
+    ("customer_phone", pa.string()),
+    ("customer_name", pa.string()),
+    ("duration", pa.float64()),
+    ("summary", pa.string()),
+    ("recording_url", pa.string()),
+    ("ended_reason", pa.string()),
+    ("call_reason", pa.string()),
+    ("clinic_name", pa.string()),
+    ("created", pa.timestamp("us")),
+    ("evaluation_id", pa.int64()),
+    ("evaluator_type", pa.dictionary(pa.int8(), pa.string())),
+    ("reviewer", pa.string()),
+    ("evaluation", pa.string()),
+    ("check", pa.string()),
+    ("feedback", pa.string()),
+    ("score", pa.float64()),
+    ("status_feedback_engineer", pa.string()),
+    ("comments_engineer", pa.string()),
+    ("evaluation_created", pa.timestamp("us")),
+])
+
+
+def _call_partition(row: Mapping) -> PartitionKey:
+    """Clinic and month of the call, the month following the rollup day rule"""
+    day = row["call_start_time"] or row["created"]
+    return ("clinic_id", str(row["clinic_id"])), ("month", f"{day:%Y-%m}")
+
+
+class ExportService:
+    """Writes calls with their evaluations and clinic to partitioned Parquet as background jobs"""
+
+    def __init__(self, unit_of_work_factory=UnitOfWork, jobs: JobManager = job_manager) -> None:
+        self._unit_of_work_factory = unit_of_work_factory
+        self._jobs = jobs
+
+    def start_parquet_export(
+        self,
+        clinic_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Job:
+        """
+        Queue an export of the matching calls.
+
+        Returns:
+            Job: The queued export job
+
+        Raises:
+            ValueError: If start_date is after end_date
+        """
+        if start_date and end_date and start_date > end_date:
+            raise ValueError("start_date must be before end_date")
+
+        self._remove_expired_exports()
+        return self._jobs.submit(PARQUET_EXPORT_JOB_KIND, self._run_parquet_export, clinic_id, start_date, end_date)
+
+    def get_export(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is None or job.kind != PARQUET_EXPORT_JOB_KIND:
+            return None
+        return job
+
+    def get_export_archive(self, job: Job) -> Optional[str]:
+        """Path of the zip archive of a completed export, None if it expired"""
+        if job.status != JobStatus.completed:
+            return None
+        path = self._archive_path(job.id)
+        return path if os.path.exists(path) else None
+
+    def _run_parquet_export(
+        self,
+        job: Job,
+        clinic_id: Optional[int],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> ParquetExportResult:
+        started = time.perf_counter()
+        dataset_path = os.path.join(GlobalConfig.get_export_path(), job.id)
+        result = ParquetExportResult()
+
+        try:
+            with self._unit_of_work_factory() as uow, \
+                    PartitionedParquetWriter(dataset_path, CALL_ANALYTICS_SCHEMA, _call_partition) as writer:
+                for batch in uow.calls.analytics_batches(clinic_id, start_date, end_date):
+                    writer.write_batch(batch)
+                    self._update_result(result, writer, started)
+                    job.report(result.model_copy())
+
+            result.archive_bytes = self._archive(dataset_path, self._archive_path(job.id))
+            self._update_result(result, writer, started)
+            logger.info(
+                f"Exported {result.rows_written} rows to {result.files} Parquet files "
+                f"({result.archive_bytes} bytes) in {result.elapsed_seconds}s"
+            )
+            return result
+        finally:
+            shutil.rmtree(dataset_path, ignore_errors=True)
+
+    @staticmethod
+    def _update_result(result: ParquetExportResult, writer: PartitionedParquetWriter, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        result.rows_written = writer.rows_written
+        result.partitions = writer.partitions
+        result.files = len(writer.files)
+        result.elapsed_seconds = round(elapsed, 2)
+        result.rows_per_second = round(writer.rows_written / elapsed, 1) if elapsed else 0
+
+    @staticmethod
+    def _archive(dataset_path: str, archive_path: str) -> int:
+        """Zip the dataset directory, stored without recompressing the Parquet files"""
+        with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_STORED) as archive:
+            for directory, _, files in os.walk(dataset_path):
+                for name in sorted(files):
+                    path = os.path.join(directory, name)
+                    archive.write(path, os.path.relpath(path, dataset_path))
+        return os.path.getsize(archive_path)
+
+    @staticmethod
+    def _archive_path(job_id: str) -> str:
+        return os.path.join(GlobalConfig.get_export_path(), f"{job_id}.zip")
+
+    @staticmethod
+    def _remove_expired_exports() -> None:
+        export_path = GlobalConfig.get_export_path()
+        create_folder_if_not_exists(export_path)
+        expires_before = (datetime.now() - timedelta(hours=GlobalConfig.get_export_retention_hours())).timestamp()
+        for entry in os.scandir(export_path):
+            if entry.is_file() and entry.stat().st_mtime < expires_before:
+                try:
+                    os.remove(entry.path)
+                except Exception as e:
+                    logger.warning(f"Could not remove expired export {entry.path}: {e}")
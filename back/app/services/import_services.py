@@ -0,0 +1,83 @@
+import os
+import shutil
+import uuid
+from typing import BinaryIO, Optional
+
+from app.services.ingestion_services import IngestionService
+from app.utils.config_utils import GlobalConfig
+from app.utils.jobs import Job, JobManager, job_manager
+from app.utils.logger import logger
+from app.utils.os_utils import create_folder_if_not_exists
+from app.utils.spreadsheet_utils import SUPPORTED_EXTENSIONS
+
+IMPORT_JOB_KIND = "import"
+
+# Copy buffer when spooling uploads to disk
+SPOOL_BUFFER_SIZE = 1024 * 1024
+
+
+class ImportService:
+    """Spools uploaded spreadsheets to disk and imports them as background jobs"""
+
+    def __init__(self, ingestion_service: Optional[IngestionService] = None, jobs: JobManager = job_manager) -> None:
+        self._ingestion_service = ingestion_service or IngestionService()
+        self._jobs = jobs
+
+    def start_import(self, file_name: str, file: BinaryIO, clinic_name: Optional[str] = None) -> Job:
+        """
+        Save the upload and queue its import.
+
+        Args:
+            file_name: Original file name, its extension selects the reader
+            file: Readable binary stream with the upload
+            clinic_name: Clinic for CSV uploads, defaults to the file name
+
+        Returns:
+            Job: The queued import job
+
+        Raises:
+            ValueError: If the file type is not supported
+        """
+        extension = os.path.splitext(file_name or "")[1].lower()
+        if extension not in SUPPORTED_EXTENSIONS:
+            raise ValueError(f"Unsupported file type '{extension}', expected one of {', '.join(SUPPORTED_EXTENSIONS)}")
+
+        spool_path = GlobalConfig.get_import_spool_path()
+        create_folder_if_not_exists(spool_path)
+        spooled_file = os.path.join(spool_path, f"{uuid.uuid4().hex}{extension}")
+
+        logger.info(f"Spooling upload {file_name} to {spooled_file}")
+        try:
+            with open(spooled_file, "wb") as destination:
+                shutil.copyfileobj(file, destination, SPOOL_BUFFER_SIZE)
+        except Exception as e:
+            logger.error(f"Error spooling upload {file_name}: {e}")
+            self._remove(spooled_file)
+            raise
+
+        # CSV uploads are named after the original file, not the spooled copy
+        if extension == ".csv" and not clinic_name:
+            clinic_name = os.path.splitext(os.path.basename(file_name))[0]
+
+        return self._jobs.submit(IMPORT_JOB_KIND, self._run_import, spooled_file, clinic_name)
+
+    def get_import(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is None or job.kind != IMPORT_JOB_KIND:
+            return None
+        return job
+
+    def _run_import(self, job: Job, spooled_file: str, clinic_name: Optional[str]):
+        try:
+            return self._ingestion_service.ingest_file(spooled_file, clinic_name, on_progress=job.report)
+        finally:
+            self._remove(spooled_file)
+
+    @staticmethod
+    def _remove(file_path: str) -> None:
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not remove spooled import {file_path}: {e}")
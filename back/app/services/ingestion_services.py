@@ -0,0 +1,165 @@
+import time
+from functools import partial
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+from app.repositories.unit_of_work import UnitOfWork
+from app.repositories.counting import invalidate_counts
+from app.data_acess.models import AgentEnvironment, CallType, EvaluatorType
+from app.domain.ingestion_models import IngestionResult, IngestionRowError
+from app.services.metrics_services import dashboard_cache
+from app.utils.config_utils import GlobalConfig
+from app.utils.logger import logger
+from app.utils.spreadsheet_utils import iter_spreadsheet_chunks, map_columns
+
+CALL_COLUMNS = (
+    'customer_phone', 'customer_name', 'call_reason', 'call_start_time', 'call_ended_time',
+    'duration', 'summary', 'recording_url', 'ended_reason'
+)
+EVALUATION_COLUMNS = (
+    'reviewer', 'evaluation', 'check', 'feedback', 'score',
+    'status_feedback_engineer', 'comments_engineer'
+)
+
+
+class IngestionService:
+    """
+    Imports call spreadsheets chunk by chunk: one existence lookup, one bulk
+    upsert for calls and one insert for evaluations per chunk, each chunk in
+    its own unit of work, committed when its block exits. The factory must
+    open a new unit of work per call, a shared one would commit everything
+    at the end.
+    """
+
+    # Cap on the row errors kept in the result, rows_skipped keeps counting
+    MAX_REPORTED_ERRORS = 1000
+
+    def __init__(self, unit_of_work_factory=UnitOfWork, chunk_size: Optional[int] = None) -> None:
+        self._unit_of_work_factory = unit_of_work_factory
+        self._chunk_size = chunk_size or GlobalConfig.get_ingestion_chunk_size()
+
+    def ingest_file(
+        self,
+        file_path: str,
+        clinic_name: Optional[str] = None,
+        on_progress: Optional[Callable[[IngestionResult], None]] = None
+    ) -> IngestionResult:
+        """
+        Import every sheet of a workbook (or a CSV file) into calls and evaluations.
+
+        Args:
+            file_path: .xlsx/.xlsm or .csv file
+            clinic_name: Clinic of a CSV file, defaults to the file name.
+                Workbook sheets are always imported into the clinic named like the sheet.
+            on_progress: Called with a snapshot of the counters after every committed chunk
+
+        Returns:
+            IngestionResult: Counters, throughput and rejected rows
+        """
+        logger.info(f"Processing import of {file_path} in chunks of {self._chunk_size} rows")
+        result = IngestionResult()
+        clinic_ids: Dict[str, int] = {}
+        started = time.perf_counter()
+
+        try:
+            for sheet, df in iter_spreadsheet_chunks(file_path, self._chunk_size, clinic_name):
+                if df.empty:
+                    continue
+                if sheet not in clinic_ids:
+                    clinic_ids[sheet] = self._get_or_create_clinic(sheet)
+
+                self._ingest_chunk(clinic_ids[sheet], sheet, df, result)
+
+                result.elapsed_seconds = round(time.perf_counter() - started, 3)
+                result.rows_per_second = round(result.rows_read / result.elapsed_seconds, 1) if result.elapsed_seconds else 0
+                logger.info(
+                    f"Imported chunk {result.chunks_committed} of sheet '{sheet}': "
+                    f"{result.rows_read} rows so far, {result.rows_per_second} rows/s"
+                )
+                if on_progress is not None:
+                    on_progress(result.model_copy(deep=True))
+        except Exception as e:
+            logger.error(f"Error importing {file_path}: {e}")
+            raise
+        finally:
+            if result.chunks_committed:
+                dashboard_cache.invalidate()
+
+        logger.info(
+            f"Successfully imported {file_path}: {result.rows_read} rows, {result.calls_created} calls, "
+            f"{result.evaluations_created} evaluations, {result.rows_skipped} skipped, {result.rows_per_second} rows/s"
+        )
+        return result
+
+    def _get_or_create_clinic(self, name: str) -> int:
+        with self._unit_of_work_factory() as uow:
+            clinic = uow.clinics.get_by_name(name.strip())
+            if not clinic:
+                clinic = uow.clinics.create({'name': name.strip()})
+                uow.on_commit(partial(invalidate_counts, "clinic"))
+            clinic_id = clinic.id
+        return clinic_id
+
+    def _reject(self, result: IngestionResult, sheet: str, row: int, call_id: Optional[str], error: str) -> None:
+        result.rows_skipped += 1
+        if len(result.errors) < self.MAX_REPORTED_ERRORS:
+            result.errors.append(IngestionRowError(sheet=sheet, row=row, call_id=call_id, error=error))
+
+    def _ingest_chunk(self, clinic_id: int, sheet: str, df: pd.DataFrame, result: IngestionResult) -> None:
+        mapped = map_columns(df)
+        result.rows_read += len(mapped)
+
+        with self._unit_of_work_factory() as uow:
+            call_ids = mapped['call_id'].dropna().unique().tolist()
+            existing_ids = uow.calls.get_ids_by_call_ids(call_ids)
+
+            new_calls = {}
+            # (external call_id, evaluation values) resolved to primary keys after the call insert
+            pending_evaluations = []
+
+            for row, record in zip(mapped.index, mapped.to_dict('records')):
+                call_id = record['call_id']
+                if call_id is None:
+                    self._reject(result, sheet, row, None, "Missing call_id")
+                    continue
+
+                if call_id not in existing_ids and call_id not in new_calls:
+                    if record['assistant'] is None:
+                        self._reject(result, sheet, row, call_id, "Missing assistant")
+                        continue
+                    call_type = CallType[record['type']] if record['type'] in CallType.__members__ else CallType.inbound
+                    new_calls[call_id] = {
+                        'call_id': call_id,
+                        'call_type': call_type,
+                        'agent_environment': AgentEnvironment.production,
+                        'assistant': record['assistant'],
+                        'clinic_id': clinic_id,
+                        **{column: record[column] for column in CALL_COLUMNS},
+                    }
+
+                if record['evaluation'] or record['reviewer'] or record['feedback']:
+                    pending_evaluations.append((call_id, {
+                        'evaluator_type': EvaluatorType.LLM,
+                        **{column: record[column] for column in EVALUATION_COLUMNS},
+                    }))
+
+            # DO NOTHING on conflict: a call inserted concurrently since the lookup is kept as is
+            upserted = uow.calls.upsert_many(list(new_calls.values()), update_existing=False)
+            created_ids = {call_id: id for call_id, (id, _) in upserted.items()}
+            raced_call_ids = [call_id for call_id in new_calls if call_id not in created_ids]
+            if raced_call_ids:
+                existing_ids.update(uow.calls.get_ids_by_call_ids(raced_call_ids))
+            ids = {**existing_ids, **created_ids}
+
+            evaluations = [{'call_id': ids[call_id], **values} for call_id, values in pending_evaluations]
+            uow.evaluations.insert_many(evaluations)
+
+            # Buckets of the new calls were refreshed by upsert_many, these now have new evaluations
+            uow.daily_stats.refresh_for_calls(evaluation['call_id'] for evaluation in evaluations)
+            uow.on_commit(partial(invalidate_counts, "call", "evaluation"))
+
+        result.calls_created += len(created_ids)
+        result.calls_existing += len(existing_ids)
+        result.evaluations_created += len(evaluations)
+        result.chunks_committed += 1
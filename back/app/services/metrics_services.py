@@ -0,0 +1,143 @@
+from datetime import datetime, date, timezone
+from typing import Optional
+
+from app.repositories.unit_of_work import UnitOfWork
+from app.repositories.sql_client import get_pool_metrics
+from app.domain.call_models import CallType
+from app.domain.metrics_models import MetricsSource
+from app.utils.cache import ResponseCache
+from app.utils.config_utils import GlobalConfig
+from app.utils.logger import logger
+
+# Dashboard responses, invalidated by every call/evaluation write
+dashboard_cache = ResponseCache("metrics:dashboard", ttl_seconds=GlobalConfig.get_dashboard_cache_ttl_seconds())
+
+
+def _normalize_date(value: Optional[datetime]) -> Optional[datetime]:
+    """Timezone aware filters as the naive UTC datetimes the call times are stored as"""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _dashboard_cache_params(
+    clinic_id: Optional[int],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    source: MetricsSource
+) -> tuple:
+    """Cache key of already normalized filters, equivalent requests share an entry"""
+    def normalize(value: Optional[datetime]) -> Optional[str]:
+        if value is None:
+            return None
+        # The rollup only looks at the day
+        if source == MetricsSource.rollup:
+            return value.date().isoformat()
+        return value.isoformat()
+
+    return (source.value, clinic_id or None, normalize(start_date), normalize(end_date))
+
+
+class MetricsService:
+    def __init__(self, unit_of_work_factory=UnitOfWork) -> None:
+        self._unit_of_work_factory = unit_of_work_factory
+
+    def get_dashboard_metrics(
+        self,
+        clinic_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        source: MetricsSource = MetricsSource.rollup
+    ) -> dict:
+        """
+        Build the dashboard metrics for the given filters.
+
+        Args:
+            clinic_id: Only count calls of this clinic
+            start_date: Only count calls started at or after this moment
+                (calls without call_start_time use their creation time)
+            end_date: Only count calls started at or before this moment
+            source: rollup sums call_daily_stats (dates rounded to whole days),
+                live aggregates the call and evaluation tables. Dates with a
+                timezone are converted to UTC first, also to pick their day
+
+        Returns:
+            dict: Totals, averages, call type distribution and top clinics
+        """
+        logger.info(f"Processing request dashboard metrics: clinic_id={clinic_id}, start_date={start_date}, end_date={end_date}, source={source}")
+
+        source = MetricsSource(source)
+        # The cache key and the queries must see the same values, the rollup
+        # takes the day of these
+        start_date = _normalize_date(start_date)
+        end_date = _normalize_date(end_date)
+        cache_params = _dashboard_cache_params(clinic_id, start_date, end_date, source)
+        cached = dashboard_cache.get(cache_params)
+        if cached is not None:
+            logger.info("Dashboard metrics served from cache")
+            return cached
+
+        try:
+            with self._unit_of_work_factory() as uow:
+                if source == MetricsSource.live:
+                    totals = uow.metrics.get_dashboard_totals(clinic_id, start_date, end_date)
+                    top_clinics = uow.metrics.get_top_clinics(clinic_id, start_date, end_date)
+                else:
+                    totals = uow.metrics.get_rollup_totals(clinic_id, start_date, end_date)
+                    top_clinics = uow.metrics.get_rollup_top_clinics(clinic_id, start_date, end_date)
+
+            total_calls = totals["total_calls"]
+            call_types_distribution = []
+            for call_type in CallType:
+                count = totals[f"{call_type.value}_calls"]
+                if not count:
+                    continue
+                percentage = (count / total_calls * 100) if total_calls > 0 else 0
+                call_types_distribution.append({
+                    "call_type": call_type.value,
+                    "count": count,
+                    "percentage": round(percentage, 2)
+                })
+
+            average_duration_seconds = float(totals["average_duration"]) if totals["average_duration"] else 0
+
+            logger.info(f"Successfully retrieved dashboard metrics for {total_calls} calls")
+            metrics = {
+                "total_clinics": totals["total_clinics"],
+                "total_calls": total_calls,
+                "total_evaluations": totals["total_evaluations"],
+                "calls_with_feedback": totals["calls_with_feedback"],
+                "average_duration_seconds": round(average_duration_seconds, 2),
+                "average_score": round(float(totals["average_score"] or 0), 2),
+                "total_evaluations_with_score": totals["total_evaluations"],
+                "call_types_distribution": call_types_distribution,
+                "top_clinics": top_clinics
+            }
+            dashboard_cache.set(cache_params, metrics)
+            return metrics
+        except Exception as e:
+            logger.error(f"Error retrieving dashboard metrics: {e}")
+            raise
+
+    def refresh_daily_stats(
+        self,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None,
+        clinic_id: Optional[int] = None
+    ) -> int:
+        """Rebuild call_daily_stats for a day range (everything when no bounds are given)"""
+        logger.info(f"Processing request refresh daily stats: start_day={start_day}, end_day={end_day}, clinic_id={clinic_id}")
+
+        try:
+            with self._unit_of_work_factory() as uow:
+                rows = uow.daily_stats.refresh_range(start_day, end_day, clinic_id)
+                uow.on_commit(dashboard_cache.invalidate)
+            logger.info(f"Successfully refreshed daily stats: {rows} rows")
+            return rows
+        except Exception as e:
+            logger.error(f"Error refreshing daily stats: {e}")
+            raise
+
+    def get_db_pool_metrics(self) -> dict:
+        """Connection pool state and wait statistics of each database engine"""
+        return {"pools": get_pool_metrics()}
@@ -1,8 +1,10 @@
+from functools import partial
 from app.repositories.unit_of_work import UnitOfWork
+from app.repositories.counting import invalidate_counts
 from app.data_acess.models import User as UserModel
 from app.domain.user_models import User as UserDomain, UserCreate, UserUpdate
 from app.utils.logger import logger
-from app.utils.pagination import CustomPagination
+from app.utils.pagination import CustomPagination, cursor_scope
 from app.utils.auth import get_password_hash, verify_password
 from datetime import datetime
 from typing import List, Optional
@@ -26,7 +28,6 @@ class UserService:
                     return None
 
                 uow.users.update_last_login(user_model.id)
-                uow._UnitOfWork__session.commit()
                 logger.info(f"Authenticated user: {username_or_email}")
                 # Convert to domain model before returning to avoid detached instance error
                 return UserDomain.model_validate(user_model)
@@ -49,8 +50,14 @@ class UserService:
         logger.info(f"Fetching paginated users: page={pagination.page}, items={pagination.items_per_page}")
         try:
             with self._unit_of_work_factory() as uow:
-                total = uow.users.count()
-                users = uow.users.list_paginated(pagination.offset, pagination.items_per_page)
+                if pagination.use_cursor:
+                    pagination.scope_cursor(cursor_scope(listing="users"))
+                    users = uow.users.list_keyset(pagination.cursor, pagination.fetch_limit)
+                    domain_users = [UserDomain.model_validate(user) for user in users]
+                    return pagination.paginate_cursor(domain_users)
+
+                total = uow.users.count(count_mode=pagination.count_mode)
+                users = uow.users.list_paginated(pagination.offset, pagination.fetch_limit)
                 domain_users = [UserDomain.model_validate(user) for user in users]
                 return pagination.paginate(domain_users, total)
         except Exception as e:
@@ -89,7 +96,7 @@ class UserService:
                 hashed_password = get_password_hash(user_data.password)
                 user_model = UserModel(**user_data.model_dump(exclude={"password"}), password=hashed_password)
                 new_user = uow.users.add(user_model)
-                uow._UnitOfWork__session.commit()
+                uow.on_commit(partial(invalidate_counts, "user"))
                 return UserDomain.model_validate(new_user)
         except Exception as e:
             logger.error(f"Error creating user: {e}")
@@ -104,9 +111,8 @@ class UserService:
                     existing = uow.users.get_by_email(update_data['email'])
                     if existing and existing.id != user_id:
                         raise ValueError("Email already exists")
-                updated = uow.users.update(user_id, update_data)
+                updated = uow.users.update_by_id(user_id, update_data)
                 if updated:
-                    uow._UnitOfWork__session.commit()
                     return UserDomain.model_validate(updated)
                 return None
         except Exception as e:
@@ -117,10 +123,10 @@ class UserService:
         logger.info(f"Deleting user ID: {user_id}")
         try:
             with self._unit_of_work_factory() as uow:
-                success = uow.users.delete(user_id)
-                if success:
-                    uow._UnitOfWork__session.commit()
-                return success
+                deleted = uow.users.delete_by_id(user_id)
+                if deleted:
+                    uow.on_commit(partial(invalidate_counts, "user"))
+                return deleted
         except Exception as e:
             logger.error(f"Error deleting user {user_id}: {e}")
             raise
@@ -0,0 +1,186 @@
+import abc
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.utils.config_utils import GlobalConfig
+from app.utils.logger import logger
+
+
+class CacheBackend(abc.ABC):
+    """Key/value store used by the caches below. `ttl_seconds=None` means no expiry."""
+
+    @abc.abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete(self, key: Hashable) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def incr(self, key: Hashable) -> int:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class TTLCache(CacheBackend):
+    """
+    Thread-safe in-process LRU cache whose entries expire after `ttl_seconds`.
+    Once `max_entries` is reached the least recently used entry is evicted.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: int = 1024) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self.__entries[key]
+                return None
+            self.__entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self.__lock:
+            self.__entries[key] = (expires_at, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def incr(self, key: Hashable) -> int:
+        with self.__lock:
+            expires_at, value = self.__entries.get(key, (None, 0))
+            self.__entries[key] = (expires_at, value + 1)
+            self.__entries.move_to_end(key)
+            return value + 1
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+
+
+class RedisCache(CacheBackend):
+    """
+    Backend on top of a Redis client (or anything exposing get/set/delete/incr
+    with the redis-py signatures, such as a local stand-in in tests).
+    Values are stored as JSON, so they must be JSON serializable.
+    """
+
+    def __init__(self, client, prefix: str = "solum:") -> None:
+        self.__client = client
+        self.__prefix = prefix
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.__prefix}{key}"
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        raw = self.__client.get(self._key(key))
+        if raw is None:
+            return None
+        return json.loads(raw)
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ex = max(1, int(ttl_seconds)) if ttl_seconds is not None else None
+        self.__client.set(self._key(key), json.dumps(value, default=str), ex=ex)
+
+    def delete(self, key: Hashable) -> None:
+        self.__client.delete(self._key(key))
+
+    def incr(self, key: Hashable) -> int:
+        return int(self.__client.incr(self._key(key)))
+
+    def clear(self) -> None:
+        # Only our own keys, the Redis database may be shared
+        for key in self.__client.scan_iter(match=f"{self.__prefix}*"):
+            self.__client.delete(key)
+
+
+class ResponseCache:
+    """
+    Caches computed responses of one endpoint under `namespace`.
+
+    Keys embed a generation number stored in the backend, so `invalidate()` drops
+    every entry at once (across processes with Redis) by bumping the generation;
+    stale entries are left to expire through their TTL.
+    """
+
+    def __init__(self, namespace: str, ttl_seconds: float, backend: Optional[CacheBackend] = None) -> None:
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.__backend = backend
+
+    @property
+    def backend(self) -> CacheBackend:
+        # Resolved on use so set_cache_backend() also applies to existing caches
+        return self.__backend if self.__backend is not None else get_cache_backend()
+
+    def _generation(self) -> int:
+        return self.backend.get(f"{self.namespace}:generation") or 0
+
+    def _key(self, params: tuple) -> str:
+        return f"{self.namespace}:{self._generation()}:{json.dumps(params, default=str)}"
+
+    def get(self, params: tuple) -> Optional[Any]:
+        try:
+            return self.backend.get(self._key(params))
+        except Exception as e:
+            logger.warning(f"Cache read failed for {self.namespace}: {e}")
+            return None
+
+    def set(self, params: tuple, value: Any) -> None:
+        try:
+            self.backend.set(self._key(params), value, self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Cache write failed for {self.namespace}: {e}")
+
+    def invalidate(self) -> None:
+        try:
+            self.backend.incr(f"{self.namespace}:generation")
+            logger.info(f"Invalidated cache {self.namespace}")
+        except Exception as e:
+            logger.warning(f"Cache invalidation failed for {self.namespace}: {e}")
+
+
+_cache_backend: Optional[CacheBackend] = None
+
+
+def get_cache_backend() -> CacheBackend:
+    """Shared backend selected by CACHE_BACKEND (memory or redis)"""
+    global _cache_backend
+    if _cache_backend is None:
+        if GlobalConfig.get_cache_backend() == "redis":
+            # Optional dependency, only needed when the redis backend is selected
+            import redis
+            _cache_backend = RedisCache(redis.Redis.from_url(GlobalConfig.get_redis_url()))
+        else:
+            _cache_backend = TTLCache(max_entries=GlobalConfig.get_cache_max_entries())
+    return _cache_backend
+
+
+def set_cache_backend(backend: CacheBackend) -> None:
+    """Replace the shared backend, e.g. with a local stand-in in tests"""
+    global _cache_backend
+    _cache_backend = backend
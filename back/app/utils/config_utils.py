@@ -1,4 +1,6 @@
 import os
+import tempfile
+from typing import Optional
 
 from dotenv import load_dotenv
 
@@ -36,6 +38,48 @@ class DatabaseConfig:
     def get_driver() -> str:
         return os.getenv("DB_DRIVER", "{ODBC Driver 17 for SQL Server}")
 
+    @staticmethod
+    def get_echo() -> bool:
+        # Logs every statement with its parameters, for local debugging only
+        return os.getenv("DB_ECHO", "false").lower() in ("1", "true", "yes")
+
+    @staticmethod
+    def get_slow_query_threshold_ms() -> Optional[int]:
+        # Statements slower than this are logged, "off" disables slow query logging
+        value = os.getenv("DB_SLOW_QUERY_MS", "500")
+        return None if value.lower() == "off" else int(value)
+
+    @staticmethod
+    def get_pool_profile() -> str:
+        # "managed", "dedicated" or "pgbouncer"
+        return os.getenv("DB_POOL_PROFILE", "managed").lower()
+
+    @staticmethod
+    def _get_optional_int(name: str) -> Optional[int]:
+        value = os.getenv(name)
+        return int(value) if value else None
+
+    @staticmethod
+    def get_pool_size() -> Optional[int]:
+        return DatabaseConfig._get_optional_int("DB_POOL_SIZE")
+
+    @staticmethod
+    def get_max_overflow() -> Optional[int]:
+        return DatabaseConfig._get_optional_int("DB_MAX_OVERFLOW")
+
+    @staticmethod
+    def get_pool_timeout() -> Optional[int]:
+        return DatabaseConfig._get_optional_int("DB_POOL_TIMEOUT")
+
+    @staticmethod
+    def get_pool_recycle() -> Optional[int]:
+        return DatabaseConfig._get_optional_int("DB_POOL_RECYCLE")
+
+    @staticmethod
+    def get_threadpool_tokens() -> Optional[int]:
+        """Threads the sync routes run on, defaults to a size derived from the pool (see get_threadpool_tokens)"""
+        return DatabaseConfig._get_optional_int("THREADPOOL_TOKENS")
+
 
 class GlobalConfig:
     @staticmethod
@@ -49,6 +93,29 @@ class GlobalConfig:
     @staticmethod
     def get_log_filename():
         return os.getenv('LOG_FILENAME')
+
+    @staticmethod
+    def get_log_level() -> str:
+        return os.getenv('LOG_LEVEL', 'INFO').upper()
+
+    @staticmethod
+    def get_log_format() -> str:
+        # "json" or "text"
+        return os.getenv('LOG_FORMAT', 'json').lower()
+
+    @staticmethod
+    def get_log_module_levels() -> str:
+        # e.g. "call_repository=WARNING,ingestion_services=DEBUG"
+        return os.getenv('LOG_MODULE_LEVELS', '')
+
+    @staticmethod
+    def get_log_info_sample_every() -> int:
+        # Keep 1 in N INFO records per call site, 1 keeps all of them
+        return int(os.getenv('LOG_INFO_SAMPLE_EVERY', '1'))
+
+    @staticmethod
+    def get_log_queue_size() -> int:
+        return int(os.getenv('LOG_QUEUE_SIZE', '10000'))
     
     @staticmethod
     def get_jwt_secret_key():
@@ -62,4 +129,57 @@ class GlobalConfig:
     def get_jwt_access_token_expire_minutes():
         return int(os.getenv('JWT_ACCESS_TOKEN_EXPIRE_MINUTES', '30'))
 
-    
\ No newline at end of file
+    @staticmethod
+    def get_count_cache_ttl_seconds() -> int:
+        return int(os.getenv('COUNT_CACHE_TTL_SECONDS', '60'))
+
+    @staticmethod
+    def get_cache_backend() -> str:
+        return os.getenv('CACHE_BACKEND', 'memory').lower()
+
+    @staticmethod
+    def get_redis_url() -> str:
+        return os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+    @staticmethod
+    def get_cache_max_entries() -> int:
+        return int(os.getenv('CACHE_MAX_ENTRIES', '1024'))
+
+    @staticmethod
+    def get_dashboard_cache_ttl_seconds() -> int:
+        return int(os.getenv('DASHBOARD_CACHE_TTL_SECONDS', '30'))
+
+    @staticmethod
+    def get_ingestion_chunk_size() -> int:
+        return int(os.getenv('INGESTION_CHUNK_SIZE', '2000'))
+
+    @staticmethod
+    def get_job_workers() -> int:
+        return int(os.getenv('JOB_WORKERS', '2'))
+
+    @staticmethod
+    def get_import_spool_path() -> str:
+        return os.getenv('IMPORT_SPOOL_PATH', os.path.join(tempfile.gettempdir(), 'solum-imports'))
+
+    @staticmethod
+    def get_export_path() -> str:
+        return os.getenv('EXPORT_PATH', os.path.join(tempfile.gettempdir(), 'solum-exports'))
+
+    @staticmethod
+    def get_export_retention_hours() -> int:
+        """Finished export files older than this are deleted when a new export starts"""
+        return int(os.getenv('EXPORT_RETENTION_HOURS', '24'))
+
+    @staticmethod
+    def get_response_serialization() -> str:
+        """
+        model (pydantic validation against response_model, the default) or fast
+        (row dicts encoded by orjson, opt-in: the bodies are not validated, see
+        scripts/benchmark_serialization.py to compare both modes)
+        """
+        return os.getenv('RESPONSE_SERIALIZATION', 'model').lower()
+
+    @staticmethod
+    def get_pagination_link_window() -> int:
+        """Page links listed on each side of the current page, besides the first and last"""
+        return int(os.getenv('PAGINATION_LINK_WINDOW', '2'))
@@ -1,14 +1,25 @@
-from typing import Annotated
+from typing import Annotated, Iterator
 from fastapi import Depends, HTTPException, status
 
+from app.repositories.unit_of_work import UnitOfWork
 from app.services.user_services import UserService
 from app.utils.auth import oauth2_scheme, verify_token
 from app.domain.user_models import User as UserDomain
 
-def get_user_service() -> UserService:
-    return UserService()
+def get_unit_of_work() -> Iterator[UnitOfWork]:
+    """
+    One UnitOfWork per request, shared by every service the request uses
+    (FastAPI caches the dependency within a request). It is committed when the
+    endpoint returns and rolled back when it raises, before the response is sent.
+    The session only checks out a connection on its first query.
+    """
+    with UnitOfWork() as uow:
+        yield uow
 
-async def get_current_user_dependency(
+def get_user_service(uow: UnitOfWork = Depends(get_unit_of_work)) -> UserService:
+    return UserService(unit_of_work_factory=lambda: uow)
+
+def get_current_user_dependency(
     token: Annotated[str, Depends(oauth2_scheme)],
     service: UserService = Depends(get_user_service)
 ) -> UserDomain:
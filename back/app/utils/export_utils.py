@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Iterable, Iterator, List, Sequence
+
+
+class ExportFormat(str, Enum):
+    """Body format of the streaming export endpoints"""
+    ndjson = "ndjson"  # one JSON object per line
+    csv = "csv"  # header row, then one row per record
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+def _export_value(value):
+    """Plain value for a JSON or CSV cell: ISO timestamps and enum values"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def iter_ndjson(batches: Iterable[Sequence[dict]]) -> Iterator[str]:
+    """One chunk of NDJSON lines per batch of rows"""
+    for batch in batches:
+        yield "".join(
+            json.dumps({key: _export_value(value) for key, value in row.items()}, ensure_ascii=False) + "\n"
+            for row in batch
+        )
+
+
+def iter_csv(batches: Iterable[Sequence[dict]], columns: List[str]) -> Iterator[str]:
+    """Header row, then one chunk of CSV rows per batch of rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_export_value(row[column]) for column in columns] for row in batch)
+        yield buffer.getvalue()
+
+
+def export_filename(prefix: str, export_format: ExportFormat) -> str:
+    return f"{prefix}-{datetime.now():%Y%m%d-%H%M%S}.{export_format.value}"
@@ -0,0 +1,107 @@
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Callable, Optional
+
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.utils.config_utils import GlobalConfig
+from app.utils.logger import logger
+
+
+def _error_message(error: Exception) -> str:
+    """Client safe description of why a job failed, the exception itself is only logged"""
+    if isinstance(error, IntegrityError):
+        return "The data conflicts with existing records or references missing ones"
+    if isinstance(error, SQLAlchemyError):
+        return "Database error"
+    return "Internal error"
+
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+class Job:
+    """State of one background job. `progress` and `result` are set by the job function."""
+
+    def __init__(self, kind: str) -> None:
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = JobStatus.queued
+        self.created = datetime.now(timezone.utc)
+        self.started: Optional[datetime] = None
+        self.finished: Optional[datetime] = None
+        self.progress: Any = None
+        self.result: Any = None
+        # Client safe failure reason, see _error_message
+        self.error: Optional[str] = None
+
+    def report(self, progress: Any) -> None:
+        """Publish intermediate progress, readable while the job runs"""
+        self.progress = progress
+
+
+class JobManager:
+    """
+    Runs long tasks (imports, exports) in a worker pool off the request path
+    and keeps their state in memory for status polling.
+
+    Jobs live in the process that accepted them, so with several app workers
+    status requests must reach the same worker (or use a single job worker).
+    """
+
+    def __init__(self, max_workers: int, max_jobs: int = 500) -> None:
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self.__jobs = OrderedDict()
+        self.__max_jobs = max_jobs
+        self.__lock = threading.Lock()
+
+    def submit(self, kind: str, fn: Callable[..., Any], *args, **kwargs) -> Job:
+        """
+        Queue `fn(job, *args, **kwargs)`. Its return value becomes `job.result`,
+        an exception marks the job as failed.
+        """
+        job = Job(kind)
+        with self.__lock:
+            self.__jobs[job.id] = job
+            self._evict_finished()
+        self.__executor.submit(self._run, job, fn, args, kwargs)
+        logger.info(f"Queued {kind} job {job.id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self.__lock:
+            return self.__jobs.get(job_id)
+
+    def _run(self, job: Job, fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        job.status = JobStatus.running
+        job.started = datetime.now(timezone.utc)
+        logger.info(f"Started {job.kind} job {job.id}")
+        try:
+            job.result = fn(job, *args, **kwargs)
+            job.status = JobStatus.completed
+            logger.info(f"Completed {job.kind} job {job.id}")
+        except Exception as e:
+            # GET /imports|exports/{job_id} return job.error, don't leak driver or SQL text through it
+            job.error = _error_message(e)
+            job.status = JobStatus.failed
+            logger.exception(f"Failed {job.kind} job {job.id}: {e}")
+        finally:
+            job.finished = datetime.now(timezone.utc)
+
+    def _evict_finished(self) -> None:
+        # Oldest finished jobs go first, running ones are always kept
+        for job_id in list(self.__jobs):
+            if len(self.__jobs) <= self.__max_jobs:
+                break
+            if self.__jobs[job_id].status in (JobStatus.completed, JobStatus.failed):
+                del self.__jobs[job_id]
+
+
+job_manager = JobManager(max_workers=GlobalConfig.get_job_workers())
@@ -1,16 +1,144 @@
+import atexit
+import json
 import logging
-from logging.handlers import TimedRotatingFileHandler
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from typing import Dict
 
 from .config_utils import GlobalConfig
 from .os_utils import create_folder_if_not_exists, get_full_filename
 
+# LogRecord attributes that are not user supplied `extra` fields
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with `extra` fields as top level keys"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "line": record.lineno,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class ModuleLevelFilter(logging.Filter):
+    """
+    Minimum level per source module (file name without .py), e.g.
+    LOG_MODULE_LEVELS="call_repository=WARNING,ingestion_services=DEBUG".
+    Modules not listed use `default_level`.
+    """
+
+    def __init__(self, levels: Dict[str, int], default_level: int) -> None:
+        super().__init__()
+        self.levels = levels
+        self.default_level = default_level
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= self.levels.get(record.module, self.default_level)
+
+
+class InfoSamplingFilter(logging.Filter):
+    """
+    Keeps one in `every` INFO and DEBUG records of each logging call site
+    (the first one always). Warnings and errors are never sampled.
+    """
+
+    def __init__(self, every: int) -> None:
+        super().__init__()
+        self.every = every
+        self.__counters: Dict[tuple, int] = {}
+        self.__lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.every <= 1 or record.levelno > logging.INFO:
+            return True
+        key = (record.pathname, record.lineno)
+        with self.__lock:
+            seen = self.__counters.get(key, 0)
+            self.__counters[key] = seen + 1
+        return seen % self.every == 0
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to the writer thread. When the queue is full the record is
+    dropped (and counted) instead of blocking the request.
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments and render the traceback now, the originals may change or
+        # not be picklable, but leave the formatting itself to the writer thread
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _parse_module_levels(value: str) -> Dict[str, int]:
+    levels = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        module, _, level = item.partition("=")
+        levelno = logging.getLevelName(level.strip().upper())
+        if not isinstance(levelno, int):
+            raise ValueError(f"Invalid log level '{level}' for module '{module}' in LOG_MODULE_LEVELS")
+        levels[module.strip()] = levelno
+    return levels
+
 
 create_folder_if_not_exists(GlobalConfig.get_log_path())
 filename = get_full_filename(GlobalConfig.get_log_path(), GlobalConfig.get_log_filename())
 
+# The file is written by the listener thread only
 logHandler = TimedRotatingFileHandler(filename, when="midnight", delay=True)
-logFormatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+if GlobalConfig.get_log_format() == "json":
+    logFormatter = JsonFormatter()
+else:
+    logFormatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
 logHandler.setFormatter(logFormatter)
+
+log_level = logging.getLevelName(GlobalConfig.get_log_level())
+module_levels = _parse_module_levels(GlobalConfig.get_log_module_levels())
+
+queueHandler = NonBlockingQueueHandler(queue.Queue(GlobalConfig.get_log_queue_size()))
+# Filters run on the calling thread, so discarded records never reach the queue
+queueHandler.addFilter(ModuleLevelFilter(module_levels, log_level))
+queueHandler.addFilter(InfoSamplingFilter(GlobalConfig.get_log_info_sample_every()))
+
+logListener = QueueListener(queueHandler.queue, logHandler, respect_handler_level=True)
+logListener.start()
+# Flush what is still queued on shutdown
+atexit.register(logListener.stop)
+
 logger = logging.getLogger("uvicorn")
-logger.addHandler(logHandler)
-logger.setLevel(logging.INFO)
+logger.addHandler(queueHandler)
+# Low enough for the most verbose module, ModuleLevelFilter applies the actual levels
+logger.setLevel(min([log_level, *module_levels.values()]))
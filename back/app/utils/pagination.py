@@ -1,8 +1,16 @@
 # app/utils/pagination.py - ESTILO DJANGO REST FRAMEWORK
+import base64
+import binascii
+import hashlib
+import json
 import math
-from typing import Generic, TypeVar, List, Optional, Dict, Any
-from pydantic import BaseModel, Field
-from fastapi import Query, Request
+from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Generic, TypeVar, List, Optional, Dict, Any, Literal
+from pydantic import BaseModel, Field, ValidationError
+from fastapi import HTTPException, Query, Request
+from app.utils.config_utils import GlobalConfig
 
 T = TypeVar('T')
 
@@ -22,28 +30,183 @@ class PaginationResponse(BaseModel, Generic[T]):
     data: List[T]
     payload: dict
 
+class CountMode(str, Enum):
+    """How the total row count of a paginated listing is obtained"""
+    exact = "exact"  # COUNT(*) on every request
+    estimated = "estimated"  # planner statistics, no table scan
+    cached = "cached"  # exact COUNT(*) reused for a TTL
+    none = "none"  # no count, only a has_next flag
+
+class CursorToken(BaseModel):
+    """Decoded keyset cursor: the sort key and id of the row the page starts after"""
+    value: Any = None
+    id: int
+    direction: Literal["next", "prev"] = "next"
+    # cursor_scope() of the sort and filters the cursor was issued for
+    scope: Optional[str] = None
+
+
+def cursor_scope(**params: Any) -> str:
+    """Short fingerprint of the sort and filters of a keyset listing"""
+    raw = json.dumps(params, sort_keys=True, default=lambda value: getattr(value, "value", str(value)))
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def encode_cursor(value: Any, row_id: int, direction: str = "next", scope: Optional[str] = None) -> str:
+    """Build an opaque, url-safe cursor token from a sort key and row id"""
+    value_type = None
+    if isinstance(value, datetime):
+        value, value_type = value.isoformat(), "datetime"
+    elif isinstance(value, Enum):
+        value = value.value
+    raw = json.dumps({"v": value, "t": value_type, "id": row_id, "d": direction, "s": scope}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> CursorToken:
+    """Decode a token built by encode_cursor. Raises ValueError if it was tampered with."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value = raw.get("v")
+        if raw.get("t") == "datetime" and value is not None:
+            value = datetime.fromisoformat(value)
+        return CursorToken(value=value, id=raw["id"], direction=raw.get("d", "next"), scope=raw.get("s"))
+    except (binascii.Error, ValueError, KeyError, TypeError, AttributeError, ValidationError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+PAGE_GAP_LABEL = "..."
+
+
+@lru_cache(maxsize=4096)
+def page_window(page: int, last_page: int, window: int) -> tuple:
+    """
+    Page numbers to link for `page` of `last_page`: the first and last pages and
+    `window` pages on each side of the current one, with None where pages are
+    skipped, e.g. (1, None, 6, 7, 8, 9, 10, None, 200000). At most
+    2 * window + 5 entries, whatever the number of pages.
+    """
+    if last_page < 1:
+        return ()
+    start = max(min(page, last_page) - window, 1)
+    end = min(max(page, 1) + window, last_page)
+
+    # A gap hiding a single page shows that page instead
+    pages = []
+    if start > 1:
+        pages.append(1)
+        if start > 2:
+            pages.append(None if start > 3 else 2)
+    pages.extend(range(start, end + 1))
+    if end < last_page:
+        if end < last_page - 1:
+            pages.append(None if end < last_page - 2 else last_page - 1)
+        pages.append(last_page)
+    return tuple(pages)
+
+
 class CustomPagination:
     """Paginación personalizada estilo Django REST Framework"""
     
     def __init__(
         self,
         page: int = Query(1, ge=1, description="Page number"),
-        items_per_page: int = Query(10, ge=1, le=100, description="Items per page")
+        items_per_page: int = Query(10, ge=1, le=100, description="Items per page"),
+        cursor: Optional[str] = None,
+        mode: str = "page",
+        count_mode: CountMode = CountMode.exact,
+        link_window: Optional[int] = None
     ):
         self.page = page
         self.items_per_page = min(items_per_page, 100)  # max_page_size = 100
         self.offset = (page - 1) * self.items_per_page
+        # Keyset mode: the cursor replaces page/offset so deep pages cost the same as the first one
+        self.cursor = decode_cursor(cursor) if cursor else None
+        self.use_cursor = mode == "cursor" or self.cursor is not None
+        self.count_mode = CountMode(count_mode)
+        self.scope: Optional[str] = None
+        # Page links around the current page; the links stay bounded on huge tables
+        self.link_window = max(GlobalConfig.get_pagination_link_window() if link_window is None else link_window, 0)
+
+    @property
+    def fetch_limit(self) -> int:
+        """
+        Rows to ask the repository for. Keyset pages and pages without a count
+        fetch one extra row to detect a following page.
+        """
+        if self.use_cursor or self.count_mode == CountMode.none:
+            return self.items_per_page + 1
+        return self.items_per_page
 
-    def paginate(self, data: List[T], total_count: int) -> PaginationResponse[T]:
+    def scope_cursor(self, scope: str) -> None:
+        """
+        Tie the cursors of this listing to its sort and filters (see cursor_scope).
+        The cursor value is compared with the sort column, so a cursor issued
+        for another sort_by would compare e.g. a string with a timestamp.
+
+        Raises:
+            ValueError: If the request cursor was issued for another scope
+        """
+        if self.cursor is not None and self.cursor.scope != scope:
+            raise ValueError("The cursor was issued for a different sort order or filters, start again from the first page")
+        self.scope = scope
+
+    def paginate_cursor(self, data: List[T], sort_field: str = "id") -> PaginationResponse[T]:
+        """
+        Build a keyset page from rows fetched with fetch_limit in cursor direction.
+        `sort_field` is the attribute the cursor encodes together with `id`.
+        """
+        backwards = self.cursor is not None and self.cursor.direction == "prev"
+        has_more = len(data) > self.items_per_page
+        items = list(data[:self.items_per_page])
+        if backwards:
+            # Rows were fetched walking backwards from the cursor, restore display order
+            items.reverse()
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, self.cursor is not None
+
+        next_cursor = prev_cursor = None
+        if items and has_next:
+            last = items[-1]
+            next_cursor = encode_cursor(_item_value(last, sort_field), _item_value(last, "id"), "next", self.scope)
+        if items and has_prev:
+            first = items[0]
+            prev_cursor = encode_cursor(_item_value(first, sort_field), _item_value(first, "id"), "prev", self.scope)
+
+        return PaginationResponse(
+            data=items,
+            payload={
+                "pagination": {
+                    "items_per_page": self.items_per_page,
+                    "has_next": has_next,
+                    "has_prev": has_prev,
+                    "next_cursor": next_cursor,
+                    "prev_cursor": prev_cursor
+                }
+            }
+        )
+
+    def paginate(self, data: List[T], total_count: Optional[int]) -> PaginationResponse[T]:
         """
         Paginate the data and return the response in the format expected by your frontend.
+
+        With count_mode=none `total_count` is None and `data` holds up to
+        fetch_limit rows: the extra row only tells whether a next page exists.
         """
-        # Calculate pagination info
-        last_page = math.ceil(total_count / self.items_per_page)
+        if total_count is None:
+            has_next = len(data) > self.items_per_page
+            data = data[:self.items_per_page]
+            last_page = None
+        else:
+            # Calculate pagination info
+            last_page = math.ceil(total_count / self.items_per_page)
+            has_next = self.page < last_page
         
         # Determine previous and next pages
         previous_page = self.page - 1 if self.page > 1 else None
-        next_page = self.page + 1 if self.page < last_page else None
+        next_page = self.page + 1 if has_next else None
         
         # Build pagination links
         paginador = []
@@ -54,10 +217,10 @@ class CustomPagination:
             "page": previous_page
         })
         
-        # Page numbers
-        for pagina in range(1, last_page + 1):
+        # Page numbers around the current one (only the current one is known without a total)
+        for pagina in page_window(self.page, last_page, self.link_window) if last_page is not None else [self.page]:
             paginador.append({
-                "label": pagina,
+                "label": pagina if pagina is not None else PAGE_GAP_LABEL,
                 "page": pagina
             })
         
@@ -76,17 +239,36 @@ class CustomPagination:
                     "page": self.page,
                     "from": 1,
                     "last_page": last_page,
+                    "has_next": has_next,
+                    "count_mode": self.count_mode.value,
                     "links": paginador
                 }
             }
         )
 
+def _item_value(item: Any, field: str) -> Any:
+    if isinstance(item, dict):
+        return item.get(field)
+    return getattr(item, field, None)
+
 def get_pagination_params(
     page: int = Query(1, ge=1, description="Page number"),
-    items_per_page: int = Query(10, ge=1, le=100, description="Items per page")
+    items_per_page: int = Query(10, ge=1, le=100, description="Items per page"),
+    pagination_mode: Literal["page", "cursor"] = Query("page", description="'page' (offset) or 'cursor' (keyset) pagination"),
+    cursor: Optional[str] = Query(None, description="next_cursor/prev_cursor token from a previous cursor page"),
+    count_mode: CountMode = Query(CountMode.exact, description="Total count strategy: exact, estimated, cached or none")
 ) -> CustomPagination:
     """
     Dependency to get pagination parameters from query string.
     """
-    return CustomPagination(page=page, items_per_page=items_per_page)
+    try:
+        return CustomPagination(
+            page=page,
+            items_per_page=items_per_page,
+            cursor=cursor,
+            mode=pagination_mode,
+            count_mode=count_mode
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
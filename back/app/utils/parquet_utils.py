@@ -0,0 +1,94 @@
+import os
+from enum import Enum
+from typing import Callable, List, Mapping, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.utils.logger import logger
+
+# Directory levels of a row, e.g. (("clinic_id", "3"), ("month", "2025-01"))
+PartitionKey = Tuple[Tuple[str, str], ...]
+
+
+def _plain(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+class PartitionedParquetWriter:
+    """
+    Writes row batches into a hive partitioned Parquet dataset,
+    <root>/clinic_id=3/month=2025-01/part-0.parquet, with every batch becoming
+    a row group of the files it touches.
+
+    Rows are expected grouped by partition: the open file is closed as soon as
+    a row of another partition arrives, so only one file is open at a time.
+    A partition that comes back later gets a new part file.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        schema: pa.Schema,
+        partition_of: Callable[[Mapping], PartitionKey],
+        compression: str = "zstd"
+    ) -> None:
+        self.root = root
+        self.schema = schema
+        self.compression = compression
+        self.rows_written = 0
+        self.files: List[str] = []
+        self.__partition_of = partition_of
+        self.__parts = {}
+        self.__key: Optional[PartitionKey] = None
+        self.__writer: Optional[pq.ParquetWriter] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def partitions(self) -> int:
+        return len(self.__parts)
+
+    def write_batch(self, rows: Sequence[Mapping]) -> None:
+        keys = [self.__partition_of(row) for row in rows]
+        start = 0
+        for index in range(1, len(rows) + 1):
+            # Each run of consecutive rows of the same partition is one write
+            if index == len(rows) or keys[index] != keys[start]:
+                self._write_run(keys[start], rows[start:index])
+                start = index
+
+    def close(self) -> None:
+        if self.__writer is not None:
+            self.__writer.close()
+            self.__writer = None
+            self.__key = None
+
+    def _write_run(self, key: PartitionKey, rows: Sequence[Mapping]) -> None:
+        if key != self.__key:
+            self.close()
+            self.__writer = self._open(key)
+            self.__key = key
+
+        table = pa.Table.from_pydict(
+            {name: [_plain(row[name]) for row in rows] for name in self.schema.names},
+            schema=self.schema
+        )
+        self.__writer.write_table(table)
+        self.rows_written += len(rows)
+
+    def _open(self, key: PartitionKey) -> pq.ParquetWriter:
+        part = self.__parts.get(key, 0)
+        self.__parts[key] = part + 1
+        if part:
+            logger.warning(f"Rows of partition {key} were not contiguous, writing part {part}")
+
+        directory = os.path.join(self.root, *(f"{name}={value}" for name, value in key))
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"part-{part}.parquet")
+        self.files.append(path)
+        return pq.ParquetWriter(path, self.schema, compression=self.compression)
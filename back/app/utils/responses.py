@@ -0,0 +1,58 @@
+from enum import Enum
+from typing import Any
+
+from fastapi.responses import ORJSONResponse
+
+from app.utils.config_utils import GlobalConfig
+from app.utils.pagination import PaginationResponse
+
+
+class SerializationMode(str, Enum):
+    """How read endpoints build their response bodies (RESPONSE_SERIALIZATION)"""
+    fast = "fast"  # dicts built from row tuples and encoded by orjson, response_model only documents the shape
+    model = "model"  # pydantic models, validated against response_model and encoded by FastAPI
+
+
+def load_serialization_mode() -> SerializationMode:
+    """
+    Parse RESPONSE_SERIALIZATION. Called once when the app is imported, so an
+    invalid value stops the startup instead of failing every read request.
+
+    Raises:
+        ValueError: If the setting is not a SerializationMode
+    """
+    value = GlobalConfig.get_response_serialization()
+    try:
+        return SerializationMode(value)
+    except ValueError:
+        raise ValueError(
+            f"Unsupported RESPONSE_SERIALIZATION '{value}', expected one of {', '.join(m.value for m in SerializationMode)}"
+        )
+
+
+_serialization_mode = load_serialization_mode()
+
+
+def set_serialization_mode(mode: SerializationMode) -> None:
+    """Switch the mode at runtime, for scripts comparing both (see scripts/benchmark_serialization.py)"""
+    global _serialization_mode
+    _serialization_mode = SerializationMode(mode)
+
+
+def fast_serialization() -> bool:
+    """Whether services should return plain dicts for serialized()"""
+    return _serialization_mode == SerializationMode.fast
+
+
+def serialized(content: Any) -> Any:
+    """
+    Endpoint return value for a service result. In fast mode the content is
+    already made of plain dicts and is sent as is by an ORJSONResponse,
+    skipping FastAPI's response_model validation and jsonable_encoder.
+    In model mode it is returned unchanged for FastAPI to validate.
+    """
+    if not fast_serialization():
+        return content
+    if isinstance(content, PaginationResponse):
+        content = {"data": content.data, "payload": content.payload}
+    return ORJSONResponse(content)
@@ -0,0 +1,136 @@
+import os
+from typing import Iterator, Optional, Tuple
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from app.utils.logger import logger
+
+# Standard column -> accepted spreadsheet headers
+COLUMN_MAP = {
+    'call_id': ['call_id'],
+    'type': ['type', 'call_type_value'],
+    'assistant': ['assistant'],
+    'customer_phone': ['customer_phone_number', 'customer_phone'],
+    'customer_name': ['customer_name'],
+    'call_reason': ['call_reason'],
+    'call_start_time': ['call_start_time'],
+    'call_ended_time': ['call_ended_time'],
+    'duration': ['duration'],
+    'summary': ['summary'],
+    'recording_url': ['recording_url'],
+    'ended_reason': ['ended_reason'],
+    'reviewer': ['Reviewer'],
+    'evaluation': ['Evaluation', 'evaluation'],
+    'check': ['QA Check', 'check'],
+    'feedback': ['Feedback QA', 'feedback'],
+    'score': ['Vapi QA Score', 'vapi_score'],
+    'status_feedback_engineer': ['Status Feedback Engineer', 'status_feedback_engineer'],
+    'comments_engineer': ['Comments Engineer', 'comments_engineer'],
+}
+
+DATETIME_COLUMNS = ('call_start_time', 'call_ended_time')
+FLOAT_COLUMNS = ('duration', 'score')
+
+SUPPORTED_EXTENSIONS = ('.xlsx', '.xlsm', '.csv')
+
+# Sheet name and rows, indexed by their row number in the spreadsheet (1-based, header is row 1)
+Chunk = Tuple[str, pd.DataFrame]
+
+
+def iter_spreadsheet_chunks(file_path: str, chunk_size: int, sheet_name: Optional[str] = None) -> Iterator[Chunk]:
+    """
+    Stream a workbook or CSV file as DataFrames of at most `chunk_size` rows,
+    so memory stays flat whatever the file size.
+
+    Args:
+        file_path: Path to an .xlsx/.xlsm or .csv file
+        chunk_size: Maximum rows per chunk
+        sheet_name: Name reported for CSV chunks (defaults to the file name)
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == '.csv':
+        name = sheet_name or os.path.splitext(os.path.basename(file_path))[0]
+        yield from _iter_csv_chunks(file_path, chunk_size, name)
+    elif extension in ('.xlsx', '.xlsm'):
+        yield from _iter_excel_chunks(file_path, chunk_size)
+    else:
+        raise ValueError(f"Unsupported file type '{extension}', expected one of {', '.join(SUPPORTED_EXTENSIONS)}")
+
+
+def _iter_csv_chunks(file_path: str, chunk_size: int, sheet_name: str) -> Iterator[Chunk]:
+    first_row = 2
+    for df in pd.read_csv(file_path, dtype=str, keep_default_na=False, chunksize=chunk_size):
+        df.index = pd.RangeIndex(first_row, first_row + len(df))
+        yield sheet_name, df
+        first_row += len(df)
+
+
+def _iter_excel_chunks(file_path: str, chunk_size: int) -> Iterator[Chunk]:
+    # read_only streams rows from the XML instead of building the whole workbook in memory
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for worksheet in workbook.worksheets:
+            rows = worksheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                continue
+            columns = [str(value).strip() if value is not None else f"column_{i}" for i, value in enumerate(header)]
+            width = len(columns)
+
+            batch = []
+            row_numbers = []
+            for row_number, values in enumerate(rows, start=2):
+                # Formatted but empty rows are reported too, skip them like pandas does
+                if all(value is None for value in values):
+                    continue
+                # read-only rows can be shorter or longer than the header
+                batch.append((tuple(values) + (None,) * width)[:width])
+                row_numbers.append(row_number)
+                if len(batch) >= chunk_size:
+                    yield worksheet.title, pd.DataFrame(batch, columns=columns, index=row_numbers, dtype=object)
+                    batch = []
+                    row_numbers = []
+            if batch:
+                yield worksheet.title, pd.DataFrame(batch, columns=columns, index=row_numbers, dtype=object)
+    finally:
+        workbook.close()
+
+
+def map_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rename the spreadsheet headers to the standard COLUMN_MAP names and parse
+    the values column by column. Blank cells become None.
+    """
+    columns = {}
+    for standard_col, possible_cols in COLUMN_MAP.items():
+        source_col = next((col for col in possible_cols if col in df.columns), None)
+        if source_col is None:
+            columns[standard_col] = pd.Series(pd.NA, index=df.index, dtype="string")
+            continue
+        text = df[source_col].astype("string")
+        columns[standard_col] = text.mask(text.str.strip() == "")
+
+    mapped = pd.DataFrame(columns, index=df.index)
+    for col in DATETIME_COLUMNS:
+        mapped[col] = _parse_datetimes(mapped[col])
+    for col in FLOAT_COLUMNS:
+        mapped[col] = pd.to_numeric(mapped[col].str.replace(",", ".", regex=False), errors="coerce")
+
+    return mapped.astype(object).where(mapped.notna(), None)
+
+
+def _parse_datetimes(values: pd.Series) -> pd.Series:
+    try:
+        return pd.to_datetime(values, errors="coerce", format="mixed")
+    except (ValueError, TypeError) as e:
+        # e.g. mixed timezone offsets, which can't share one datetime64 column
+        logger.warning(f"Falling back to per value datetime parsing: {e}")
+        return values.map(lambda value: _parse_datetime(value))
+
+
+def _parse_datetime(value):
+    if value is None or pd.isna(value):
+        return None
+    parsed = pd.to_datetime(value, errors="coerce")
+    return None if pd.isna(parsed) else parsed
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Compare the model and row based evaluation read paths on a large result.
+
+The model path is what RESPONSE_SERIALIZATION=model serves: Evaluation
+instances from the session, EvaluationRead.model_validate(ev, from_attributes=True)
+per row, response_model validation and jsonable_encoder + JSONResponse.
+The row path is the fast mode: the READ_COLUMNS projection as dicts encoded
+by ORJSONResponse. Both must produce the same JSON.
+
+For every read the median latency is printed, along with the memory blocks
+held by the response content before encoding and the peak traced memory
+(tracemalloc, measured in separate runs so tracing does not skew timings).
+
+Runs against the configured PostgreSQL database (DB_* environment
+variables) in one transaction that is rolled back, topping the evaluation
+table up to --evaluations rows with throwaway data if needed.
+
+Usage:
+    python scripts/benchmark_evaluation_reads.py
+    python scripts/benchmark_evaluation_reads.py --evaluations 10000 --repeat 10
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.domain.evaluation_models import EvaluationRead
+from app.repositories.evaluation_repository import EvaluationRepository
+from app.repositories.sql_client import ConnectionStringBuilder
+
+SEED_PREFIX = "benchmark-seed-"
+
+# FastAPI validates the endpoint result against response_model before encoding it
+LIST_RESPONSE_ADAPTER = TypeAdapter(List[EvaluationRead])
+RESPONSE_ADAPTER = TypeAdapter(EvaluationRead)
+
+
+def seed(connection, evaluations: int) -> None:
+    """Insert one throwaway clinic and call holding the missing evaluations"""
+    print(f"🔄 Seeding {evaluations} evaluations...")
+    clinic_id = connection.execute(
+        text("INSERT INTO clinic (name) VALUES (:name) RETURNING id"), {"name": f"{SEED_PREFIX}clinic"}
+    ).scalar()
+    call_id = connection.execute(text("""
+        INSERT INTO call (call_id, call_type, agent_environment, assistant, clinic_id, call_start_time, created)
+        VALUES (:call_id, 'inbound'::calltype, 'production'::agentenvironment, 'assistant', :clinic_id, now(), now())
+        RETURNING id
+    """), {"call_id": f"{SEED_PREFIX}call", "clinic_id": clinic_id}).scalar()
+    connection.execute(text("""
+        INSERT INTO evaluation (call_id, evaluator_type, reviewer, evaluation, "check", feedback, score, created)
+        SELECT :call_id, 'LLM'::evaluatortype, 'reviewer ' || g % 7, 'Evaluation ' || g,
+               CASE WHEN g % 2 = 0 THEN 'pass' ELSE 'fail' END, 'Feedback ' || g, g % 10, now()
+        FROM generate_series(1, :evaluations) g
+    """), {"call_id": call_id, "evaluations": evaluations})
+
+
+def model_path(read):
+    """Evaluation instances through EvaluationRead, response_model and jsonable_encoder"""
+    def build():
+        models = read(False)
+        if isinstance(models, list):
+            content = [EvaluationRead.model_validate(ev, from_attributes=True) for ev in models]
+            return LIST_RESPONSE_ADAPTER.validate_python(content)
+        return RESPONSE_ADAPTER.validate_python(EvaluationRead.model_validate(models, from_attributes=True))
+
+    def encode(content):
+        return JSONResponse(jsonable_encoder(content)).body
+
+    return build, encode
+
+
+def row_path(read):
+    """READ_COLUMNS dicts encoded by orjson"""
+    def encode(content):
+        return ORJSONResponse(content).body
+
+    return lambda: read(True), encode
+
+
+def read_cases(repository: EvaluationRepository, evaluation_id: int, page_size: int):
+    """Named repository reads, called with as_rows"""
+    def get(as_rows):
+        return repository.get_row(evaluation_id) if as_rows else repository.get(evaluation_id)
+
+    return [
+        ("all evaluations", lambda as_rows: repository.list(as_rows=as_rows)),
+        (f"offset page of {page_size}", lambda as_rows: repository.list_paginated(0, page_size, as_rows=as_rows)),
+        (f"keyset page of {page_size}", lambda as_rows: repository.list_keyset(None, page_size, as_rows=as_rows)),
+        ("single evaluation", get),
+    ]
+
+
+def measure(session: Session, build, encode, repeat: int):
+    """Median ms, blocks held by the built content and peak KiB of one read"""
+    timings = []
+    body = None
+    for _ in range(repeat):
+        session.expunge_all()
+        started = time.perf_counter()
+        body = encode(build())
+        timings.append((time.perf_counter() - started) * 1000)
+
+    session.expunge_all()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        content = build()
+        held = tracemalloc.take_snapshot().compare_to(before, "filename")
+        encode(content)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    blocks = sum(stat.count_diff for stat in held)
+    return statistics.median(timings), blocks, peak / 1024, body
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--evaluations", type=int, default=10000, help="Evaluations the table must hold")
+    parser.add_argument("--page-size", type=int, default=100, help="Rows of the paginated reads")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per read and path")
+    args = parser.parse_args()
+
+    engine = create_engine(ConnectionStringBuilder.get_default_connection_string())
+    if engine.dialect.name != "postgresql":
+        print("❌ The benchmark needs a PostgreSQL database (DB_TYPE=postgres)")
+        return 1
+
+    mismatches = 0
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            existing = connection.execute(text("SELECT count(*) FROM evaluation")).scalar()
+            if existing < args.evaluations:
+                seed(connection, args.evaluations - existing)
+            evaluation_id = connection.execute(text("SELECT max(id) FROM evaluation")).scalar()
+
+            session = Session(bind=connection, join_transaction_mode="create_savepoint")
+            repository = EvaluationRepository(session)
+            print(f"{'read':<24}{'path':>7}{'ms':>10}{'blocks':>10}{'peak KiB':>11}")
+            for name, read in read_cases(repository, evaluation_id, args.page_size):
+                results = {}
+                for path_name, path in (("model", model_path), ("rows", row_path)):
+                    build, encode = path(read)
+                    results[path_name] = measure(session, build, encode, args.repeat)
+                    ms, blocks, peak, _ = results[path_name]
+                    print(f"{name:<24}{path_name:>7}{ms:>10.2f}{blocks:>10}{peak:>11.0f}")
+
+                model_body, rows_body = results["model"][3], results["rows"][3]
+                if json.loads(model_body) != json.loads(rows_body):
+                    mismatches += 1
+                    print(f"❌ {name}: the row based body differs from the model one")
+                else:
+                    speedup = results["model"][0] / results["rows"][0]
+                    print(f"{'':<24}{'':>7}{speedup:>9.2f}x faster\n")
+            session.close()
+        finally:
+            transaction.rollback()
+
+    if mismatches:
+        print(f"❌ {mismatches} reads return different bodies")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
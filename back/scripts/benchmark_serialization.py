@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Compare the two response serialization modes of the call read endpoints.
+
+Requests every endpoint through the application against the configured
+database (DB_* environment variables), alternating the response
+serialization mode between "model" (CallRead models validated against the
+response_model and encoded by FastAPI) and "fast" (dicts built from row
+tuples and encoded by orjson). Both modes must return the same JSON body;
+the median latency of each one and the speedup are printed per endpoint.
+
+Usage:
+    python scripts/benchmark_serialization.py
+    python scripts/benchmark_serialization.py --repeat 50 --page-size 100
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.main import app
+from app.repositories.sql_client import ConnectionStringBuilder
+from app.utils import responses
+from app.utils.responses import SerializationMode
+
+API_PREFIX = "/api/v1"
+
+
+def endpoint_cases(clinic_id: int, call_id: int, page_size: int):
+    """Named endpoint requests whose serialization is compared"""
+    return [
+        ("calls, first page", "/calls/", {"items_per_page": page_size}),
+        ("calls, keyset page", "/calls/", {"items_per_page": page_size, "pagination_mode": "cursor"}),
+        ("clinic calls, first page", f"/calls/clinic/{clinic_id}", {"items_per_page": page_size}),
+        ("clinic calls, by duration", f"/calls/clinic/{clinic_id}", {"items_per_page": page_size, "sort_by": "duration"}),
+        ("call detail", f"/calls/{call_id}", {}),
+    ]
+
+
+def timed_request(client: TestClient, mode: SerializationMode, url: str, params: dict):
+    responses.set_serialization_mode(mode)
+    started = time.perf_counter()
+    response = client.get(url, params=params)
+    elapsed = (time.perf_counter() - started) * 1000
+    response.raise_for_status()
+    return elapsed, response.json()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=30, help="Requests per endpoint and mode")
+    parser.add_argument("--page-size", type=int, default=100, help="items_per_page of the list endpoints")
+    args = parser.parse_args()
+
+    engine = create_engine(ConnectionStringBuilder.get_default_connection_string())
+    with engine.connect() as connection:
+        row = connection.execute(text(
+            "SELECT clinic_id, max(id) FROM call GROUP BY clinic_id ORDER BY count(*) DESC LIMIT 1"
+        )).first()
+    if row is None:
+        print("❌ No calls found, seed the database first")
+        return 1
+    clinic_id, call_id = row
+
+    original_mode = responses.load_serialization_mode()
+    client = TestClient(app)
+    mismatches = 0
+    try:
+        print(f"{'endpoint':<28}{'model ms':>10}{'fast ms':>10}{'speedup':>10}")
+        for name, path, params in endpoint_cases(clinic_id, call_id, args.page_size):
+            url = f"{API_PREFIX}{path}"
+            # Warm up both paths so connection setup is not measured
+            _, model_body = timed_request(client, SerializationMode.model, url, params)
+            _, fast_body = timed_request(client, SerializationMode.fast, url, params)
+            if model_body != fast_body:
+                mismatches += 1
+                print(f"❌ {name}: the fast response body differs from the model one")
+                continue
+
+            timings = {SerializationMode.model: [], SerializationMode.fast: []}
+            for _ in range(args.repeat):
+                # Alternate the modes so both see the same database and cache conditions
+                for mode in timings:
+                    timings[mode].append(timed_request(client, mode, url, params)[0])
+
+            model_ms = statistics.median(timings[SerializationMode.model])
+            fast_ms = statistics.median(timings[SerializationMode.fast])
+            print(f"{name:<28}{model_ms:>10.2f}{fast_ms:>10.2f}{model_ms / fast_ms:>9.2f}x")
+    finally:
+        responses.set_serialization_mode(original_mode)
+
+    if mismatches:
+        print(f"\n❌ {mismatches} endpoints return different bodies")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
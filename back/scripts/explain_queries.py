@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Check that the hot repository queries are served by indexes.
+
+Runs each repository query against the configured PostgreSQL database (DB_*
+environment variables), then EXPLAINs every statement it sent with sequential
+scans disabled. The planner still picks a sequential scan only when no index
+can serve the query, so any Seq Scan on a large table fails the check.
+
+Everything runs in one transaction that is rolled back, including the
+optional synthetic seed data.
+
+Usage:
+    python scripts/explain_queries.py                 # use the existing data
+    python scripts/explain_queries.py --seed 200000   # add 200k throwaway calls first
+"""
+
+import argparse
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+from app.repositories.call_repository import CallRepository
+from app.repositories.call_daily_stats_repository import CallDailyStatsRepository
+from app.repositories.evaluation_repository import EvaluationRepository
+from app.repositories.metrics_repository import MetricsRepository
+from app.repositories.sql_client import ConnectionStringBuilder
+from app.utils.pagination import CountMode, CursorToken
+
+# Tables that grow with traffic; sequential scans on them are failures
+CHECKED_TABLES = {"call", "evaluation", "call_daily_stats"}
+
+SEED_PREFIX = "explain-seed-"
+
+
+def seed(connection, calls: int, clinics: int = 20) -> None:
+    """Insert throwaway clinics, calls and evaluations and refresh the planner statistics"""
+    print(f"🔄 Seeding {calls} calls across {clinics} clinics...")
+    connection.execute(
+        text("INSERT INTO clinic (name) SELECT :prefix || g FROM generate_series(1, :clinics) g"),
+        {"prefix": SEED_PREFIX, "clinics": clinics}
+    )
+    connection.execute(text("""
+        WITH seeded AS (SELECT array_agg(id) AS ids FROM clinic WHERE name LIKE :prefix || '%')
+        INSERT INTO call (
+            call_id, call_type, agent_environment, assistant, clinic_id, call_start_time,
+            duration, customer_phone, customer_name, summary, call_reason, created
+        )
+        SELECT
+            :prefix || g,
+            (CASE WHEN g % 3 = 0 THEN 'outbound' ELSE 'inbound' END)::calltype,
+            'production'::agentenvironment,
+            'assistant',
+            seeded.ids[1 + g % array_length(seeded.ids, 1)],
+            now() - (g % 365) * interval '1 day',
+            g % 600,
+            '555' || lpad((g % 10000000)::text, 7, '0'),
+            'Customer ' || g,
+            'Patient called about ' || (ARRAY['an appointment', 'a refill', 'billing', 'insurance denied'])[1 + g % 4],
+            (ARRAY['scheduling', 'pharmacy', 'billing', 'insurance'])[1 + g % 4],
+            now() - (g % 365) * interval '1 day'
+        FROM generate_series(1, :calls) g, seeded
+    """), {"prefix": SEED_PREFIX, "calls": calls})
+    connection.execute(text("""
+        INSERT INTO evaluation (call_id, evaluator_type, score, feedback)
+        SELECT id, 'LLM'::evaluatortype, id % 10, CASE WHEN id % 4 = 0 THEN 'ok' END
+        FROM call WHERE call_id LIKE :prefix || '%' AND id % 2 = 0
+    """), {"prefix": SEED_PREFIX})
+    connection.execute(text("ANALYZE clinic, call, evaluation, call_daily_stats"))
+
+
+def query_cases(session: Session, clinic_id: int, call_id: int):
+    """Named repository calls whose statements are checked"""
+    calls = CallRepository(session)
+    evaluations = EvaluationRepository(session)
+    metrics = MetricsRepository(session)
+    daily_stats = CallDailyStatsRepository(session)
+    now = datetime.now()
+    cursor = CursorToken(value=now - timedelta(days=30), id=call_id)
+
+    return [
+        ("clinic calls, first page", lambda: calls.search_by_clinic_with_filters(clinic_id)),
+        ("clinic calls, by type", lambda: calls.search_by_clinic_with_filters(clinic_id, call_type="inbound")),
+        ("clinic calls, keyset page", lambda: calls.search_by_clinic_keyset(clinic_id, cursor, 11)),
+        ("clinic calls, keyset page by type", lambda: calls.search_by_clinic_keyset(clinic_id, cursor, 11, call_type="outbound")),
+        ("clinic calls, substring search", lambda: calls.search_by_clinic_with_filters(clinic_id, search_term="555012")),
+        ("clinic calls, count", lambda: calls.count_by_clinic_with_filters(clinic_id, count_mode=CountMode.exact)),
+        ("calls, full-text search", lambda: calls.search_fulltext("insurance denied", None, 11)),
+        ("call detail", lambda: calls.get(call_id)),
+        ("evaluations, keyset page", lambda: evaluations.list_keyset(None, 11)),
+        ("dashboard, live", lambda: metrics.get_dashboard_totals(clinic_id, now - timedelta(days=30), now)),
+        ("dashboard, rollup", lambda: metrics.get_rollup_totals(clinic_id, now - timedelta(days=30), now)),
+        ("rollup refresh", lambda: daily_stats.refresh_for_calls([call_id])),
+        ("rollup call contribution", lambda: daily_stats.contributions([call_id])),
+    ]
+
+
+def find_seq_scans(plan: dict) -> list:
+    """Relations of the checked tables read with a sequential scan anywhere in the plan"""
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in CHECKED_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found += find_seq_scans(child)
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="Throwaway calls to insert before checking")
+    args = parser.parse_args()
+
+    engine = create_engine(ConnectionStringBuilder.get_default_connection_string())
+    if engine.dialect.name != "postgresql":
+        print("❌ The EXPLAIN check needs a PostgreSQL database (DB_TYPE=postgres)")
+        return 1
+
+    failures = 0
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            if args.seed:
+                seed(connection, args.seed)
+
+            row = connection.execute(text(
+                "SELECT clinic_id, max(id) FROM call GROUP BY clinic_id ORDER BY count(*) DESC LIMIT 1"
+            )).first()
+            if row is None:
+                print("❌ No calls found, run with --seed N")
+                return 1
+            clinic_id, call_id = row
+
+            session = Session(bind=connection, join_transaction_mode="create_savepoint")
+            statements = []
+
+            @event.listens_for(connection, "before_cursor_execute")
+            def capture(conn, cursor, statement, parameters, context, executemany):
+                if not executemany and not statement.lstrip().upper().startswith(("EXPLAIN", "SET", "SAVEPOINT", "RELEASE", "ROLLBACK")):
+                    statements.append((statement, parameters))
+
+            cases = query_cases(session, clinic_id, call_id)
+            for name, run in cases:
+                statements.clear()
+                run()
+                executed = list(statements)
+
+                connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+                seq_scans = []
+                for statement, parameters in executed:
+                    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+                    seq_scans += find_seq_scans(plan[0]["Plan"])
+                connection.exec_driver_sql("SET LOCAL enable_seqscan = on")
+
+                if seq_scans:
+                    failures += 1
+                    print(f"❌ {name}: sequential scan on {', '.join(sorted(set(seq_scans)))}")
+                else:
+                    print(f"✅ {name}: {len(executed)} statements, index access only")
+
+            event.remove(connection, "before_cursor_execute", capture)
+            session.close()
+        finally:
+            transaction.rollback()
+
+    print(f"\n{len(cases) - failures}/{len(cases)} queries use indexes only")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())